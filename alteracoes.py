@@ -0,0 +1,75 @@
+# Feed de alterações feitas por outras instâncias do app (sem dependência da interface)
+# Cada escrita em `processos` deixa uma linha em `alteracoes` (ver db.ALTERACOES_TRIGGERS).
+# Ler o feed custa um PRAGMA data_version enquanto nada mudar: só quando outra
+# conexão faz commit é que as linhas novas (seq > última lida) são consultadas.
+
+
+class Mudancas:
+    """Resultado de uma leitura do feed."""
+    __slots__ = ("recarregar", "ids", "inseridos", "datas")
+
+    def __init__(self):
+        self.recarregar = False  # carga em massa ou feed podado: relê tudo
+        self.ids = set()         # processos inseridos/alterados/excluídos
+        self.inseridos = set()   # subconjunto de ids criado agora (entra no topo da lista)
+        self.datas = set()       # datas afetadas (inclui a data antiga de quem mudou de dia)
+
+    def afeta(self, data_iso):
+        return self.recarregar or data_iso in self.datas
+
+
+class FeedAlteracoes:
+    def __init__(self, db):
+        self.db = db
+        self._data_version = None
+        self.ultimo = 0
+        self.sincronizar()
+
+    def sincronizar(self):
+        """Marca tudo como lido (chamar antes de recarregar a lista do zero)."""
+        conn = self.db.conn
+        self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        self.ultimo = conn.execute("SELECT coalesce(max(seq), 0) FROM alteracoes").fetchone()[0]
+
+    def ler(self):
+        """Mudancas desde a última leitura, ou None se ninguém fez commit desde então."""
+        conn = self.db.conn
+        versao = conn.execute("PRAGMA data_version").fetchone()[0]
+        if versao == self._data_version:
+            return None
+        self._data_version = versao
+        primeiro, linhas = ler_desde(conn, self.ultimo)
+        mud, self.ultimo = montar_mudancas(self.ultimo, primeiro, linhas)
+        if mud is not None and mud.recarregar:
+            self.db.ler_arquivos()  # outro processo pode ter arquivado dias
+        return mud
+
+
+def ler_desde(conn, ultimo):
+    """(menor seq ainda guardado, [(seq, processo_id, data, data_anterior, operacao), ...] com seq > ultimo)."""
+    primeiro = conn.execute("SELECT min(seq) FROM alteracoes").fetchone()[0]
+    linhas = conn.execute(
+        """SELECT seq, processo_id, data, data_anterior, operacao
+           FROM alteracoes WHERE seq > ? ORDER BY seq""", (ultimo,)).fetchall()
+    return primeiro, linhas
+
+
+def montar_mudancas(ultimo, primeiro, linhas):
+    """Resume as linhas do feed lidas após `ultimo`; retorna (Mudancas ou None, novo ultimo)."""
+    mud = Mudancas()
+    if primeiro is not None and primeiro > ultimo + 1:
+        mud.recarregar = True  # as entradas que faltam já foram podadas
+    for seq, _id, data, anterior, op in linhas:
+        ultimo = seq
+        if op == "R":
+            mud.recarregar = True
+            continue
+        mud.ids.add(_id)
+        if op == "I":
+            mud.inseridos.add(_id)
+        mud.datas.add(data)
+        if anterior:
+            mud.datas.add(anterior)
+    if not (mud.recarregar or mud.ids):
+        return None, ultimo
+    return mud, ultimo
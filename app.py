@@ -0,0 +1,674 @@
+# Interface CustomTkinter (carregada sob demanda por dailycheck.py)
+# Requisitos: pip install customtkinter
+# Só o necessário para a primeira pintura é importado aqui; popup de observações,
+# resumo, exportação, relatórios e backups são importados quando usados.
+import threading
+import time
+from datetime import datetime, timedelta
+from tkinter import ttk, messagebox
+import customtkinter as ctk
+
+import backend
+import perfil
+from instrumentacao import METRICAS
+import processos
+from busca import BuscaAoVivo
+from datas import br_data, interpretar_data
+from db import DB_FILE
+from processos import STATUS_OPCOES
+from tabela import LinhasEmMemoria, TabelaVirtual
+
+APP_TITLE = "Reunião Suporte 08:30 - SIMUS"
+ALTERACOES_MS = 2000  # intervalo de leitura do feed de alterações de outros usuários
+
+class App(ctk.CTk):
+    def __init__(self, db_file=DB_FILE, servidor=backend.SERVIDOR):
+        super().__init__()
+        perfil.marcar("janela Tk")
+        self.title(APP_TITLE)
+        self.geometry("1100x680")
+        ctk.set_default_color_theme("dark-blue")
+        perfil.marcar("tema")
+        # Arquivo local ou servidor.py (--servidor / DAILYCHECK_SERVIDOR)
+        self.backend = backend.abrir(db_file, servidor)
+        self.feed = None  # criado quando o banco fica pronto (_preparar_banco)
+        self.protocol("WM_DELETE_WINDOW", self._ao_fechar)
+        self._filtros = None  # (data_iso, status, busca) do que está na tabela
+        self._build_ui()
+        perfil.marcar("widgets")
+        if perfil.ativo:
+            self._visivel = False
+            self.bind("<Map>", self._ao_mapear, add="+")
+        self._preparar_banco()
+
+    def _preparar_banco(self):
+        # Migrações, FTS e a conexão com o servidor rodam numa thread enquanto a
+        # janela já aparece; os botões voltam quando a primeira lista é carregada.
+        estado = {}
+        travados = self._travar_botoes()
+
+        def rodar():
+            try:
+                self.backend.preparar()
+            except Exception as e:
+                estado["erro"] = e
+            estado["fim"] = True
+
+        def verificar():
+            if "fim" not in estado:
+                self.after(25, verificar)
+                return
+            if "erro" in estado:
+                messagebox.showerror("Erro ao abrir o banco", str(estado["erro"]))
+                self._ao_fechar()
+                return
+            self.backend.iniciar()
+            self.feed = self.backend.feed()
+            perfil.marcar("banco (conferir_db)")
+            for b in travados:
+                b.configure(state="normal")
+            self._load_table()
+            perfil.marcar("primeira consulta")
+            self.after(ALTERACOES_MS, self._verificar_alteracoes)
+            if perfil.ativo:
+                self.after_idle(self._fim_do_perfil)
+
+        threading.Thread(target=rodar, name="preparar-banco", daemon=True).start()
+        self.after(25, verificar)
+
+    def _travar_botoes(self):
+        """Desliga os botões ligados (até o banco ficar pronto); retorna quais eram."""
+        pilha, ligados = [self], []
+        while pilha:
+            w = pilha.pop()
+            pilha.extend(w.winfo_children())
+            if isinstance(w, ctk.CTkButton) and w.cget("state") == "normal":
+                w.configure(state="disabled")
+                ligados.append(w)
+        return ligados
+
+    def _ao_mapear(self, event):
+        if event.widget is self and not self._visivel:
+            self._visivel = True
+            perfil.marcar("janela visível")
+
+    def _fim_do_perfil(self):
+        perfil.marcar("lista pintada")
+        perfil.gravar()
+
+    def _ao_fechar(self):
+        # Com o banco ainda abrindo, a thread de preparo termina sozinha (daemon)
+        self.busca.fechar()
+        self.backend.fechar()
+        self.destroy()
+
+    # ---------------- UI ----------------
+    def _build_ui(self):
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        # Top bar
+        top = ctk.CTkFrame(self, corner_radius=12)
+        top.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+        top.grid_columnconfigure(7, weight=1)
+
+        ctk.CTkLabel(top, text="Data:").grid(row=0, column=0, padx=(10,5), pady=8)
+        self.entry_data = ctk.CTkEntry(top, width=110)
+        self.entry_data.grid(row=0, column=1, padx=5, pady=8)
+        self.entry_data.insert(0, datetime.now().strftime("%d/%m/%Y"))
+        # Enter aplica a data digitada (aceita também dd/mm, hoje, ontem)
+        self.entry_data.bind("<Return>", lambda _e: self._agendar_busca(0))
+
+        self.btn_prev = ctk.CTkButton(top, text="◀ Ontem", width=90, command=self._go_prev_day)
+        self.btn_prev.grid(row=0, column=2, padx=5, pady=8)
+        self.btn_next = ctk.CTkButton(top, text="Amanhã ▶", width=110, command=self._go_next_day)
+        self.btn_next.grid(row=0, column=3, padx=5, pady=8)
+        self.btn_hoje = ctk.CTkButton(top, text="Hoje", width=70, command=self._go_today)
+        self.btn_hoje.grid(row=0, column=4, padx=5, pady=8)
+
+        ctk.CTkLabel(top, text="Status:").grid(row=0, column=5, padx=(20,5), pady=8)
+        self.combo_status_filtro = ctk.CTkComboBox(top, values=["(Todos)"] + STATUS_OPCOES, width=220,
+                                                   command=lambda _v: self._agendar_busca(0))
+        self.combo_status_filtro.grid(row=0, column=6, padx=5, pady=8)
+        self.combo_status_filtro.set("(Todos)")
+
+        self.entry_busca = ctk.CTkEntry(top, placeholder_text="Buscar por processo, título, cliente, responsável ou observações…")
+        self.entry_busca.grid(row=0, column=7, padx=10, pady=8, sticky="ew")
+        # Filtra enquanto digita (com debounce); Enter dispara na hora
+        self.entry_busca.bind("<KeyRelease>", self._ao_digitar_busca)
+
+        self.btn_atualizar = ctk.CTkButton(top, text="Atualizar", command=lambda: self._agendar_busca(0))
+        self.btn_atualizar.grid(row=0, column=8, padx=5, pady=8)
+
+        self.btn_resumo = ctk.CTkButton(top, text="Copiar Resumo 08:30", command=self._copiar_resumo)
+        self.btn_resumo.grid(row=0, column=9, padx=5, pady=8)
+
+        self.btn_resumo_semana = ctk.CTkButton(top, text="Resumo Semana", width=120,
+                                               command=self._copiar_resumo_semana)
+        self.btn_resumo_semana.grid(row=0, column=10, padx=5, pady=8)
+
+        self.btn_export = ctk.CTkButton(top, text="Exportar…", command=self._exportar)
+        self.btn_export.grid(row=0, column=11, padx=10, pady=8)
+
+        # Middle: tabela + painel lateral de status
+        mid = ctk.CTkFrame(self, corner_radius=12)
+        mid.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0,10))
+        mid.grid_columnconfigure(0, weight=1)
+        mid.grid_rowconfigure(0, weight=1)
+
+        # Tabela (colunas simplificadas)
+        self.tree = ttk.Treeview(
+            mid,
+            columns=("data","processo","titulo","cliente","responsavel","status","observacoes"),
+            show="headings", height=12
+        )
+        self.tree.grid(row=0, column=0, sticky="nsew", padx=(10,5), pady=10)
+
+        vsb = ttk.Scrollbar(mid, orient="vertical", command=self.tree.yview)
+        hsb = ttk.Scrollbar(mid, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        vsb.grid(row=0, column=1, sticky="ns", pady=10)
+        hsb.grid(row=1, column=0, sticky="ew", padx=(10,5))
+
+        heads = {
+            "data":"Data", "processo":"Processo", "titulo":"Título", "cliente":"Cliente",
+            "responsavel":"Responsável", "status":"Status", "observacoes":"Observações"
+        }
+        widths = {"data":90,"processo":120,"titulo":280,"cliente":180,"responsavel":160,"status":190,"observacoes":120}
+        for col in heads:
+            self.tree.heading(col, text=heads[col])
+            self.tree.column(col, width=widths[col], anchor="w")
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<Button-1>", self._on_click)  # identifica coluna clicada
+        # Linhas são materializadas em páginas conforme a rolagem
+        self.tabela = TabelaVirtual(self.tree, vsb, self._formatar_linha)
+        self.busca = BuscaAoVivo(self, getattr(self.backend, "db", None), self._ao_concluir_busca, self._ao_erro_busca)
+
+        # Painel lateral: mudança rápida de status
+        side = ctk.CTkFrame(mid, corner_radius=12)
+        side.grid(row=0, column=2, sticky="ns", padx=(5,10), pady=10)
+        ctk.CTkLabel(side, text="Mover Status", font=ctk.CTkFont(size=14, weight="bold")).pack(padx=10, pady=(12,6))
+        for s in STATUS_OPCOES:
+            ctk.CTkButton(side, text=s, width=210, command=lambda st=s: self._mover_status_selecionados(st)).pack(padx=10, pady=4)
+        ctk.CTkButton(side, text="Excluir Selecionados", fg_color="#8a1c1c", hover_color="#6f1515",
+                      command=self._excluir_selecionados).pack(padx=10, pady=(18,8))
+        self.btn_importar = ctk.CTkButton(side, text="Importar CSV…", width=210, command=self._importar_csv)
+        self.btn_importar.pack(padx=10, pady=(18,8))
+        ctk.CTkButton(side, text="Relatórios…", width=210, command=self._abrir_relatorios).pack(padx=10, pady=8)
+        ctk.CTkButton(side, text="Backups…", width=210, command=self._abrir_backups).pack(padx=10, pady=8)
+        ctk.CTkButton(side, text="Diagnóstico…", width=210, command=self._abrir_diagnostico).pack(padx=10, pady=8)
+
+        # Bottom: formulário (sem canal/prioridade/minutos)
+        form = ctk.CTkFrame(self, corner_radius=12)
+        form.grid(row=2, column=0, sticky="ew", padx=10, pady=(0,10))
+        for i in range(8):
+            form.grid_columnconfigure(i, weight=1)
+
+        # Linha 1
+        self.e_processo = ctk.CTkEntry(form, placeholder_text="Nº do processo/chamado *")
+        self.e_titulo = ctk.CTkEntry(form, placeholder_text="Título *")
+        self.e_cliente = ctk.CTkEntry(form, placeholder_text="Cliente")
+        self.e_responsavel = ctk.CTkEntry(form, placeholder_text="Responsável")
+        self.e_status = ctk.CTkComboBox(form, values=STATUS_OPCOES, width=220)
+        self.e_status.set("Atendido")
+
+        self.e_processo.grid(row=0, column=0, padx=6, pady=8, sticky="ew")
+        self.e_titulo.grid(row=0, column=1, padx=6, pady=8, sticky="ew")
+        self.e_cliente.grid(row=0, column=2, padx=6, pady=8, sticky="ew")
+        self.e_responsavel.grid(row=0, column=3, padx=6, pady=8, sticky="ew")
+        self.e_status.grid(row=0, column=4, padx=6, pady=8, sticky="ew")
+
+        # Linha 2
+        self.e_obs = ctk.CTkEntry(form, placeholder_text="Observações")
+        self.e_obs.grid(row=1, column=0, columnspan=4, padx=6, pady=8, sticky="ew")
+
+        self.btn_novo = ctk.CTkButton(form, text="Adicionar", command=self._adicionar)
+        self.btn_salvar = ctk.CTkButton(form, text="Salvar Edição", command=self._salvar_edicao, state="disabled")
+        self.btn_limpar = ctk.CTkButton(form, text="Limpar Formulário", command=self._limpar_form)
+        self.btn_duplicar_ontem = ctk.CTkButton(form, text="Duplicar de Ontem (mesmo responsável)", command=self._duplicar_de_ontem)
+
+        self.btn_novo.grid(row=1, column=4, padx=6, pady=8, sticky="ew")
+        self.btn_salvar.grid(row=1, column=5, padx=6, pady=8, sticky="ew")
+        self.btn_limpar.grid(row=1, column=6, padx=6, pady=8, sticky="ew")
+        self.btn_duplicar_ontem.grid(row=1, column=7, padx=6, pady=8, sticky="ew")
+
+        # Estado de edição
+        self._edit_id = None
+        self._edit_versao = None
+        self._clicked_col = None  # coluna clicada (para abrir popup nas "…")
+
+    # ---------------- Data Ops ----------------
+    def _data_atual(self):
+        """
+        Lê entry_data aceitando formas curtas (dd/mm, hoje, ontem…), reescreve o
+        campo como DD/MM/AAAA e retorna a data ISO. ValueError se inválida.
+        """
+        texto = self.entry_data.get()
+        data_iso = interpretar_data(texto)
+        data_br = br_data(data_iso)
+        if texto != data_br:
+            self.entry_data.delete(0, "end")
+            self.entry_data.insert(0, data_br)
+        return data_iso
+
+    def _filtro_params(self):
+        try:
+            data_iso = self._data_atual()
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.")
+            raise
+        st = self.combo_status_filtro.get()
+        status = None if st == "(Todos)" else st
+        busca = self.entry_busca.get().strip()
+        return data_iso, status, busca
+
+    def _load_table(self):
+        # Recarga completa (filtros mudaram ou carga em massa): descarta qualquer busca em andamento
+        if self.feed is None:
+            return  # banco ainda abrindo: _preparar_banco carrega a lista
+        self.busca.cancelar()
+        try:
+            self._filtros = self._filtro_params()
+        except Exception:
+            self._filtros = None
+            self.tabela.limpar()
+            return
+        self.feed.sincronizar()  # a releitura já inclui tudo o que está no feed
+        fonte = self.backend.listar(*self._filtros)
+        self._na_tela("tk: carregar lista", self.tabela.carregar, fonte)
+
+    def _na_tela(self, nome, fn, *args):
+        # Mede até o Tk redesenhar: o after_idle roda depois dos redesenhos já pendentes
+        t0 = time.perf_counter()
+        fn(*args)
+        self.after_idle(lambda: METRICAS.operacao(nome, (time.perf_counter() - t0) * 1000))
+
+    def _depois_de_gravar(self, ids, data_iso, inseridos=()):
+        # Gravou na data da tabela: delta. Em outra data (o campo Data mudou): recarrega.
+        if self._filtros is not None and data_iso == self._filtros[0]:
+            self._aplicar_mudancas(ids, inseridos)
+        else:
+            self._load_table()
+
+    def _aplicar_mudancas(self, ids, inseridos=()):
+        """
+        Relê só `ids` com os filtros da tabela atual e aplica o delta: quem voltou
+        é atualizado no lugar (ou entra, se é novo), quem não voltou sai da tela.
+        """
+        if self._filtros is None or not ids:
+            return
+        rows = self.backend.listar_ids(ids, *self._filtros)
+        self._na_tela("tk: aplicar alterações", self._aplicar_linhas, ids, rows, inseridos)
+
+    def _aplicar_linhas(self, ids, rows, inseridos):
+        vistos = {r[0] for r in rows}
+        self.tabela.remover([str(i) for i in ids if i not in vistos])
+        self.tabela.atualizar_linhas([r for r in rows if r[0] in inseridos], inicio=True)
+        self.tabela.atualizar_linhas([r for r in rows if r[0] not in inseridos], inicio=False)
+
+    def _verificar_alteracoes(self):
+        # Outras instâncias gravaram? Relê só as linhas afetadas do dia mostrado.
+        self.after(ALTERACOES_MS, self._verificar_alteracoes)
+        try:
+            mud = self.feed.ler()
+        except (OSError, backend.ErroServidor):
+            return  # servidor fora do ar: tenta de novo no próximo ciclo
+        if mud is None or self._filtros is None or not mud.afeta(self._filtros[0]):
+            return
+        if mud.recarregar:
+            self._load_table()
+            return
+        self._aplicar_mudancas(mud.ids, mud.inseridos)
+
+    def _ao_digitar_busca(self, event):
+        if event.keysym in ("Return", "KP_Enter"):
+            self._agendar_busca(0)
+        elif event.char or event.keysym in ("BackSpace", "Delete"):
+            self._agendar_busca()
+
+    def _agendar_busca(self, atraso_ms=None):
+        self.busca.agendar(self._montar_consulta, atraso_ms)
+
+    def _montar_consulta(self):
+        if self.feed is None:
+            return None
+        try:
+            filtros = self._filtro_params()
+        except Exception:
+            return None
+        self._filtros = filtros
+        return self.backend.consulta_busca(*filtros)
+
+    def _ao_concluir_busca(self, rows):
+        self._na_tela("tk: carregar lista", self.tabela.carregar, LinhasEmMemoria(rows))
+
+    def _ao_erro_busca(self, exc):
+        messagebox.showerror("Erro na busca", str(exc))
+
+    @staticmethod
+    def _formatar_linha(row):
+        _id, data, processo, titulo, cliente, responsavel, status, tem_obs, _versao = row
+        # Observações mostram "..." se houver conteúdo (o texto só é lido no popup)
+        obs_short = "..." if tem_obs else ""
+        return str(_id), (br_data(data), processo, titulo, cliente or "", responsavel or "", status, obs_short)
+
+    def _insert(self, reg):
+        """
+        reg: (data, processo, titulo, cliente, responsavel, status, observacoes)
+        """
+        return self.backend.inserir(reg)
+
+    def _update(self, registro, _id, versao=None):
+        self.backend.atualizar(registro, _id, versao)
+
+    def _delete_many(self, ids):
+        if not ids:
+            return 0
+        # Só exclui o que não mudou desde que foi listado
+        linhas = [self.tabela.linha(i) for i in ids]
+        versoes = {row[0]: row[8] for row in linhas if row is not None}
+        if len(versoes) < len(ids):
+            return self.backend.excluir(ids)
+        return self.backend.excluir(ids, versoes)
+
+    def _dia_arquivado(self, *datas):
+        # Dias arquivados (dailycheck.py arquivar) continuam visíveis, mas só para leitura
+        for d in datas:
+            if d is not None and self.backend.arquivado(d):
+                messagebox.showwarning("Dia arquivado",
+                                       f"O dia {br_data(d)} está arquivado e não pode ser alterado.")
+                return True
+        return False
+
+    def _dia_da_tabela(self):
+        return self._filtros[0] if self._filtros is not None else None
+
+    def _mover_status_selecionados(self, novo_status):
+        sel = self.tree.selection()
+        if not sel:
+            messagebox.showinfo("Seleção vazia", "Selecione um ou mais registros na tabela.")
+            return
+        if self._dia_arquivado(self._dia_da_tabela()):
+            return
+        ids = [int(iid) for iid in sel]
+        self.backend.mover_status(ids, novo_status)
+        self._aplicar_mudancas(ids)
+
+    # ---------------- Handlers ----------------
+    def _go_prev_day(self):
+        self._shift_day(-1)
+
+    def _go_next_day(self):
+        self._shift_day(1)
+
+    def _go_today(self):
+        self.entry_data.delete(0, "end")
+        self.entry_data.insert(0, datetime.now().strftime("%d/%m/%Y"))
+        self._load_table()
+
+    def _shift_day(self, delta):
+        try:
+            cur = datetime.strptime(self._data_atual(), "%Y-%m-%d")
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.")
+            return
+        newd = cur + timedelta(days=delta)
+        self.entry_data.delete(0, "end")
+        self.entry_data.insert(0, newd.strftime("%d/%m/%Y"))
+        self._load_table()
+
+    def _adicionar(self):
+        processo = self.e_processo.get().strip()
+        titulo = self.e_titulo.get().strip()
+        if not processo or not titulo:
+            messagebox.showwarning("Campos obrigatórios", "Preencha Processo e Título.")
+            return
+        cliente = self.e_cliente.get().strip() or None
+        responsavel = self.e_responsavel.get().strip() or None
+        status = self.e_status.get().strip() or STATUS_OPCOES[0]
+        obs = self.e_obs.get().strip() or None
+
+        try:
+            data_iso = self._data_atual()
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.")
+            return
+        if self._dia_arquivado(data_iso):
+            return
+
+        # Registro na ordem: data, processo, titulo, cliente, responsavel, status, observacoes
+        _id = self._insert((data_iso, processo, titulo, cliente, responsavel, status, obs))
+        # Limpa TUDO do formulário após adicionar (como você pediu)
+        self._limpar_form()
+        self._depois_de_gravar([_id], data_iso, inseridos={_id})
+
+    def _on_click(self, event):
+        # guarda coluna clicada para usar no double-click
+        self._clicked_col = self.tree.identify_column(event.x)
+
+    def _on_select(self, _event=None):
+        sel = self.tree.selection()
+        if len(sel) == 1:
+            iid = sel[0]
+            vals = self.tree.item(iid, "values")
+            # vals: data_br, processo, titulo, cliente, responsavel, status, observacoes("..." ou "")
+            self.e_processo.delete(0, "end"); self.e_processo.insert(0, vals[1])
+            self.e_titulo.delete(0, "end"); self.e_titulo.insert(0, vals[2])
+            self.e_cliente.delete(0, "end"); self.e_cliente.insert(0, vals[3])
+            self.e_responsavel.delete(0, "end"); self.e_responsavel.insert(0, vals[4])
+            self.e_status.set(vals[5])
+            # Não carrego obs no form automaticamente para evitar sobrescrever sem querer
+            self.e_obs.delete(0, "end")
+            self._edit_id = int(iid)
+            row = self.tabela.linha(iid)
+            self._edit_versao = row[8] if row is not None else None
+            self.btn_salvar.configure(state="normal")
+        else:
+            self._edit_id = None
+            self._edit_versao = None
+            self.btn_salvar.configure(state="disabled")
+
+    def _on_double_click(self, event=None):
+        # Detecta a coluna no próprio evento (funciona mesmo sem clique simples antes)
+        col = self.tree.identify_column(event.x)
+        row_id = self.tree.identify_row(event.y)
+        if not row_id:
+            return
+        # Coluna 7 é "observacoes"
+        if col == "#7":
+            self._abrir_observacoes_popup(int(row_id))
+        else:
+            if self._edit_id:
+                self.btn_salvar.focus_set()
+
+    def _abrir_observacoes_popup(self, _id: int):
+        # Busca observações completas (cache pela versão da linha listada)
+        linha = self.tabela.linha(str(_id))
+        row = self.backend.observacoes(_id, linha[8] if linha is not None else None)
+        if not row:
+            return
+        from observacoes_ui import JanelaObservacoes
+        JanelaObservacoes(self, *row)
+
+    def _salvar_edicao(self):
+        if not self._edit_id:
+            return
+        processo = self.e_processo.get().strip()
+        titulo = self.e_titulo.get().strip()
+        if not processo or not titulo:
+            messagebox.showwarning("Campos obrigatórios", "Preencha Processo e Título.")
+            return
+        cliente = self.e_cliente.get().strip() or None
+        responsavel = self.e_responsavel.get().strip() or None
+        status = self.e_status.get().strip() or STATUS_OPCOES[0]
+        obs_text = self.e_obs.get().strip() or None
+
+        try:
+            data_iso = self._data_atual()
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.")
+            return
+        if self._dia_arquivado(self._dia_da_tabela(), data_iso):
+            return
+
+        reg = (data_iso, processo, titulo, cliente, responsavel, status, obs_text)
+        versao = self._edit_versao
+        while True:
+            try:
+                self._update(reg, self._edit_id, versao)
+                break
+            except processos.ConflitoEdicao as e:
+                if e.atual is None:
+                    messagebox.showwarning("Registro excluído", "Outro usuário excluiu este registro.")
+                    self.tabela.remover([str(self._edit_id)])
+                    self._limpar_form()
+                    return
+                resp = messagebox.askyesnocancel(
+                    "Registro alterado",
+                    "Outro usuário alterou este registro depois que você o abriu.\n\n"
+                    f"Agora: #{e.atual[2]} — {e.atual[3]} | {e.atual[6]}\n\n"
+                    "Sim: gravar mesmo assim (sobrescreve a outra alteração)\n"
+                    "Não: descartar a sua edição e ver a versão atual\n"
+                    "Cancelar: continuar editando")
+                if resp is None:
+                    self._edit_versao = e.atual[8]  # próxima tentativa compara com a versão vista agora
+                    return
+                if not resp:
+                    break
+                # Sim: tenta de novo contra a versão mostrada; se mudou outra vez, pergunta de novo
+                versao = e.atual[8]
+        _id = self._edit_id
+        self._limpar_form()
+        self._depois_de_gravar([_id], data_iso)
+
+    def _limpar_form(self):
+        for e in (self.e_processo, self.e_titulo, self.e_cliente, self.e_responsavel, self.e_obs):
+            e.delete(0, "end")
+        self.e_status.set(STATUS_OPCOES[0])
+        self._edit_id = None
+        self._edit_versao = None
+        self.btn_salvar.configure(state="disabled")
+
+    def _excluir_selecionados(self):
+        sel = self.tree.selection()
+        if not sel:
+            messagebox.showinfo("Seleção vazia", "Selecione ao menos um registro.")
+            return
+        if self._dia_arquivado(self._dia_da_tabela()):
+            return
+        if not messagebox.askyesno("Confirmar exclusão", f"Excluir {len(sel)} registro(s) selecionado(s)?"):
+            return
+        ids = [int(i) for i in sel]
+        n = self._delete_many(ids)
+        if n < len(ids):
+            messagebox.showwarning(
+                "Exclusão parcial",
+                f"{len(ids) - n} registro(s) foram alterados ou excluídos por outro usuário e não foram excluídos.")
+        self._aplicar_mudancas(ids)
+
+    def _duplicar_de_ontem(self):
+        try:
+            data_atual = self._data_atual()
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.")
+            return
+        if self._dia_arquivado(data_atual):
+            return
+        d = datetime.strptime(data_atual, "%Y-%m-%d")
+        ontem_iso = (d - timedelta(days=1)).strftime("%Y-%m-%d")
+        n = self.backend.duplicar_dia(ontem_iso, data_atual)
+        if not n:
+            messagebox.showinfo("Nada para duplicar", "Nenhum registro encontrado em ontem.")
+            return
+        self._load_table()  # carga em massa: relê a lista inteira
+        messagebox.showinfo("Duplicado", f"{n} registro(s) duplicado(s) de {br_data(ontem_iso)}.")
+
+    # ---------------- Resumo / Exportação ----------------
+    def _resumo_texto(self, data_iso):
+        return self.backend.resumo_texto(data_iso)
+
+    def _copiar_resumo(self):
+        try:
+            data_iso = self._data_atual()
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.")
+            return
+        texto = self._resumo_texto(data_iso)
+        self.clipboard_clear()
+        self.clipboard_append(texto)
+        messagebox.showinfo("Resumo copiado", "Resumo gerado e copiado para a área de transferência.")
+
+    def _copiar_resumo_semana(self):
+        try:
+            data_iso = self._data_atual()
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.")
+            return
+        import resumo
+        texto = self.backend.resumo_periodo_texto(*resumo.semana(data_iso))
+        self.clipboard_clear()
+        self.clipboard_append(texto)
+        messagebox.showinfo("Resumo copiado", "Resumo da semana copiado para a área de transferência.")
+
+    def _importar_csv(self):
+        from tkinter import filedialog
+        filename = filedialog.askopenfilename(filetypes=[("CSV", "*.csv"), ("Todos", "*.*")])
+        if not filename:
+            return
+        estado = {"lidas": 0, "fim": None}
+
+        def progresso(n):
+            estado["lidas"] = n
+
+        def rodar():
+            # Thread de fundo: usa conexão do pool e não toca em widgets
+            try:
+                estado["fim"] = self.backend.importar_csv(filename, progresso)
+            except Exception as e:
+                estado["fim"] = e
+
+        def verificar():
+            fim = estado["fim"]
+            if fim is None:
+                self.btn_importar.configure(text=f"Importando… {estado['lidas']}")
+                self.after(100, verificar)
+                return
+            self.btn_importar.configure(text="Importar CSV…", state="normal")
+            if isinstance(fim, Exception):
+                messagebox.showerror("Erro na importação", str(fim))
+                return
+            self._load_table()
+            messagebox.showinfo("Importação concluída", fim.texto())
+
+        self.btn_importar.configure(state="disabled")
+        threading.Thread(target=rodar, daemon=True).start()
+        self.after(100, verificar)
+
+    def _abrir_relatorios(self):
+        from relatorios_ui import JanelaRelatorios
+        JanelaRelatorios(self, self.backend, self.entry_data.get().strip())
+
+    def _abrir_backups(self):
+        if getattr(self.backend, "db", None) is None:
+            messagebox.showinfo("Backups", "Os backups ficam na máquina do servidor "
+                                           "(dailycheck.py backup / restore lá).")
+            return
+        from backup_ui import JanelaBackups
+        JanelaBackups(self, self.backend, self._depois_de_restaurar)
+
+    def _abrir_diagnostico(self):
+        from diagnostico_ui import JanelaDiagnostico
+        JanelaDiagnostico(self, self.backend)
+
+    def _depois_de_restaurar(self):
+        self.feed.sincronizar()
+        self._load_table()
+
+    def _exportar(self):
+        try:
+            _data_iso, status, busca = self._filtro_params()
+        except Exception:
+            return
+        from exportacao_ui import JanelaExportacao
+        JanelaExportacao(self, self.backend, self.entry_data.get().strip(), status, busca)
@@ -0,0 +1,162 @@
+# Arquivamento dos dias antigos (sem dependência da interface)
+# Os dias até o fim do mês de MESES meses atrás saem do banco principal para um
+# banco SQLite por ano, ao lado dele (<nome>.arquivo-AAAA.db), com a mesma tabela
+# `processos`, as observações longas e o próprio índice FTS. O app anexa esses
+# arquivos (ATTACH somente leitura) quando a consulta chega neles: navegar pelos
+# dias, buscar, exportar e o resumo continuam iguais; só não dá para gravar neles.
+# Os relatórios não mudam: os totais (db.TOTAIS) ficam no banco principal.
+# O banco principal fica só com o ano corrente, menor e mais rápido (VACUUM no fim).
+# Uso: python dailycheck.py arquivar [--meses 12] | arquivar --listar
+import logging
+import os
+import sqlite3
+from collections import namedtuple
+from datetime import date, timedelta
+
+from db import ALTERACOES_TRIGGERS, COLUNAS_PROCESSOS, TOTAIS_TRIGGERS
+
+MESES = int(os.environ.get("DAILYCHECK_ARQUIVAR_MESES", "12"))  # meses mantidos no banco principal
+VERSAO_ARQUIVO = 1  # user_version dos bancos de arquivo
+
+log = logging.getLogger("dailycheck.arquivo")
+
+Arquivo = namedtuple("Arquivo", "ano caminho ate linhas tamanho")
+
+
+class ErroArquivo(Exception):
+    pass
+
+
+def caminho(db_path, ano):
+    return f"{os.path.splitext(db_path)[0]}.arquivo-{ano}.db"
+
+
+def corte(meses=MESES, hoje=None):
+    """Último dia arquivável: fim do mês que fica `meses` meses antes do mês atual."""
+    hoje = hoje or date.today()
+    n = hoje.year * 12 + hoje.month - 1 - meses
+    return (date(n // 12, n % 12 + 1, 1) - timedelta(days=1)).isoformat()
+
+
+def _esquema(conn, fts):
+    # Mesmas colunas (e ordem) do banco principal: consultas por UNION ALL
+    conn.execute("""CREATE TABLE IF NOT EXISTS processos (
+                        id INTEGER PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        processo TEXT NOT NULL,
+                        titulo TEXT NOT NULL,
+                        cliente TEXT,
+                        responsavel TEXT,
+                        status TEXT NOT NULL,
+                        observacoes TEXT,
+                        versao INTEGER NOT NULL DEFAULT 1
+                    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_proc_data_status ON processos(data, status)")
+    conn.execute("""CREATE TABLE IF NOT EXISTS observacoes_grandes (
+                        id INTEGER PRIMARY KEY,
+                        texto BLOB NOT NULL
+                    )""")
+    if fts:
+        conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS processos_fts USING fts5(
+                            processo, titulo, cliente, responsavel, observacoes,
+                            content='processos', content_rowid='id',
+                            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                        )""")
+    conn.execute(f"PRAGMA user_version={VERSAO_ARQUIVO}")
+
+
+def _copiar_ano(db, ano, de, ate, fts):
+    """
+    Copia os dias de..ate do banco principal para o arquivo do ano (que já pode
+    ter os dias anteriores a `de`) e confere a contagem. Roda numa conexão própria
+    enquanto arquivar() segura a escrita no principal, então lê exatamente o que
+    vai ser apagado. Retorna (linhas, id_min, id_max) do arquivo inteiro.
+    """
+    destino = caminho(db.path, ano)
+    conn = sqlite3.connect(destino, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=DELETE")  # arquivo avulso, sem -wal ao lado
+        conn.execute("PRAGMA busy_timeout=5000")    # alguém pode estar lendo o arquivo
+        conn.execute("ATTACH ? AS principal", (os.path.abspath(db.path),))
+        conn.execute("BEGIN")  # IMMEDIATE pediria a escrita do principal, que já está presa
+        try:
+            _esquema(conn, fts)
+            # Sobras de uma tentativa anterior que não chegou a apagar do principal
+            conn.execute("DELETE FROM processos WHERE data >= ?", (de,))
+            conn.execute("DELETE FROM observacoes_grandes WHERE id NOT IN (SELECT id FROM processos)")
+            n = conn.execute(f"""INSERT INTO processos ({COLUNAS_PROCESSOS})
+                                 SELECT {COLUNAS_PROCESSOS} FROM principal.processos
+                                 WHERE data BETWEEN ? AND ? ORDER BY data, id""", (de, ate)).rowcount
+            conn.execute("""INSERT INTO observacoes_grandes (id, texto)
+                            SELECT g.id, g.texto FROM principal.observacoes_grandes g
+                            JOIN processos p ON p.id = g.id WHERE p.data BETWEEN ? AND ?""", (de, ate))
+            if fts:
+                conn.execute("INSERT INTO processos_fts(processos_fts) VALUES ('rebuild')")
+            origem = conn.execute("SELECT count(*) FROM principal.processos WHERE data BETWEEN ? AND ?",
+                                  (de, ate)).fetchone()[0]
+            if n != origem:
+                raise ErroArquivo(f"{destino}: {n} linhas copiadas de {origem}")
+            linhas, id_min, id_max = conn.execute("SELECT count(*), min(id), max(id) FROM processos").fetchone()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("DETACH principal")
+        if conn.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+            raise ErroArquivo(f"{destino}: quick_check falhou")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return linhas, id_min, id_max
+
+
+def arquivar(db, meses=MESES, vacuum=True, hoje=None):
+    """
+    Move para os arquivos por ano os dias até corte(meses). A escrita no banco
+    principal fica presa do começo ao fim: cada ano é copiado e conferido, e só
+    então os dias saem do principal, numa única transação. Retorna {ano: linhas movidas}.
+    """
+    if db.path == ":memory:":
+        raise ErroArquivo("banco em memória não tem onde guardar os arquivos")
+    ate = corte(meses, hoje)
+    movidas = {}
+    db.desanexar(db.conn)  # com o arquivo anexado, o BEGIN daqui travaria a cópia
+    with db.transaction() as conn:
+        ja = conn.execute("SELECT max(ate) FROM arquivos").fetchone()[0]
+        if ja is not None and ate <= ja:
+            return movidas
+        anos = [int(a) for (a,) in conn.execute(
+            "SELECT DISTINCT substr(data, 1, 4) FROM processos WHERE data <= ? ORDER BY 1", (ate,))]
+        registro = []
+        for ano in anos:
+            de, fim = f"{ano}-01-01", min(ate, f"{ano}-12-31")
+            if ja is not None and ja >= de:
+                de = (date.fromisoformat(ja) + timedelta(days=1)).isoformat()
+            linhas, id_min, id_max = _copiar_ano(db, ano, de, fim, db.fts)
+            registro.append((ano, os.path.basename(caminho(db.path, ano)), de, fim, linhas, id_min, id_max))
+        # Totais dos relatórios ficam como estão; o feed ganha um único 'R' (recarregar)
+        conn.execute("DROP TRIGGER IF EXISTS totais_ad")
+        conn.execute("DROP TRIGGER IF EXISTS alteracoes_ad")
+        for ano, _a, de, fim, *_ in registro:
+            movidas[ano] = conn.execute("DELETE FROM processos WHERE data BETWEEN ? AND ?", (de, fim)).rowcount
+        conn.execute(TOTAIS_TRIGGERS[1])
+        conn.execute(ALTERACOES_TRIGGERS[2])
+        conn.executemany("INSERT OR REPLACE INTO arquivos (ano, arquivo, ate, linhas, id_min, id_max) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", [(a, c, fim, *resto) for a, c, _de, fim, *resto in registro])
+        if registro:
+            conn.execute("INSERT INTO alteracoes (processo_id, operacao) VALUES (0, 'R')")
+    if movidas and vacuum:
+        conn.execute("VACUUM")  # devolve ao disco o espaço dos dias que saíram
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    db.ler_arquivos()
+    db.tocar()
+    log.info("arquivados até %s: %s", ate, movidas)
+    return movidas
+
+
+def listar(db):
+    """Arquivos registrados no banco, do mais antigo ao mais novo."""
+    db.ler_arquivos()
+    linhas = dict(db.conn.execute("SELECT ano, linhas FROM arquivos"))
+    return [Arquivo(ano, c, ate, linhas[ano], os.path.getsize(c) if os.path.exists(c) else None)
+            for ano, (c, ate, _de, _ate) in db.arquivos.items()]
@@ -0,0 +1,499 @@
+# Origem dos dados da interface: o arquivo SQLite local ou um servidor (servidor.py)
+# As duas classes têm os mesmos métodos; o App só conversa com elas.
+# Sem --servidor nem DAILYCHECK_SERVIDOR, tudo continua no arquivo local.
+# http.client (e com ele ssl) só é importado no modo servidor: pesa na abertura.
+import json
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+import processos
+from alteracoes import FeedAlteracoes, montar_mudancas
+from db import DB_FILE, Database, conferir_db, init_db
+from instrumentacao import METRICAS, medir
+from tabela import LinhasEmMemoria
+
+SERVIDOR = os.environ.get("DAILYCHECK_SERVIDOR")  # ex.: http://192.168.0.10:8765
+ETAGS_GUARDADAS = 64  # listas guardadas para GET condicional (cada busca digitada é uma)
+CACHE_OBS = 8 * 1024 * 1024  # caracteres de observações guardados para o popup
+BLOCO_ENVIO = 64 * 1024  # bytes por envio no corpo das requisições (importação aos blocos)
+
+
+def abrir(db_file=DB_FILE, servidor=SERVIDOR):
+    return BackendRemoto(servidor) if servidor else BackendLocal(db_file)
+
+
+class CacheObservacoes:
+    """
+    Observações completas por id, das menos usadas para as mais usadas (LRU).
+    O limite é o tamanho somado dos textos, não a quantidade: um log colado de
+    vários MB empurra muitos textos curtos para fora, e um maior que o limite
+    nem entra. Cada item guarda a versão da linha; outra versão é falta.
+    """
+
+    def __init__(self, maximo=CACHE_OBS):
+        self.maximo = maximo
+        self.tamanho = 0
+        self._itens = OrderedDict()  # id -> (versao, (processo, titulo, observacoes))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _tamanho(valor):
+        return sum(len(v or "") for v in valor)
+
+    def obter(self, _id, versao):
+        with self._lock:
+            item = self._itens.get(_id)
+            if item is None or item[0] != versao:
+                return None
+            self._itens.move_to_end(_id)
+            return item[1]
+
+    def guardar(self, _id, versao, valor):
+        tamanho = self._tamanho(valor)
+        with self._lock:
+            antigo = self._itens.pop(_id, None)
+            if antigo is not None:
+                self.tamanho -= self._tamanho(antigo[1])
+            if tamanho > self.maximo:
+                return
+            self._itens[_id] = (versao, valor)
+            self.tamanho += tamanho
+            while self.tamanho > self.maximo:
+                _velho, (_v, removido) = self._itens.popitem(last=False)
+                self.tamanho -= self._tamanho(removido)
+
+    def buscar(self, _id, versao, ler):
+        """Valor guardado para (id, versao) ou ler() -> (processo, titulo, observacoes, versao) | None."""
+        if versao is not None:
+            valor = self.obter(_id, versao)
+            if valor is not None:
+                return valor
+        row = ler()
+        if row is None:
+            return None
+        valor = tuple(row[:3])
+        self.guardar(_id, row[3], valor)
+        return valor
+
+
+class BackendLocal:
+    def __init__(self, db_file=DB_FILE):
+        self.db = Database(db_file)
+        self.cache_obs = CacheObservacoes()
+        self.backups = None  # backup.BackupDiario, iniciado com o app
+
+    @property
+    def formatos(self):
+        import exportacao
+        return ["CSV", "JSONL"] + (["Parquet"] if exportacao.parquet_disponivel() else [])
+
+    def preparar(self):
+        """Migrações e índices numa conexão própria: roda em qualquer thread (abertura em fundo)."""
+        import backup  # noqa: F401  (gzip/shutil/tempfile: importados aqui, fora da thread da UI)
+        if self.db.path == ":memory:":
+            return  # outro Database seria outro banco; iniciar() faz tudo
+        db = Database(self.db.path, pool_size=0, journal_mode=self.db.journal_mode)
+        try:
+            init_db(db)
+        finally:
+            db.close()
+
+    def iniciar(self):
+        import backup
+        conferir_db(self.db)  # migrações e manutenção já rodaram em preparar(); aqui só leitura
+        self.backups = None
+        if self.db.path != ":memory:":
+            self.backups = backup.BackupDiario(self.db.path)
+            self.backups.start()
+
+    def fechar(self):
+        if self.backups is not None:
+            self.backups.parar()
+        self.db.close()
+
+    def feed(self):
+        return FeedAlteracoes(self.db)
+
+    def arquivado(self, data_iso):
+        """Dia já movido para o arquivo do ano (somente leitura)."""
+        return self.db.arquivado(data_iso)
+
+    # ---------------- Leitura ----------------
+    @medir("listar")
+    def listar(self, data_iso, status=None, busca=None):
+        return processos.listar(self.db, data_iso, status, busca)
+
+    @medir("listar_ids")
+    def listar_ids(self, ids, data_iso, status=None, busca=None):
+        return processos.listar_ids(self.db, ids, data_iso, status, busca)
+
+    def consulta_busca(self, data_iso, status=None, busca=None):
+        """O que BuscaAoVivo executa: (sql, params), interrompível na thread de fundo."""
+        return processos.consulta(self.db, processos.COLUNAS_LISTA, data_iso, status, busca)
+
+    @medir("observacoes")
+    def observacoes(self, _id, versao=None):
+        """(processo, titulo, observações completas) ou None; com a versão da linha, usa o cache."""
+        return self.cache_obs.buscar(_id, versao, lambda: processos.ler_observacoes(self.db, _id))
+
+    @medir("resumo_texto")
+    def resumo_texto(self, data_iso):
+        import resumo
+        return resumo.resumo_texto(self.db, data_iso)
+
+    @medir("resumo_periodo_texto")
+    def resumo_periodo_texto(self, inicio, fim):
+        import resumo
+        return resumo.resumo_periodo_texto(self.db, inicio, fim)
+
+    @medir("relatorio_texto")
+    def relatorio_texto(self, inicio, fim, agrupar=None):
+        import relatorios
+        return relatorios.relatorio_texto(self.db, inicio, fim, agrupar)
+
+    @medir("contar")
+    def contar(self, inicio, fim=None, status=None, busca=None):
+        import exportacao
+        return exportacao.contar(self.db, inicio, fim, status, busca)
+
+    @medir("exportar")
+    def exportar(self, caminho, formato, inicio, fim=None, status=None, busca=None,
+                 progresso=None, cancelar=None):
+        import exportacao
+        return exportacao.exportar(self.db, caminho, formato, inicio, fim, status, busca,
+                                   progresso=progresso, cancelar=cancelar)
+
+    # ---------------- Backups ----------------
+    def listar_backups(self):
+        import backup
+        return backup.listar(self.db.path)
+
+    def criar_backup(self, progresso=None):
+        import backup
+        s = backup.criar(self.db.path, progresso=progresso)
+        backup.rotacionar(self.db.path)
+        return s
+
+    def verificar_backup(self, caminho):
+        import backup
+        return backup.verificar(caminho)
+
+    def restaurar_backup(self, caminho, progresso=None):
+        import backup
+        backup.restaurar(self.db, caminho, progresso)
+
+    # ---------------- Diagnóstico ----------------
+    def metricas(self):
+        """Medições deste processo (instrumentacao.py) e onde está o banco."""
+        dados = METRICAS.como_dict()
+        dados["banco"] = {"caminho": os.path.abspath(self.db.path), "journal_mode": self.db.journal_mode_ativo}
+        return dados
+
+    # ---------------- Escrita ----------------
+    @medir("inserir")
+    def inserir(self, reg):
+        return processos.inserir(self.db, reg)
+
+    @medir("atualizar")
+    def atualizar(self, reg, _id, versao=None):
+        return processos.atualizar(self.db, reg, _id, versao)
+
+    @medir("excluir")
+    def excluir(self, ids, versoes=None):
+        return processos.excluir(self.db, ids, versoes)
+
+    @medir("mover_status")
+    def mover_status(self, ids, novo_status):
+        return processos.mover_status(self.db, ids, novo_status)
+
+    @medir("duplicar_dia")
+    def duplicar_dia(self, origem, destino):
+        return processos.duplicar_dia(self.db, origem, destino)
+
+    @medir("importar_csv")
+    def importar_csv(self, caminho, progresso=None):
+        import importacao
+        with open(caminho, newline="", encoding="utf-8-sig") as f:
+            return importacao.importar_csv(self.db, f, progresso)
+
+
+class ErroServidor(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(f"{status}: {mensagem}")
+        self.status = status
+
+
+class BackendRemoto:
+    """Cliente do servidor.py; uma conexão HTTP keep-alive por thread."""
+    formatos = ["CSV", "JSONL"]  # Parquet não é servido por HTTP
+    TIMEOUT = 30
+
+    def __init__(self, url):
+        partes = urlsplit(url if "//" in url else "http://" + url)
+        self.host = partes.hostname
+        self.porta = partes.port or 80
+        self._local = threading.local()
+        self._conexoes = []  # as de todas as threads, para fechar() fechar todas
+        self._etags = {}  # consulta -> (etag, linhas) para GET condicional
+        self._lock = threading.Lock()
+        self.cache_obs = CacheObservacoes()
+        self.arquivado_ate = None  # atualizado a cada leitura de /alteracoes
+
+    def preparar(self):
+        # Falha cedo se o servidor não responde
+        self.arquivado_ate = self._pedir("GET", "/alteracoes")[1].get("arquivado_ate")
+
+    def iniciar(self):
+        pass
+
+    def fechar(self):
+        with self._lock:
+            conexoes, self._conexoes = self._conexoes, []
+        for conn in conexoes:
+            conn.close()
+        self._local.conn = None
+
+    def feed(self):
+        return FeedRemoto(self)
+
+    def arquivado(self, data_iso):
+        return self.arquivado_ate is not None and data_iso <= self.arquivado_ate
+
+    # ---------------- HTTP ----------------
+    def _conexao(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import http.client
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.porta, timeout=self.TIMEOUT,
+                                                                 blocksize=BLOCO_ENVIO)
+            with self._lock:
+                self._conexoes.append(conn)
+        return conn
+
+    def _descartar(self, conn):
+        conn.close()
+        self._local.conn = None
+        with self._lock:
+            if conn in self._conexoes:
+                self._conexoes.remove(conn)
+
+    def _resposta(self, metodo, caminho, corpo=None, headers=None):
+        import http.client
+        headers = dict(headers or {})
+        if isinstance(corpo, (dict, list)):
+            corpo = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        inicio = corpo.tell() if hasattr(corpo, "read") else None
+        for tentativa in (1, 2):
+            conn = self._conexao()
+            try:
+                if inicio is not None:
+                    corpo.seek(inicio)  # arquivo enviado aos blocos: a nova tentativa manda de novo do começo
+                conn.request(metodo, caminho, body=corpo, headers=headers)
+                return conn.getresponse()
+            except (ConnectionError, http.client.HTTPException):
+                # Servidor fechou a conexão ociosa: reabre uma vez
+                self._descartar(conn)
+                if tentativa == 2:
+                    raise
+
+    def _pedir(self, metodo, caminho, corpo=None, headers=None):
+        resp = self._resposta(metodo, caminho, corpo, headers)
+        dados = resp.read()
+        if resp.status == 304:
+            return resp, None
+        tipo = resp.getheader("Content-Type", "")
+        valor = json.loads(dados) if tipo.startswith("application/json") else dados.decode("utf-8")
+        if resp.status == 409:
+            raise processos.ConflitoEdicao(int(caminho.rsplit("/", 1)[-1]), _tupla(valor.get("atual")))
+        if resp.status >= 400:
+            raise ErroServidor(resp.status, valor.get("erro") if isinstance(valor, dict) else valor)
+        return resp, valor
+
+    @staticmethod
+    def _qs(**params):
+        return urlencode({k: v for k, v in params.items() if v not in (None, "")})
+
+    # ---------------- Leitura ----------------
+    def _linhas(self, data_iso, status, busca, ids=None):
+        caminho = "/processos?" + self._qs(data=data_iso, status=status, busca=busca,
+                                           ids=",".join(map(str, ids)) if ids is not None else None)
+        with self._lock:
+            guardado = self._etags.get(caminho)
+        headers = {"If-None-Match": guardado[0]} if guardado else None
+        resp, valor = self._pedir("GET", caminho, headers=headers)
+        if valor is None:
+            return guardado[1]
+        linhas = [tuple(r) for r in valor["linhas"]]
+        if ids is None:
+            with self._lock:
+                if len(self._etags) >= ETAGS_GUARDADAS:
+                    self._etags.clear()
+                self._etags[caminho] = (resp.getheader("ETag"), linhas)
+        return linhas
+
+    @medir("listar")
+    def listar(self, data_iso, status=None, busca=None):
+        return LinhasEmMemoria(self._linhas(data_iso, status, busca))
+
+    @medir("listar_ids")
+    def listar_ids(self, ids, data_iso, status=None, busca=None):
+        return self._linhas(data_iso, status, busca, sorted(ids))
+
+    def consulta_busca(self, data_iso, status=None, busca=None):
+        # Sem SQL do lado de cá: BuscaAoVivo chama a função na thread de fundo
+        return lambda: self._linhas(data_iso, status, busca)
+
+    @medir("observacoes")
+    def observacoes(self, _id, versao=None):
+        def ler():
+            try:
+                _resp, r = self._pedir("GET", f"/processos/{_id}")
+            except ErroServidor as e:
+                if e.status == 404:
+                    return None
+                raise
+            return r["processo"], r["titulo"], r["observacoes"], r["versao"]
+        return self.cache_obs.buscar(_id, versao, ler)
+
+    @medir("resumo_texto")
+    def resumo_texto(self, data_iso):
+        return self._pedir("GET", "/resumo?" + self._qs(data=data_iso))[1]
+
+    @medir("resumo_periodo_texto")
+    def resumo_periodo_texto(self, inicio, fim):
+        return self._pedir("GET", "/resumo?" + self._qs(data=inicio, fim=fim))[1]
+
+    @medir("relatorio_texto")
+    def relatorio_texto(self, inicio, fim, agrupar=None):
+        return self._pedir("GET", "/relatorio?" + self._qs(inicio=inicio, fim=fim, agrupar=agrupar,
+                                                           formato="texto"))[1]
+
+    @medir("contar")
+    def contar(self, inicio, fim=None, status=None, busca=None):
+        return self._pedir("GET", "/contar?" + self._qs(inicio=inicio, fim=fim, status=status, busca=busca))[1]["total"]
+
+    @medir("exportar")
+    def exportar(self, caminho, formato, inicio, fim=None, status=None, busca=None,
+                 progresso=None, cancelar=None):
+        import exportacao
+        import http.client
+        if formato not in ("csv", "jsonl"):
+            raise RuntimeError("Pelo servidor só há exportação CSV ou JSONL.")
+        # Conexão própria: se cancelar no meio, ela é descartada
+        conn = http.client.HTTPConnection(self.host, self.porta, timeout=self.TIMEOUT)
+        try:
+            conn.request("GET", "/export?" + self._qs(inicio=inicio, fim=fim, status=status,
+                                                      busca=busca, formato=formato))
+            resp = conn.getresponse()
+            if resp.status >= 400:
+                raise ErroServidor(resp.status, json.loads(resp.read()).get("erro"))
+            linhas = 0
+            with open(caminho, "wb") as f:
+                while True:
+                    if cancelar is not None and cancelar.is_set():
+                        raise exportacao.ExportacaoCancelada()
+                    bloco = resp.read1(64 * 1024)
+                    if not bloco:
+                        break
+                    f.write(bloco)
+                    linhas += bloco.count(b"\n")
+                    if progresso:
+                        progresso(linhas)
+        finally:
+            conn.close()
+        return linhas - 1 if formato == "csv" else linhas  # aproximado: observações podem ter quebras
+
+    # ---------------- Backups ----------------
+    # Ficam na máquina do servidor (dailycheck.py backup/restore lá)
+    def listar_backups(self):
+        return []
+
+    def criar_backup(self, progresso=None):
+        raise RuntimeError("Os backups ficam na máquina do servidor: use 'dailycheck.py backup' / 'restore' lá.")
+
+    verificar_backup = restaurar_backup = criar_backup
+
+    # ---------------- Diagnóstico ----------------
+    def metricas(self):
+        """Medições do app (as operações incluem a rede) e, em "servidor", as do servidor (só SQL)."""
+        dados = METRICAS.como_dict()
+        try:
+            dados["servidor"] = self._pedir("GET", "/metricas?formato=json")[1]
+        except ErroServidor:
+            dados["servidor"] = None  # servidor de uma versão sem /metricas
+        return dados
+
+    # ---------------- Escrita ----------------
+    @medir("inserir")
+    def inserir(self, reg):
+        return self._pedir("POST", "/processos", _corpo(reg))[1]["id"]
+
+    @medir("atualizar")
+    def atualizar(self, reg, _id, versao=None):
+        corpo = _corpo(reg)
+        if versao is not None:
+            corpo["versao"] = versao
+        return self._pedir("PUT", f"/processos/{_id}", corpo)[1]["alterados"]
+
+    @medir("excluir")
+    def excluir(self, ids, versoes=None):
+        corpo = {"ids": list(ids)}
+        if versoes is not None:
+            corpo["versoes"] = {str(k): v for k, v in versoes.items()}
+        return self._pedir("POST", "/processos/excluir", corpo)[1]["excluidos"]
+
+    @medir("mover_status")
+    def mover_status(self, ids, novo_status):
+        return self._pedir("POST", "/processos/status", {"ids": list(ids), "status": novo_status})[1]["alterados"]
+
+    @medir("duplicar_dia")
+    def duplicar_dia(self, origem, destino):
+        return self._pedir("POST", "/processos/duplicar", {"origem": origem, "destino": destino})[1]["duplicados"]
+
+    @medir("importar_csv")
+    def importar_csv(self, caminho, progresso=None):
+        import importacao
+        # O arquivo vai aos blocos de BLOCO_ENVIO, sem ser lido inteiro para a memória
+        with open(caminho, "rb") as f:
+            _resp, r = self._pedir("POST", "/importar", f, {"Content-Type": "text/csv",
+                                                           "Content-Length": str(os.fstat(f.fileno()).st_size)})
+        relatorio = importacao.Relatorio()
+        relatorio.lidas, relatorio.inseridas = r["lidas"], r["inseridas"]
+        relatorio.invalidas, relatorio.erros = r["invalidas"], [tuple(e) for e in r["erros"]]
+        if progresso:
+            progresso(relatorio.lidas)
+        return relatorio
+
+
+class FeedRemoto:
+    """Mesma interface de alteracoes.FeedAlteracoes, lendo /alteracoes do servidor."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.ultimo = 0
+        self.sincronizar()
+
+    def sincronizar(self):
+        r = self.backend._pedir("GET", "/alteracoes")[1]
+        self.ultimo, self.backend.arquivado_ate = r["ultimo"], r.get("arquivado_ate")
+
+    def ler(self):
+        r = self.backend._pedir("GET", f"/alteracoes?desde={self.ultimo}")[1]
+        self.backend.arquivado_ate = r.get("arquivado_ate")
+        mud, self.ultimo = montar_mudancas(self.ultimo, r["primeiro"], r["linhas"])
+        return mud
+
+
+def _corpo(reg):
+    return dict(zip(("data", "processo", "titulo", "cliente", "responsavel", "status", "observacoes"), reg))
+
+
+def _tupla(d):
+    # Linha em JSON -> tupla na ordem de processos.COLUNAS_LISTA
+    if d is None:
+        return None
+    return tuple(d[c] for c in ("id", "data", "processo", "titulo", "cliente", "responsavel",
+                                "status", "tem_obs", "versao"))
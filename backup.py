@@ -0,0 +1,336 @@
+# Backups automáticos do banco (sem dependência da interface)
+# Copiar o .db com o app gravando pode gerar uma cópia corrompida; aqui a cópia
+# usa a API de backup do SQLite (Connection.backup) numa conexão própria, em
+# passos de PAGINAS páginas, então roda numa thread de fundo sem travar a
+# interface nem os outros analistas (com WAL, leitura não bloqueia escrita).
+# Um snapshot por dia em <pasta do banco>/backups/<nome>.AAAA-MM-DD.db[.gz],
+# conferido com PRAGMA quick_check; ficam os MANTER mais recentes.
+# Os arquivos por ano (arquivo.py) entram no mesmo conjunto do dia, como
+# <nome>.AAAA-MM-DD.arquivo-AAAA.db[.gz]; a tabela `arquivos` do snapshot
+# principal diz quais são, e restaurar() devolve o conjunto inteiro.
+import contextlib
+import gzip
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date
+
+BACKUP_DIR = os.environ.get("DAILYCHECK_BACKUP_DIR")  # padrão: "backups" ao lado do banco
+MANTER = int(os.environ.get("DAILYCHECK_BACKUP_MANTER", "14"))  # snapshots diários guardados
+GZIP = os.environ.get("DAILYCHECK_BACKUP_GZIP", "") not in ("", "0")
+PAGINAS = 1024           # páginas por passo da cópia (4 MB com páginas de 4 KB)
+PAUSA = 0.01             # segundos entre passos: a UI e os outros escritores respiram
+ATRASO_INICIAL = 60      # segundos depois de abrir antes do backup do dia (não pesa na abertura)
+VERIFICAR_A_CADA = 3600  # app aberto de um dia para o outro também faz o backup do dia seguinte
+
+log = logging.getLogger("dailycheck.backup")
+
+
+class ErroBackup(Exception):
+    pass
+
+
+class Snapshot:
+    __slots__ = ("caminho", "dia", "tamanho", "arquivos")
+
+    def __init__(self, caminho, dia, tamanho, arquivos=None):
+        self.caminho = caminho
+        self.dia = dia
+        self.tamanho = tamanho           # do conjunto: banco principal + arquivos
+        self.arquivos = arquivos or {}   # ano -> caminho do snapshot do arquivo do ano
+
+    @property
+    def comprimido(self):
+        return self.caminho.endswith(".gz")
+
+
+def pasta(db_path, diretorio=None):
+    return diretorio or BACKUP_DIR or os.path.join(os.path.dirname(os.path.abspath(db_path)), "backups")
+
+
+def _nome(db_path):
+    return os.path.splitext(os.path.basename(db_path))[0]
+
+
+def listar(db_path, diretorio=None):
+    """Snapshots do banco (com os arquivos do mesmo dia), do mais recente para o mais antigo."""
+    d = pasta(db_path, diretorio)
+    padrao = re.compile(
+        rf"^{re.escape(_nome(db_path))}\.(\d{{4}}-\d{{2}}-\d{{2}})\.(?:arquivo-(\d{{4}})\.)?db(\.gz)?$")
+    try:
+        nomes = os.listdir(d)
+    except FileNotFoundError:
+        return []
+    principais, arquivos = [], {}
+    for nome in nomes:
+        m = padrao.match(nome)
+        if m:
+            caminho = os.path.join(d, nome)
+            if m.group(2):
+                arquivos.setdefault(m.group(1), {})[int(m.group(2))] = caminho
+            else:
+                principais.append((caminho, m.group(1)))
+    snapshots = []
+    for caminho, dia in principais:
+        do_dia = arquivos.get(dia, {})
+        tamanho = os.path.getsize(caminho) + sum(os.path.getsize(c) for c in do_dia.values())
+        snapshots.append(Snapshot(caminho, dia, tamanho, do_dia))
+    snapshots.sort(key=lambda s: (s.dia, s.comprimido), reverse=True)
+    return snapshots
+
+
+def _copiar(origem, destino, progresso=None, paginas=PAGINAS, pausa=PAUSA):
+    """Cópia consistente de origem (caminho ou conexão) para destino (caminho ou conexão)."""
+    src = sqlite3.connect(origem, isolation_level=None) if isinstance(origem, str) else origem
+    dst = sqlite3.connect(destino) if isinstance(destino, str) else destino
+    try:
+        def passo(_status, restantes, total):
+            if progresso:
+                progresso(total - restantes, total)
+            if pausa:
+                time.sleep(pausa)
+        # Uma transação de leitura aberta durante toda a cópia fixa o estado da
+        # origem: com WAL os outros seguem gravando e a cópia não recomeça a cada commit
+        aberta = isinstance(origem, str)
+        if aberta:
+            src.execute("BEGIN")
+            src.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        try:
+            src.backup(dst, pages=paginas, progress=passo)
+        finally:
+            if aberta:
+                src.execute("COMMIT")
+        if isinstance(destino, str):
+            dst.execute("PRAGMA journal_mode=DELETE")  # snapshot num arquivo só, sem -wal
+    finally:
+        if isinstance(destino, str):
+            dst.close()
+        if isinstance(origem, str):
+            src.close()
+
+
+@contextlib.contextmanager
+def _descomprimido(caminho):
+    """Caminho de um .db legível: o próprio arquivo ou uma cópia descomprimida temporária."""
+    if not caminho.endswith(".gz"):
+        yield caminho
+        return
+    fd, tmp = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(os.path.abspath(caminho)))
+    try:
+        with os.fdopen(fd, "wb") as saida, gzip.open(caminho, "rb") as entrada:
+            shutil.copyfileobj(entrada, saida, 1024 * 1024)
+        yield tmp
+    finally:
+        os.remove(tmp)
+
+
+def verificar(caminho):
+    """PRAGMA quick_check do snapshot; [] se íntegro, senão as mensagens do SQLite."""
+    with _descomprimido(caminho) as arquivo:
+        conn = sqlite3.connect(arquivo)
+        try:
+            msgs = [m for (m,) in conn.execute("PRAGMA quick_check")]
+        except sqlite3.DatabaseError as e:  # nem é um banco SQLite
+            msgs = [str(e)]
+        finally:
+            conn.close()
+    return [] if msgs == ["ok"] else msgs
+
+
+def _manifesto(caminho):
+    """{ano: (arquivo, ate)} da tabela `arquivos` do banco (ou snapshot) em `caminho`."""
+    conn = sqlite3.connect(caminho)
+    try:
+        return {ano: (nome, ate) for ano, nome, ate in conn.execute("SELECT ano, arquivo, ate FROM arquivos")}
+    except sqlite3.OperationalError:  # banco ainda sem a migração 7
+        return {}
+    finally:
+        conn.close()
+
+
+def _arquivos_do_snapshot(caminho, anos):
+    """{ano: caminho} dos snapshots dos arquivos que acompanham o snapshot principal `caminho`."""
+    raiz = re.sub(r"\.db(\.gz)?$", "", caminho)
+    achados = {}
+    for ano in anos:
+        for ext in (".db", ".db.gz"):
+            if os.path.exists(f"{raiz}.arquivo-{ano}{ext}"):
+                achados[ano] = f"{raiz}.arquivo-{ano}{ext}"
+                break
+    return achados
+
+
+def _conferir(tmp, comprimir):
+    """Confere a cópia em tmp e comprime se pedido; retorna o arquivo pronto para o os.replace."""
+    erros = verificar(tmp)
+    if erros:
+        raise ErroBackup(f"cópia {os.path.basename(tmp)} falhou no quick_check: {erros[0]}")
+    if not comprimir:
+        return tmp
+    with open(tmp, "rb") as entrada, gzip.open(tmp + ".gz", "wb", compresslevel=6) as saida:
+        shutil.copyfileobj(entrada, saida, 1024 * 1024)
+    os.remove(tmp)
+    return tmp + ".gz"
+
+
+def criar(db_path, diretorio=None, dia=None, comprimir=GZIP, progresso=None):
+    """
+    Snapshot do dia (padrão: hoje) do banco e dos arquivos por ano registrados
+    nele, substituindo o conjunto do mesmo dia se houver; retorna o Snapshot.
+    """
+    dia = dia or date.today().isoformat()
+    d = pasta(db_path, diretorio)
+    os.makedirs(d, exist_ok=True)
+    raiz = os.path.join(d, f"{_nome(db_path)}.{dia}")
+    gz = ".gz" if comprimir else ""
+    prontos = []  # (temporário, base) de cada arquivo do conjunto
+    try:
+        tmp = raiz + ".db.tmp"
+        _copiar(db_path, tmp, progresso)
+        # O manifesto vem da cópia: os arquivos que esse estado do banco usa
+        manifesto = _manifesto(tmp)
+        prontos.append((_conferir(tmp, comprimir), raiz + ".db"))
+        pasta_db = os.path.dirname(os.path.abspath(db_path))
+        for ano, (nome, _ate) in sorted(manifesto.items()):
+            origem = os.path.join(pasta_db, nome)
+            if not os.path.exists(origem):
+                log.warning("backup sem o arquivo de %d: %s não existe", ano, origem)
+                continue
+            base = f"{raiz}.arquivo-{ano}.db"
+            _copiar(origem, base + ".tmp")
+            prontos.append((_conferir(base + ".tmp", comprimir), base))
+        # arquivar() rodando no meio trocaria os arquivos depois da cópia do principal
+        if _manifesto(db_path) != manifesto:
+            raise ErroBackup("o banco foi arquivado durante o backup; tente de novo")
+        for tmp, base in prontos:
+            os.replace(tmp, base + gz)
+    finally:
+        for nome in os.listdir(d):
+            sobra = os.path.join(d, nome)
+            if sobra.startswith(raiz + ".") and sobra.endswith((".tmp", ".tmp.gz")):
+                os.remove(sobra)
+    # Um conjunto por dia: os do outro formato (com/sem gzip) e os arquivos que não fazem parte dele saem
+    feitos = {base + gz for _tmp, base in prontos}
+    for nome in os.listdir(d):
+        caminho = os.path.join(d, nome)
+        if caminho.startswith(raiz + ".") and caminho not in feitos and re.fullmatch(
+                r"\.(?:arquivo-\d{4}\.)?db(\.gz)?", caminho[len(raiz):]):
+            os.remove(caminho)
+    return next(s for s in listar(db_path, diretorio) if s.dia == dia)
+
+
+def rotacionar(db_path, diretorio=None, manter=MANTER):
+    """Apaga os snapshots (com seus arquivos) além dos `manter` mais recentes; retorna os apagados."""
+    snapshots = listar(db_path, diretorio)
+    mantidos = {s.dia for s in snapshots[:max(manter, 1)]}
+    removidos = snapshots[max(manter, 1):]
+    for s in removidos:
+        os.remove(s.caminho)
+        if s.dia not in mantidos:
+            for c in s.arquivos.values():
+                os.remove(c)
+    return removidos
+
+
+def backup_do_dia(db_path, diretorio=None, manter=MANTER, comprimir=GZIP, forcar=False):
+    """Cria o snapshot de hoje se ainda não houver (ou se `forcar`) e aplica a retenção."""
+    hoje = date.today().isoformat()
+    novo = None
+    if forcar or not any(s.dia == hoje for s in listar(db_path, diretorio)):
+        novo = criar(db_path, diretorio, hoje, comprimir)
+        log.info("backup %s (%d KB)", novo.caminho, novo.tamanho // 1024)
+    rotacionar(db_path, diretorio, manter)
+    return novo
+
+
+def restaurar(db, caminho, progresso=None):
+    """
+    Substitui o conteúdo do banco aberto em `db` (db.Database) pelo snapshot.
+    Usa a API de backup no sentido inverso, com o lock de escrita do SQLite: as
+    outras conexões (e analistas) veem o banco restaurado no próximo acesso.
+    Os arquivos por ano que o snapshot registra voltam junto, do mesmo dia, para
+    o banco e os arquivos ficarem coerentes. Antes guarda o estado atual em
+    <nome>.antes-de-restaurar.db (e .antes-de-restaurar.arquivo-AAAA.db) na pasta de backups.
+    Roda em qualquer thread (a janela de backups chama em fundo): nada aqui usa db.conn.
+    """
+    from db import Database, init_db
+    erros = verificar(caminho)
+    if erros:
+        raise ErroBackup(f"snapshot com erro de integridade: {erros[0]}")
+    with _descomprimido(caminho) as arquivo:
+        manifesto = _manifesto(arquivo)
+    arquivos = _arquivos_do_snapshot(caminho, manifesto)
+    for ano in sorted(set(manifesto) - set(arquivos)):
+        # Snapshot de antes de os arquivos entrarem no backup: o arquivo atual fica
+        log.warning("snapshot sem o arquivo de %d; %s fica como está", ano, manifesto[ano][0])
+    for ano, c in arquivos.items():
+        erros = verificar(c)
+        if erros:
+            raise ErroBackup(f"arquivo de {ano} do snapshot com erro de integridade: {erros[0]}")
+    d = pasta(db.path)
+    os.makedirs(d, exist_ok=True)
+    _copiar(db.path, os.path.join(d, f"{_nome(db.path)}.antes-de-restaurar.db"))
+    pasta_db = os.path.dirname(os.path.abspath(db.path))
+    for ano, (nome, _ate) in _manifesto(db.path).items():
+        if os.path.exists(os.path.join(pasta_db, nome)):
+            _copiar(os.path.join(pasta_db, nome),
+                    os.path.join(d, f"{_nome(db.path)}.antes-de-restaurar.arquivo-{ano}.db"))
+    # Arquivos primeiro: quando o principal (e o 'R') chegar, já estão no estado dele
+    for ano, c in sorted(arquivos.items()):
+        with _descomprimido(c) as arquivo:
+            _copiar(arquivo, os.path.join(pasta_db, manifesto[ano][0]), pausa=0)
+    with _descomprimido(caminho) as arquivo, db.conectar() as conn:
+        visto = conn.execute("SELECT coalesce(max(seq), 0) FROM alteracoes").fetchone()[0]
+        src = sqlite3.connect(arquivo)
+        try:
+            _copiar(src, conn, progresso, pausa=0)
+        finally:
+            src.close()
+    # Migração e aviso numa conexão própria desta thread, como em BackendLocal.preparar()
+    aux = Database(db.path, pool_size=0, journal_mode=db.journal_mode)
+    try:
+        init_db(aux)  # snapshot de uma versão anterior do esquema é migrado
+        with aux.transaction() as conn:
+            # O feed do snapshot é mais antigo: um 'R' acima de tudo que já foi lido
+            # faz as janelas abertas recarregarem
+            conn.execute("""INSERT INTO alteracoes (seq, processo_id, operacao)
+                            SELECT max(?, coalesce(max(seq), 0)) + 1, 0, 'R' FROM alteracoes""", (visto,))
+        db.fts = aux.fts
+    finally:
+        aux.close()
+    with db.conectar() as conn:
+        db.ler_arquivos(conn)
+    db.tocar()
+
+
+class BackupDiario(threading.Thread):
+    """Faz o backup do dia ATRASO_INICIAL s depois de iniciar e confere de novo a cada hora."""
+
+    def __init__(self, db_path, diretorio=None, manter=MANTER, comprimir=GZIP, atraso=ATRASO_INICIAL):
+        super().__init__(name="backup", daemon=True)
+        self.db_path = db_path
+        self.diretorio = diretorio
+        self.manter = manter
+        self.comprimir = comprimir
+        self.atraso = atraso
+        self.erro = None  # última falha, para quem quiser mostrar
+        self._parar = threading.Event()
+
+    def run(self):
+        espera = self.atraso
+        while not self._parar.wait(espera):
+            try:
+                backup_do_dia(self.db_path, self.diretorio, self.manter, self.comprimir)
+                self.erro = None
+            except (OSError, sqlite3.Error, ErroBackup) as e:
+                self.erro = e
+                log.warning("backup falhou: %s", e)
+            espera = VERIFICAR_A_CADA
+
+    def parar(self):
+        self._parar.set()
@@ -0,0 +1,128 @@
+# Janela de backups: lista os snapshots, cria um na hora, verifica e restaura
+# Cópia, quick_check e restauração rodam numa thread; a janela só acompanha por after().
+import os
+import threading
+from tkinter import messagebox, ttk
+
+import customtkinter as ctk
+
+from datas import br_data
+
+VERIFICAR_MS = 100
+
+
+class JanelaBackups(ctk.CTkToplevel):
+    def __init__(self, master, backend, ao_restaurar):
+        super().__init__(master)
+        self.backend = backend
+        self.ao_restaurar = ao_restaurar
+        self.title("Backups")
+        self.geometry("640x380")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self, columns=("dia", "tamanho", "arquivo"), show="headings",
+                                 selectmode="browse")
+        for col, titulo, largura in (("dia", "Dia", 100), ("tamanho", "Tamanho", 100), ("arquivo", "Arquivo", 400)):
+            self.tree.heading(col, text=titulo)
+            self.tree.column(col, width=largura, anchor="w")
+        self.tree.grid(row=0, column=0, sticky="nsew", padx=12, pady=(12, 6))
+
+        self.lbl = ctk.CTkLabel(self, text="")
+        self.lbl.grid(row=1, column=0, sticky="w", padx=12)
+
+        btns = ctk.CTkFrame(self, fg_color="transparent")
+        btns.grid(row=2, column=0, sticky="e", padx=12, pady=(6, 12))
+        self.botoes = [
+            ctk.CTkButton(btns, text="Fazer backup agora", width=150, command=self._criar),
+            ctk.CTkButton(btns, text="Verificar", width=100, command=self._verificar),
+            ctk.CTkButton(btns, text="Restaurar…", width=100, fg_color="#8a1c1c", hover_color="#6f1515",
+                          command=self._restaurar),
+            ctk.CTkButton(btns, text="Fechar", width=100, command=self.destroy),
+        ]
+        for i, b in enumerate(self.botoes):
+            b.grid(row=0, column=i, padx=4)
+        self._listar()
+
+    def _listar(self):
+        self.tree.delete(*self.tree.get_children())
+        for s in self.backend.listar_backups():
+            self.tree.insert("", "end", iid=s.caminho, values=(
+                br_data(s.dia), f"{s.tamanho / 1024 / 1024:.1f} MB" + (" (gz)" if s.comprimido else ""),
+                os.path.basename(s.caminho)))
+        if not self.tree.get_children():
+            self.lbl.configure(text="Nenhum backup ainda (o do dia é feito automaticamente).")
+
+    def _selecionado(self):
+        sel = self.tree.selection()
+        if not sel:
+            messagebox.showinfo("Seleção vazia", "Selecione um backup na lista.", parent=self)
+            return None
+        return sel[0]
+
+    def _em_fundo(self, texto, fn, ao_terminar):
+        """Roda fn() numa thread com os botões desligados; ao_terminar(resultado) na thread da UI."""
+        estado = {"fim": None, "feitas": 0, "total": 0}
+
+        def progresso(feitas, total):
+            estado["feitas"], estado["total"] = feitas, total
+
+        def rodar():
+            try:
+                estado["fim"] = (fn(progresso), None)
+            except Exception as e:
+                estado["fim"] = (None, e)
+
+        def acompanhar():
+            if estado["fim"] is None:
+                pct = f" {100 * estado['feitas'] // estado['total']}%" if estado["total"] else ""
+                self.lbl.configure(text=texto + pct)
+                self.after(VERIFICAR_MS, acompanhar)
+                return
+            for b in self.botoes:
+                b.configure(state="normal")
+            self.lbl.configure(text="")
+            resultado, erro = estado["fim"]
+            if erro is not None:
+                messagebox.showerror("Erro no backup", str(erro), parent=self)
+                return
+            ao_terminar(resultado)
+
+        for b in self.botoes:
+            b.configure(state="disabled")
+        threading.Thread(target=rodar, daemon=True).start()
+        self.after(VERIFICAR_MS, acompanhar)
+
+    def _criar(self):
+        def pronto(s):
+            self._listar()
+            messagebox.showinfo("Backup criado", f"Snapshot salvo em:\n{s.caminho}", parent=self)
+        self._em_fundo("Copiando…", lambda progresso: self.backend.criar_backup(progresso), pronto)
+
+    def _verificar(self):
+        caminho = self._selecionado()
+        if caminho is None:
+            return
+
+        def pronto(erros):
+            if erros:
+                messagebox.showerror("Backup com problema", "\n".join(erros[:10]), parent=self)
+            else:
+                messagebox.showinfo("Backup íntegro", "quick_check: ok", parent=self)
+        self._em_fundo("Verificando…", lambda _p: self.backend.verificar_backup(caminho), pronto)
+
+    def _restaurar(self):
+        caminho = self._selecionado()
+        if caminho is None:
+            return
+        if not messagebox.askyesno(
+                "Restaurar backup",
+                f"Substituir TODOS os dados atuais pelo backup de {self.tree.item(caminho, 'values')[0]}?\n\n"
+                "O estado atual é guardado antes em *.antes-de-restaurar.db.", parent=self):
+            return
+
+        def pronto(_r):
+            self.ao_restaurar()
+            messagebox.showinfo("Restaurado", "Backup restaurado.", parent=self)
+            self.destroy()
+        self._em_fundo("Restaurando…", lambda progresso: self.backend.restaurar_backup(caminho, progresso), pronto)
@@ -0,0 +1,93 @@
+# Micro-benchmark: sqlite3.connect por chamada (caminho antigo) x Database persistente
+# Uso: python benchmarks/bench_conexao.py [--inserts 10000] [--reloads 1000]
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import Database, init_db  # noqa: E402
+
+INSERT_SQL = """INSERT INTO processos
+   (data, processo, titulo, cliente, responsavel, status, observacoes)
+   VALUES (?,?,?,?,?,?,?)"""
+LISTA_SQL = """SELECT id, data, processo, titulo, cliente, responsavel, status, observacoes
+               FROM processos WHERE data = ? ORDER BY id DESC"""
+
+
+def registro(i):
+    dia = 1 + i % 28
+    return (f"2024-01-{dia:02d}", str(100000 + i), f"Chamado {i}", "Cliente X",
+            "Ana", "Atendido", "obs" if i % 3 else None)
+
+
+def antigo_insert(path, reg):
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute(INSERT_SQL, reg)
+    conn.commit()
+    conn.close()
+
+
+def antigo_reload(path, data):
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    rows = list(c.execute(LISTA_SQL, (data,)))
+    conn.close()
+    return rows
+
+
+def novo_insert(db, reg):
+    with db.transaction() as conn:
+        conn.execute(INSERT_SQL, reg)
+
+
+def novo_reload(db, data):
+    return list(db.execute(LISTA_SQL, (data,)))
+
+
+def cronometrar(fn, n):
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--inserts", type=int, default=10000)
+    ap.add_argument("--reloads", type=int, default=1000)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        antigo = os.path.join(tmp, "antigo.db")
+        novo = os.path.join(tmp, "novo.db")
+        for path in (antigo, novo):
+            db = Database(path)
+            init_db(db)
+            db.close()
+        # o banco "antigo" volta ao journal padrão, como era antes
+        sqlite3.connect(antigo).execute("PRAGMA journal_mode=DELETE").close()
+
+        db = Database(novo)
+        resultados = [
+            ("insert (conexão por chamada)", args.inserts,
+             cronometrar(lambda i: antigo_insert(antigo, registro(i)), args.inserts)),
+            ("insert (Database/WAL)", args.inserts,
+             cronometrar(lambda i: novo_insert(db, registro(i)), args.inserts)),
+            ("reload (conexão por chamada)", args.reloads,
+             cronometrar(lambda i: antigo_reload(antigo, f"2024-01-{1 + i % 28:02d}"), args.reloads)),
+            ("reload (Database/WAL)", args.reloads,
+             cronometrar(lambda i: novo_reload(db, f"2024-01-{1 + i % 28:02d}"), args.reloads)),
+        ]
+        db.close()
+
+    for nome, n, seg in resultados:
+        print(f"{nome:32s} {n:6d} ops  {seg:8.3f}s  {seg / n * 1e6:10.1f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Micro-benchmark das conversões de data (datas.py) contra as versões originais
+# com strptime/strftime, mais uma verificação de equivalência com entradas
+# aleatórias (válidas e inválidas): a saída e o tipo de erro devem ser iguais.
+# Uso: python benchmarks/bench_datas.py [--linhas 1000000] [--casos 200000]
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datas  # noqa: E402
+
+
+def br_data_original(d):
+    return datetime.strptime(d, "%Y-%m-%d").strftime("%d/%m/%Y")
+
+
+def iso_data_original(d):
+    return datetime.strptime(d, "%d/%m/%Y").strftime("%Y-%m-%d")
+
+
+def resultado(fn, valor):
+    try:
+        return ("ok", fn(valor))
+    except Exception as e:
+        return ("erro", type(e))
+
+
+def casos_aleatorios(rng, n):
+    # Mistura datas válidas, dias/meses fora do intervalo, formas sem zero à
+    # esquerda, separadores trocados, espaços, anos curtos e lixo.
+    alfabeto = "0123456789-/ .x٣"
+    for _ in range(n):
+        tipo = rng.random()
+        a, m, d = rng.randint(1, 9999), rng.randint(0, 13), rng.randint(0, 32)
+        if tipo < 0.4:
+            yield f"{a:04d}-{m:02d}-{d:02d}", f"{d:02d}/{m:02d}/{a:04d}"
+        elif tipo < 0.6:
+            yield f"{a}-{m}-{d}", f"{d}/{m}/{a}"
+        elif tipo < 0.7:
+            yield f" {a:04d}-{m:02d}-{d:02d}", f"{d:02d}/{m:02d}/{a:04d} "
+        elif tipo < 0.8:
+            yield f"{a:04d}/{m:02d}/{d:02d}", f"{d:02d}-{m:02d}-{a:04d}"
+        else:
+            s = "".join(rng.choice(alfabeto) for _ in range(rng.randint(0, 12)))
+            yield s, s
+
+
+def verificar(n, seed=1234):
+    rng = random.Random(seed)
+    divergencias = 0
+    for iso, br in casos_aleatorios(rng, n):
+        for novo, antigo, valor in ((datas.br_data, br_data_original, iso),
+                                    (datas.iso_data, iso_data_original, br)):
+            if resultado(novo, valor) != resultado(antigo, valor):
+                divergencias += 1
+                if divergencias <= 10:
+                    print(f"  DIVERGÊNCIA {novo.__name__}({valor!r}): "
+                          f"{resultado(novo, valor)} != {resultado(antigo, valor)}")
+    print(f"equivalência: {2 * n} casos, {divergencias} divergência(s)")
+    return divergencias == 0
+
+
+def cronometrar(nome, fn, valores):
+    t0 = time.perf_counter()
+    fn(valores)
+    seg = time.perf_counter() - t0
+    print(f"  {nome:36s} {seg * 1000:9.1f} ms  {seg / len(valores) * 1e9:8.0f} ns/linha")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--casos", type=int, default=200_000)
+    args = ap.parse_args(argv)
+
+    ok = verificar(args.casos)
+
+    # Distribuição realista: poucos anos de datas repetidas em muitas linhas
+    inicio = date(2020, 1, 1)
+    valores = [(inicio + timedelta(days=i % 1500)).isoformat() for i in range(args.linhas)]
+    valores_br = [br_data_original(v) for v in valores]
+    print(f"{args.linhas} linhas, {len(set(valores))} datas distintas")
+    cronometrar("br_data original (strptime)", lambda vs: [br_data_original(v) for v in vs], valores)
+    datas.br_data.cache_clear()
+    cronometrar("br_data novo (fatiamento + LRU)", lambda vs: [datas.br_data(v) for v in vs], valores)
+    cronometrar("br_datas (lote)", datas.br_datas, valores)
+    cronometrar("iso_data original (strptime)", lambda vs: [iso_data_original(v) for v in vs], valores_br)
+    datas.iso_data.cache_clear()
+    cronometrar("iso_data novo (fatiamento + LRU)", lambda vs: [datas.iso_data(v) for v in vs], valores_br)
+    distintas = [(inicio + timedelta(days=i)).isoformat() for i in range(min(args.linhas, 100_000))]
+    datas.br_data.cache_clear()
+    cronometrar("br_data novo, só datas distintas", lambda vs: [datas.br_data(v) for v in vs], distintas)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# Benchmark: exportação em streaming sobre um banco sintético grande
+# Cada formato roda num processo filho para medir o pico de memória (RSS)
+# de forma isolada; o caminho antigo (fetchall + csv) entra como referência.
+# Uso: python benchmarks/bench_exportacao.py [--linhas 1000000]
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import exportacao  # noqa: E402
+import processos  # noqa: E402
+from db import Database, init_db  # noqa: E402
+
+INICIO, FIM = "2020-01-01", "2024-12-31"
+
+
+def popular(db, n):
+    status = processos.STATUS_OPCOES
+
+    def regs():
+        for i in range(n):
+            dia = i * 1826 // n
+            ano, resto = divmod(dia, 365)
+            mes, d = divmod(resto, 31)
+            yield (f"{2020 + ano:04d}-{1 + mes % 12:02d}-{1 + d % 28:02d}", str(100000 + i % 50000),
+                   f"Chamado {i} - erro ao emitir cupom", f"Loja {i % 300}", f"Analista {i % 12}",
+                   status[i % len(status)], "Cliente relatou lentidão no PDV. " * (i % 3))
+    processos.inserir_varios(db, regs())
+
+
+def pico_rss_kb():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def filho(path, formato, destino):
+    db = Database(path)
+    t0 = time.perf_counter()
+    if formato == "antigo":
+        import csv
+        from datas import br_data
+        colunas = exportacao.COLUNAS.format(observacoes_grandes="observacoes_grandes")
+        rows = db.execute(f"SELECT {colunas} FROM processos p "
+                          "WHERE p.data BETWEEN ? AND ? ORDER BY p.data, p.id", (INICIO, FIM)).fetchall()
+        with open(destino, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f, delimiter=";")
+            w.writerow(exportacao.CABECALHO)
+            for r in rows:
+                r = list(r)
+                r[0] = br_data(r[0])
+                w.writerow(r)
+        n = len(rows)
+    else:
+        n = exportacao.exportar(db, destino, formato, INICIO, FIM)
+    seg = time.perf_counter() - t0
+    print(f"{formato:8s} {n:9d} linhas  {seg:7.2f}s  {n / seg:10.0f} linhas/s  "
+          f"pico RSS {pico_rss_kb() / 1024:7.1f} MB  arquivo {os.path.getsize(destino) / 2**20:7.1f} MB")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--filho", nargs=3, metavar=("DB", "FORMATO", "DESTINO"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.filho:
+        filho(*args.filho)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db = Database(path)
+        init_db(db)
+        t0 = time.perf_counter()
+        popular(db, args.linhas)
+        db.close()
+        print(f"{args.linhas} linhas geradas em {time.perf_counter() - t0:.1f}s")
+
+        formatos = ["antigo", "csv", "jsonl"] + (["parquet"] if exportacao.parquet_disponivel() else [])
+        for formato in formatos:
+            destino = os.path.join(tmp, f"saida.{formato}")
+            subprocess.run([sys.executable, os.path.abspath(__file__), "--filho", path, formato, destino],
+                           check=True)
+            os.remove(destino)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Benchmark: relatórios sobre vários anos de histórico sintético
+# Compara as consultas sobre as tabelas de totais (relatorios.py) com as mesmas
+# agregações feitas direto em `processos`, e mede o custo dos triggers de
+# totais numa inclusão avulsa.
+# Uso: python benchmarks/bench_relatorios.py [--linhas 500000] [--anos 5]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import processos  # noqa: E402
+import relatorios  # noqa: E402
+from db import TOTAIS_TRIGGERS, Database, init_db  # noqa: E402
+
+SEMANA = relatorios.AGRUPAMENTOS["semana"][2]
+
+# Mesmas perguntas, lidas de processos (sem os totais)
+DIRETO = {
+    "por responsável": f"""
+        WITH t AS (SELECT {SEMANA} AS periodo, coalesce(responsavel, '') AS responsavel, count(*) AS n
+                   FROM processos WHERE data BETWEEN ? AND ? GROUP BY 1, 2)
+        SELECT periodo, responsavel, n, n - lag(n, 1, 0) OVER (PARTITION BY responsavel ORDER BY periodo),
+               sum(n) OVER (PARTITION BY responsavel ORDER BY periodo) FROM t""",
+    "status": f"""
+        WITH t AS (SELECT {SEMANA} AS periodo, status, count(*) AS n
+                   FROM processos WHERE data BETWEEN ? AND ? GROUP BY 1, 2)
+        SELECT periodo, status, n, round(100.0 * n / sum(n) OVER (PARTITION BY periodo), 1) FROM t""",
+    "top clientes": """
+        SELECT cliente, count(*) AS n FROM processos
+        WHERE data BETWEEN ? AND ? AND cliente IS NOT NULL GROUP BY cliente ORDER BY n DESC LIMIT 10""",
+    "ciclo": """
+        WITH c AS (SELECT processo, min(data) AS primeira, max(data) AS ultima FROM processos GROUP BY processo)
+        SELECT count(*), avg(julianday(ultima) - julianday(primeira) + 1) FROM c
+        WHERE primeira BETWEEN ? AND ?""",
+}
+
+
+def popular(db, n, anos):
+    rnd = random.Random(42)
+    inicio = date(2024 - anos, 1, 1)
+    dias = anos * 365
+    status = processos.STATUS_OPCOES
+
+    def regs():
+        for i in range(n):
+            d = inicio + timedelta(days=i * dias // n)
+            # ~1/3 dos processos reaparece em dias seguintes (duplicar de ontem)
+            proc = str(100000 + (i // 3 if rnd.random() < 0.33 else i))
+            yield (d.isoformat(), proc, f"Chamado {i}", f"Loja {rnd.randrange(400)}",
+                   f"Analista {rnd.randrange(15)}", rnd.choice(status), None)
+
+    processos.inserir_varios(db, regs())
+    return inicio.isoformat(), (inicio + timedelta(days=dias - 1)).isoformat()
+
+
+def cronometrar(fn, repeticoes=5):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--linhas", type=int, default=500000)
+    ap.add_argument("--anos", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        init_db(db)
+        t0 = time.perf_counter()
+        inicio, fim = popular(db, args.linhas, args.anos)
+        print(f"{args.linhas} linhas em {args.anos} ano(s) ({inicio} a {fim}), "
+              f"carga {time.perf_counter() - t0:.1f}s")
+        for tabela in ("totais_dia", "totais_semana", "totais_mes", "totais_cliente_mes", "ciclo_hist"):
+            print(f"  {tabela}: {db.execute(f'SELECT count(*) FROM {tabela}').fetchone()[0]} linhas")
+
+        periodos = {"1 semana": (fim[:8] + "01", fim[:8] + "07"), "1 ano": (fim[:4] + "-01-01", fim),
+                    "tudo": (inicio, fim)}
+        totais = {
+            "por responsável": lambda i, f: relatorios.por_responsavel(db, i, f),
+            "status": lambda i, f: relatorios.status_no_tempo(db, i, f),
+            "top clientes": lambda i, f: relatorios.top_clientes(db, i, f),
+            "ciclo": lambda i, f: relatorios.ciclo(db, i, f),
+        }
+        print(f"{'consulta':<16}{'período':<10}{'totais ms':>11}{'direto ms':>11}")
+        for nome, fn in totais.items():
+            for rotulo, (i, f) in periodos.items():
+                t_totais = cronometrar(lambda: fn(i, f))
+                t_direto = cronometrar(lambda: db.execute(DIRETO[nome], (i, f)).fetchall(), 2)
+                print(f"{nome:<16}{rotulo:<10}{t_totais:>11.2f}{t_direto:>11.1f}")
+        t_texto = cronometrar(lambda: relatorios.relatorio_texto(db, inicio, fim))
+        print(f"relatorio_texto de todo o período: {t_texto:.1f} ms")
+
+        # Custo dos triggers de totais numa inclusão avulsa
+        reg = (fim, "999999", "Bench", "Loja 1", "Analista 1", processos.STATUS_OPCOES[0], None)
+        t_com = cronometrar(lambda: processos.inserir(db, reg), 200)
+        with db.transaction() as conn:
+            for nome in ("totais_ai",):
+                conn.execute(f"DROP TRIGGER {nome}")
+        t_sem = cronometrar(lambda: processos.inserir(db, reg), 200)
+        with db.transaction() as conn:
+            conn.execute(TOTAIS_TRIGGERS[0])
+        print(f"inclusão avulsa: {t_com:.3f} ms com triggers de totais, {t_sem:.3f} ms sem")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
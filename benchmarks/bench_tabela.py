@@ -0,0 +1,107 @@
+# Benchmark: tempo de bloqueio da thread da UI ao filtrar um resultado grande
+# Compara o caminho antigo (apaga item a item + insere todas as linhas) com a
+# TabelaVirtual (delete em lote + primeira página via fetchmany), e a recarga
+# após uma edição com o delta (relê só a linha editada e atualiza um item).
+# Precisa de um display para o Tk; sem display mede apenas a parte do banco.
+# Uso: python benchmarks/bench_tabela.py [--linhas 100000]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import processos  # noqa: E402
+from db import Database, init_db  # noqa: E402
+from tabela import TabelaVirtual  # noqa: E402
+
+DIA = "2024-03-15"
+
+
+def popular(db, n):
+    regs = ((DIA, str(100000 + i), f"Chamado {i} - lentidão no PDV", f"Loja {i % 300}",
+             f"Analista {i % 12}", "Atendido", "obs" if i % 4 == 0 else None) for i in range(n))
+    processos.inserir_varios(db, regs)
+
+
+def formatar(row):
+    _id, data, processo, titulo, cliente, responsavel, status, obs, _versao = row
+    return str(_id), (data, processo, titulo, cliente or "", responsavel or "", status,
+                      "..." if (obs and obs.strip()) else "")
+
+
+def antigo(tree, db, busca):
+    for i in tree.get_children():
+        tree.delete(i)
+    for row in processos.listar(db, DIA, None, busca):
+        iid, values = formatar(row)
+        tree.insert("", "end", iid=iid, values=values)
+
+
+def cronometrar(fn, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--linhas", type=int, default=100000)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        init_db(db)
+        popular(db, args.linhas)
+        buscas = ["", "lentidão", "Loja 1"]
+
+        print(f"{args.linhas} linhas em {DIA}")
+        for busca in buscas:
+            t_fetchall = cronometrar(lambda: processos.listar(db, DIA, None, busca).fetchall())
+            t_pagina = cronometrar(lambda: processos.listar(db, DIA, None, busca).fetchmany(200))
+            print(f"  busca={busca!r:12s} banco: fetchall {t_fetchall * 1000:8.1f} ms | "
+                  f"primeira página {t_pagina * 1000:8.1f} ms")
+        _id = db.execute("SELECT max(id) FROM processos").fetchone()[0]
+        t_delta = cronometrar(lambda: processos.listar_ids(db, [_id], DIA))
+        print(f"  após editar 1 linha, banco: delta (listar_ids) {t_delta * 1000:8.2f} ms")
+
+        try:
+            import tkinter as tk
+            from tkinter import ttk
+            root = tk.Tk()
+        except Exception as e:  # sem display (servidor/CI)
+            print(f"Tk indisponível ({e}); medição da UI ignorada.")
+            db.close()
+            return
+
+        cols = ("data", "processo", "titulo", "cliente", "responsavel", "status", "observacoes")
+        tree = ttk.Treeview(root, columns=cols, show="headings")
+        vsb = ttk.Scrollbar(root, orient="vertical", command=tree.yview)
+        tabela = TabelaVirtual(tree, vsb, formatar)
+        for busca in buscas:
+            antigo(tree, db, busca)  # garante tabela cheia antes de medir
+            t_antigo = cronometrar(lambda: antigo(tree, db, busca), 1)
+            t_novo = cronometrar(lambda: (tabela.carregar(processos.listar(db, DIA, None, busca)),
+                                          root.update_idletasks()), 1)
+            print(f"  busca={busca!r:12s} UI bloqueada: antigo {t_antigo * 1000:9.1f} ms | "
+                  f"virtual {t_novo * 1000:8.1f} ms")
+
+        # Edição de uma linha com a tabela rolada até o fim: recarga x delta
+        tabela.carregar(processos.listar(db, DIA))
+        tabela.carregar_tudo()
+        t_recarga = cronometrar(lambda: (tabela.carregar(processos.listar(db, DIA)), tabela.carregar_tudo(),
+                                         root.update_idletasks()), 1)
+        t_delta = cronometrar(lambda: (tabela.atualizar_linhas(processos.listar_ids(db, [_id], DIA)),
+                                       root.update_idletasks()))
+        print(f"  edição de 1 linha, UI bloqueada: recarga {t_recarga * 1000:9.1f} ms | "
+              f"delta {t_delta * 1000:8.2f} ms")
+        root.destroy()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
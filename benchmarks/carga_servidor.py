@@ -0,0 +1,166 @@
+# Teste de carga do modo servidor (servidor.py) em localhost
+# Vários clientes (threads, uma conexão keep-alive cada) misturam listagens do
+# dia (com If-None-Match), inclusões, edições e mudanças de status. Mostra
+# requisições/s e latência p50/p95/p99 por operação. O servidor próprio sobe com
+# --threads (padrão do servidor), em geral menos que os clientes: conexões abertas
+# além das vagas de requisição não podem travar ninguém.
+# Uso: python benchmarks/carga_servidor.py [--clientes 16] [--segundos 10] [--url http://host:porta]
+# Sem --url sobe um servidor próprio (outro processo) num banco temporário.
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import processos  # noqa: E402
+import servidor  # noqa: E402
+from db import Database, init_db  # noqa: E402
+
+DIA = "2024-03-15"
+# operação -> peso no sorteio (predominam leituras, como num dia de reunião)
+MIX = {"listar": 60, "listar_304": 15, "incluir": 10, "editar": 10, "status": 5}
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def esperar_porta(host, porta, limite=10):
+    fim = time.perf_counter() + limite
+    while True:
+        try:
+            socket.create_connection((host, porta), timeout=1).close()
+            return
+        except OSError:
+            if time.perf_counter() > fim:
+                raise
+            time.sleep(0.05)
+
+
+def cliente(host, porta, fim, semente, tempos, erros):
+    rnd = random.Random(semente)
+    conn = http.client.HTTPConnection(host, porta, timeout=30)
+    etag = None
+    ids = []
+    ops = list(MIX)
+    pesos = list(MIX.values())
+
+    def pedir(metodo, caminho, corpo=None, headers=None):
+        headers = dict(headers or {})
+        if corpo is not None:
+            corpo = json.dumps(corpo).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        conn.request(metodo, caminho, body=corpo, headers=headers)
+        resp = conn.getresponse()
+        dados = resp.read()
+        return resp, (json.loads(dados) if dados and resp.status != 304 else None)
+
+    while time.perf_counter() < fim:
+        op = rnd.choices(ops, pesos)[0]
+        t0 = time.perf_counter()
+        try:
+            if op == "listar":
+                resp, r = pedir("GET", f"/processos?data={DIA}")
+                etag = resp.getheader("ETag")
+                ids = [linha[0] for linha in r["linhas"][:200]]
+            elif op == "listar_304":
+                resp, _r = pedir("GET", f"/processos?data={DIA}", headers={"If-None-Match": etag or ""})
+            elif op == "incluir":
+                resp, r = pedir("POST", "/processos", {
+                    "data": DIA, "processo": str(rnd.randrange(10 ** 6)), "titulo": "Carga",
+                    "responsavel": f"Analista {rnd.randrange(12)}"})
+            elif op == "editar" and ids:
+                _id = rnd.choice(ids)
+                resp, r = pedir("PUT", f"/processos/{_id}", {
+                    "data": DIA, "processo": str(_id), "titulo": f"Editado {rnd.random():.4f}"})
+            elif op == "status" and ids:
+                resp, r = pedir("POST", "/processos/status", {
+                    "ids": rnd.sample(ids, min(5, len(ids))), "status": rnd.choice(processos.STATUS_OPCOES)})
+            else:
+                continue
+            if resp.status >= 400:
+                erros[op] = erros.get(op, 0) + 1
+        except (OSError, http.client.HTTPException):
+            erros[op] = erros.get(op, 0) + 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, porta, timeout=30)
+            continue
+        tempos.setdefault(op, []).append(time.perf_counter() - t0)
+    conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url")
+    ap.add_argument("--clientes", type=int, default=16)
+    ap.add_argument("--segundos", type=float, default=10)
+    ap.add_argument("--linhas", type=int, default=2000, help="linhas no dia (servidor próprio)")
+    ap.add_argument("--threads", type=int, default=servidor.THREADS)
+    args = ap.parse_args()
+
+    proc = None
+    if args.url:
+        partes = urlsplit(args.url)
+        host, porta = partes.hostname, partes.port or 80
+    else:
+        # Servidor num processo à parte, para não dividir o GIL com os clientes
+        caminho = os.path.join(tempfile.mkdtemp(), "carga.db")
+        db = Database(caminho)
+        init_db(db)
+        processos.inserir_varios(db, (
+            (DIA, str(i), f"Chamado {i}", f"Loja {i % 50}", f"Analista {i % 12}",
+             processos.STATUS_OPCOES[i % len(processos.STATUS_OPCOES)], None)
+            for i in range(args.linhas)))
+        db.close()
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            host, porta = s.getsockname()
+        proc = subprocess.Popen([sys.executable, os.path.join(RAIZ, "dailycheck.py"), "--db", caminho,
+                                 "serve", "--porta", str(porta),
+                                 "--threads", str(args.threads)])
+        esperar_porta(host, porta)
+
+    fim = time.perf_counter() + args.segundos
+    tempos_por_cliente = [{} for _ in range(args.clientes)]
+    erros = {}
+    threads = [threading.Thread(target=cliente, args=(host, porta, fim, i, tempos_por_cliente[i], erros))
+               for i in range(args.clientes)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    decorrido = time.perf_counter() - t0
+
+    tempos = {}
+    for tc in tempos_por_cliente:
+        for op, v in tc.items():
+            tempos.setdefault(op, []).extend(v)
+    total = sum(len(v) for v in tempos.values())
+    print(f"{args.clientes} cliente(s), {decorrido:.1f}s: {total} requisições, {total / decorrido:,.0f} req/s")
+    print(f"{'operação':<12}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'erros':>8}")
+    for op in MIX:
+        v = tempos.get(op, [])
+        print(f"{op:<12}{len(v):>8}{percentil(v, 50) * 1000:>10.1f}{percentil(v, 95) * 1000:>10.1f}"
+              f"{percentil(v, 99) * 1000:>10.1f}{erros.get(op, 0):>8}")
+
+    if proc is not None:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Cenários de benchmark sem interface (o que cada botão do app faz no banco)
+# No estilo do asv: cada cenário é uma função que recebe a Bancada e é cronometrada;
+# `preparar` roda antes de cada repetição e `limpar` depois, ambos fora do tempo
+# (ex.: invalidar o cache do resumo, desfazer a duplicação). Os cenários de escrita
+# gravam de verdade (com commit) e a limpeza devolve o banco ao estado gerado.
+# Rodados por benchmarks/rodar.py, que guarda o histórico dos resultados.
+import os
+import sys
+from datetime import date, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import exportacao  # noqa: E402
+import importacao  # noqa: E402
+import processos  # noqa: E402
+import resumo  # noqa: E402
+from tabela import PAGINA  # noqa: E402
+
+import gerador  # noqa: E402
+
+BUSCA = "lentidão pdv"
+IMPORTAR = int(os.environ.get("DAILYCHECK_BENCH_IMPORTAR", "10000"))  # linhas do CSV do cenário de importação
+CENARIOS = {}
+
+
+class Cenario:
+    __slots__ = ("nome", "medir", "preparar", "limpar")
+
+    def __init__(self, nome, medir, preparar=None, limpar=None):
+        self.nome = nome
+        self.medir = medir
+        self.preparar = preparar
+        self.limpar = limpar
+
+
+def cenario(nome, preparar=None, limpar=None):
+    def registrar(fn):
+        CENARIOS[nome] = Cenario(nome, fn, preparar, limpar)
+        return fn
+    return registrar
+
+
+class Bancada:
+    """O que os cenários recebem: o banco gerado e as datas escolhidas nele."""
+
+    def __init__(self, db, linhas, seed, tmp):
+        self.db = db
+        self.linhas = linhas
+        self.seed = seed
+        self.tmp = tmp
+        self.inicio, self.fim = gerador.periodo(linhas)
+        # Dia de semana mais cheio do último mês: o caso típico da reunião
+        self.dia = db.execute("""SELECT data FROM processos WHERE data >= ?
+                                 GROUP BY data ORDER BY count(*) DESC, data DESC LIMIT 1""",
+                              ((date.fromisoformat(self.fim) - timedelta(days=30)).isoformat(),)).fetchone()[0]
+        self.semana = resumo.semana(self.dia)
+        self.mes = (self.dia[:8] + "01", min(self.fim, _fim_do_mes(self.dia)))
+        self.destino = (date.fromisoformat(self.fim) + timedelta(days=30)).isoformat()  # dia vazio
+        self.ids_dia = [i for (i,) in db.execute("SELECT id FROM processos WHERE data = ?", (self.dia,))]
+        self.status_dia = None
+        self.ultimo = None
+        self.csv = os.path.join(tmp, "importar.csv")
+        # Dias depois do período gerado: nada do CSV existe no banco
+        with open(self.csv, "w", newline="", encoding="utf-8") as f:
+            fim_csv = date.fromisoformat(self.fim) + timedelta(days=60 + IMPORTAR // 150)
+            gerador.escrever_csv(f, gerador.gerar(IMPORTAR, seed + 1, fim=fim_csv))
+
+
+def _fim_do_mes(data_iso):
+    d = date.fromisoformat(data_iso[:8] + "28") + timedelta(days=4)
+    return (d - timedelta(days=d.day)).isoformat()
+
+
+def _consumir(cur, n=None):
+    """Lê o cursor como a TabelaVirtual: a primeira página (n) ou tudo."""
+    if n is not None:
+        return len(cur.fetchmany(n))
+    total = 0
+    while True:
+        rows = cur.fetchmany(1000)
+        total += len(rows)
+        if len(rows) < 1000:
+            return total
+
+
+def _apagar_depois_de(b):
+    with b.db.transaction() as conn:
+        conn.execute("DELETE FROM processos WHERE id > ?", (b.ultimo,))
+    b.db.tocar()
+
+
+def _guardar_ultimo(b):
+    b.ultimo = b.db.execute("SELECT coalesce(max(id), 0) FROM processos").fetchone()[0]
+
+
+# ---------------- Leitura ----------------
+@cenario("listar dia (1ª página)")
+def listar_pagina(b):
+    return _consumir(processos.listar(b.db, b.dia), PAGINA)
+
+
+@cenario("listar dia (tudo)")
+def listar_tudo(b):
+    return _consumir(processos.listar(b.db, b.dia))
+
+
+@cenario("busca no dia")
+def busca_dia(b):
+    return _consumir(processos.listar(b.db, b.dia, busca=BUSCA))
+
+
+@cenario("busca no mês (contar)")
+def busca_mes(b):
+    return exportacao.contar(b.db, b.mes[0], b.mes[1], busca=BUSCA)
+
+
+@cenario("resumo do dia", preparar=lambda b: b.db.tocar())
+def resumo_dia(b):
+    return resumo.resumo_texto(b.db, b.dia)
+
+
+@cenario("resumo da semana", preparar=lambda b: b.db.tocar())
+def resumo_semana(b):
+    return resumo.resumo_periodo_texto(b.db, *b.semana)
+
+
+@cenario("exportar mês (CSV)")
+def exportar_mes(b):
+    return exportacao.exportar(b.db, os.path.join(b.tmp, "exportado.csv"), "csv", *b.mes)
+
+
+# ---------------- Escrita ----------------
+@cenario("duplicar dia", preparar=_guardar_ultimo, limpar=_apagar_depois_de)
+def duplicar(b):
+    return processos.duplicar_dia(b.db, b.dia, b.destino)
+
+
+def _guardar_status(b):
+    b.status_dia = b.db.execute(
+        "SELECT id, status FROM processos WHERE data = ?", (b.dia,)).fetchall()
+
+
+def _restaurar_status(b):
+    with b.db.transaction() as conn:
+        conn.executemany("UPDATE processos SET status = ? WHERE id = ?", [(s, i) for i, s in b.status_dia])
+    b.db.tocar()
+
+
+@cenario("mover status (dia inteiro)", preparar=_guardar_status, limpar=_restaurar_status)
+def mover_status(b):
+    return processos.mover_status(b.db, b.ids_dia, "Concluído")
+
+
+@cenario(f"importar CSV ({IMPORTAR} linhas)", preparar=_guardar_ultimo, limpar=_apagar_depois_de)
+def importar(b):
+    with open(b.csv, newline="", encoding="utf-8-sig") as f:
+        return importacao.importar_csv(b.db, f).inseridas
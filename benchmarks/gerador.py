@@ -0,0 +1,180 @@
+# Gerador de dados sintéticos realistas para os benchmarks (com semente: mesma
+# semente e mesmo número de linhas dão sempre o mesmo banco, em qualquer máquina)
+# Dias úteis cheios e fim de semana fraco; parte dos processos de cada dia volta
+# no dia seguinte enquanto não é concluído (como o "duplicar de ontem"); títulos,
+# clientes e responsáveis em português com acentos; observações curtas, médias e
+# alguns logs colados longos (vão para observacoes_grandes).
+# Uso: python benchmarks/gerador.py --linhas 1000000 [--seed 42] -o banco.db
+#      python benchmarks/gerador.py --linhas 10000 --csv importar.csv   (formato da exportação)
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from datetime import date, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import processos  # noqa: E402
+from datas import br_data  # noqa: E402
+from db import VERSAO_ESQUEMA, Database, init_db  # noqa: E402
+
+GERADOR_VERSAO = 1   # mude quando a distribuição dos dados mudar (invalida os bancos em cache)
+FIM = date(2024, 12, 31)
+CACHE = os.path.join(RAIZ, "benchmarks", ".dados")
+
+SISTEMAS = ["PDV", "NF-e", "NFC-e", "TEF", "SAT", "estoque", "financeiro", "balança", "etiquetas",
+            "retaguarda", "boleto", "Pix", "SPED fiscal", "cartão fidelidade", "e-commerce"]
+PROBLEMAS = ["Lentidão no {s}", "Erro ao emitir {s}", "{s} não abre", "Falha de comunicação com o {s}",
+             "Rejeição {n} no {s}", "Dúvida sobre o {s}", "Atualização do {s}", "Configuração do {s}",
+             "{s} travando no fechamento", "Cupom duplicado no {s}", "Senha bloqueada no {s}",
+             "Impressora do {s} sem resposta", "Divergência de valores no {s}", "Cadastro no {s}"]
+TIPOS_CLIENTE = ["Supermercado", "Mercado", "Farmácia", "Padaria", "Loja", "Atacadão", "Drogaria",
+                 "Posto", "Restaurante", "Açougue", "Hortifrúti", "Papelaria"]
+NOMES_CLIENTE = ["São João", "Bom Preço", "Central", "Estrela", "Progresso", "Boa Vista", "Santa Luzia",
+                 "Nova Era", "Ipê", "Confiança", "União", "Paraíso", "Pioneiro", "Aliança", "Real"]
+CIDADES = ["Goiânia", "Anápolis", "Uberlândia", "Ribeirão Preto", "Campinas", "Londrina", "Maringá",
+           "Cuiabá", "Palmas", "Brasília", "São José", "Criciúma"]
+RESPONSAVEIS = ["Ana", "Bruno", "Camila", "Diego", "Érica", "Fábio", "Gabriela", "Hélio", "Íris", "João",
+                "Larissa", "Márcio", "Natália", "Otávio", "Patrícia", "Rogério", "Sônia", "Tiago"]
+STATUS_PESOS = [40, 10, 30, 12, 8]  # na ordem de processos.STATUS_OPCOES
+FRASES = ["Cliente relata que o problema começou após a atualização.",
+          "Reiniciado o serviço e normalizou.", "Aguardando retorno do técnico da loja.",
+          "Acesso remoto feito, configuração corrigida.", "Encaminhado para o desenvolvimento.",
+          "Orientado a limpar o cache e refazer a sincronização.", "Não consegui contato, tentar à tarde.",
+          "Problema na rede da loja, não no sistema.", "Certificado digital vencido.",
+          "Ajustada a alíquota no cadastro do produto."]
+PESO_DIA_SEMANA = (1.0, 1.0, 1.0, 1.0, 0.9, 0.35, 0.1)  # segunda..domingo
+VOLTA = 0.3  # fração de cada dia que são processos de ontem ainda não concluídos
+
+
+def dias_padrao(linhas):
+    """Período gerado: ~150 linhas/dia, entre um mês e dez anos."""
+    return max(30, min(3650, linhas // 150))
+
+
+def _log(rnd):
+    # Log colado: acima de db.OBS_GRANDE, vai comprimido para observacoes_grandes
+    inicio = rnd.randrange(86400)
+    return "\n".join(
+        f"{(inicio + i) // 3600 % 24:02d}:{(inicio + i) // 60 % 60:02d}:{(inicio + i) % 60:02d} "
+        f"[{rnd.choice(('INFO', 'WARN', 'ERRO'))}] {rnd.choice(SISTEMAS)}: {rnd.choice(FRASES)}"
+        for i in range(rnd.randint(40, 160)))
+
+
+def gerar(linhas, seed=42, dias=None, fim=FIM):
+    """Registros (na ordem de processos.INSERT_SQL), dia a dia, até `linhas` no total."""
+    rnd = random.Random(seed)
+    r = rnd.random  # um sorteio por escolha: random.choice custaria minutos em 10M linhas
+    dias = dias or dias_padrao(linhas)
+    inicio = fim - timedelta(days=dias - 1)
+    pesos = [PESO_DIA_SEMANA[(inicio + timedelta(days=i)).weekday()] for i in range(dias)]
+    total_pesos = sum(pesos)
+    clientes = [f"{t} {n} - {c}" for t in TIPOS_CLIENTE for n in NOMES_CLIENTE for c in CIDADES]
+    titulos = [p.format(s=s, n=n) for p in PROBLEMAS for s in SISTEMAS for n in range(200, 1000, 97)]
+    # Observações: 35% nenhuma, 55% uma frase, 8% várias, 2% log longo (textos sorteados uma vez)
+    medias = [" ".join(rnd.choices(FRASES, k=rnd.randint(4, 20))) for _ in range(256)]
+    logs = [_log(rnd) for _ in range(64)]
+    obs = [(0.35, [None]), (0.90, FRASES), (0.98, medias), (1.0, logs)]
+    status = processos.STATUS_OPCOES
+    acumulados = [sum(STATUS_PESOS[:k + 1]) / sum(STATUS_PESOS) for k in range(len(STATUS_PESOS))]
+
+    def observacao():
+        x = r()
+        for limite, textos in obs:
+            if x < limite:
+                return textos[int(r() * len(textos))]
+
+    def sortear_status():
+        return status[bisect_left(acumulados, r())]
+
+    proximo = 100000
+    feitas, acumulado = 0, 0.0
+    pendentes = []
+    for i in range(dias):
+        acumulado += pesos[i]
+        n_dia = round(linhas * acumulado / total_pesos) - feitas
+        feitas += n_dia
+        d = (inicio + timedelta(days=i)).isoformat()
+        voltam = rnd.sample(pendentes, min(len(pendentes), int(n_dia * VOLTA)))
+        hoje = [(d, processo, titulo, cliente, responsavel, sortear_status(), observacao())
+                for processo, titulo, cliente, responsavel in voltam]
+        for _ in range(n_dia - len(voltam)):
+            hoje.append((d, str(proximo), titulos[int(r() * len(titulos))], clientes[int(r() * len(clientes))],
+                         RESPONSAVEIS[int(r() * len(RESPONSAVEIS))], sortear_status(), observacao()))
+            proximo += 1
+        pendentes = [row[1:5] for row in hoje if row[5] != "Concluído"]
+        yield from hoje
+
+
+def popular(db, linhas, seed=42, dias=None):
+    processos.inserir_varios(db, gerar(linhas, seed, dias))
+
+
+def periodo(linhas, dias=None, fim=FIM):
+    """(inicio, fim) ISO do período que gerar() cobre."""
+    dias = dias or dias_padrao(linhas)
+    return (fim - timedelta(days=dias - 1)).isoformat(), fim.isoformat()
+
+
+def banco(linhas, seed=42, pasta=CACHE):
+    """Caminho de um banco já populado; gerado uma vez e reaproveitado entre execuções."""
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"bench_{linhas}_s{seed}_e{VERSAO_ESQUEMA}_g{GERADOR_VERSAO}.db")
+    if os.path.exists(caminho):
+        return caminho
+    tmp = caminho + ".tmp"
+    for sobra in (tmp, tmp + "-wal", tmp + "-shm"):
+        if os.path.exists(sobra):
+            os.remove(sobra)
+    db = Database(tmp)
+    try:
+        init_db(db)
+        popular(db, linhas, seed)
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # sem ANALYZE: planos iguais aos do app
+    finally:
+        db.close()
+    os.replace(tmp, caminho)
+    return caminho
+
+
+def escrever_csv(arquivo, regs):
+    """CSV no formato da exportação (";" e datas BR), para o cenário de importação."""
+    w = csv.writer(arquivo, delimiter=";")
+    w.writerow(["data", "processo", "titulo", "cliente", "responsavel", "status", "observacoes"])
+    w.writerows((br_data(r[0]),) + r[1:] for r in regs)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Gera dados sintéticos do DailyCheck")
+    ap.add_argument("--linhas", type=int, default=100000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--dias", type=int, help="período em dias (padrão: ~150 linhas/dia)")
+    ap.add_argument("-o", "--saida", help="arquivo .db a criar")
+    ap.add_argument("--csv", help="grava CSV (formato da exportação) em vez do banco")
+    args = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            escrever_csv(f, gerar(args.linhas, args.seed, args.dias))
+        destino = args.csv
+    else:
+        if not args.saida:
+            ap.error("informe -o banco.db ou --csv arquivo.csv")
+        if os.path.exists(args.saida):
+            ap.error(f"{args.saida} já existe")
+        db = Database(args.saida)
+        init_db(db)
+        popular(db, args.linhas, args.seed, args.dias)
+        db.close()
+        destino = args.saida
+    inicio, fim = periodo(args.linhas, args.dias)
+    print(f"{args.linhas} linhas ({inicio} a {fim}) em {destino}, {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# Roda os cenários de benchmarks/cenarios.py sobre bancos gerados (gerador.py) e
+# guarda os resultados em benchmarks/resultados/historico.jsonl, uma linha por
+# execução (commit, máquina, versões). Cada execução é comparada com a anterior
+# da mesma máquina e do mesmo tamanho: o que ficou LIMITE vezes mais lento sai
+# marcado como regressão (--falhar devolve código 1, para CI).
+# Os bancos gerados ficam em benchmarks/.dados e são reaproveitados.
+# Uso: python benchmarks/rodar.py [--linhas 10000 100000 1000000] [--repeticoes 5]
+#                                 [--cenario busca] [--nao-salvar] [--falhar]
+#      python benchmarks/rodar.py --historico "listar dia (tudo)"   (evolução de um cenário)
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import cenarios
+import gerador
+
+from db import Database, init_db  # noqa: E402  (cenarios.py já pôs a raiz no sys.path)
+
+HISTORICO = os.path.join(gerador.RAIZ, "benchmarks", "resultados", "historico.jsonl")
+LIMITE = 1.25        # razão mediana atual / anterior a partir da qual é regressão
+RUIDO_MS = 1.0       # diferenças abaixo disso não contam (timer e escalonador)
+
+
+def maquina():
+    """Identifica onde rodou: resultados de máquinas diferentes não se comparam."""
+    return f"{platform.node()}|{platform.machine()}|py{platform.python_version()}|sqlite{sqlite3.sqlite_version}"
+
+
+def commit():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=gerador.RAIZ,
+                             capture_output=True, text=True, timeout=10).stdout.strip()
+        sujo = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=gerador.RAIZ,
+                              capture_output=True, text=True, timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return (rev + ("+" if sujo else "")) or None
+
+
+def medir(c, b, repeticoes):
+    """Melhor e mediana em ms de `repeticoes` execuções (mais uma de aquecimento)."""
+    tempos = []
+    for i in range(repeticoes + 1):
+        if c.preparar:
+            c.preparar(b)
+        t0 = time.perf_counter()
+        c.medir(b)
+        ms = (time.perf_counter() - t0) * 1000
+        if c.limpar:
+            c.limpar(b)
+        if i:
+            tempos.append(ms)
+    return {"min_ms": round(min(tempos), 3), "mediana_ms": round(statistics.median(tempos), 3),
+            "repeticoes": repeticoes}
+
+
+def ler_historico(caminho):
+    if not os.path.exists(caminho):
+        return []
+    with open(caminho, encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def anterior(historico, execucao):
+    for e in reversed(historico):
+        if (e["maquina"], e["linhas"], e["seed"]) == (execucao["maquina"], execucao["linhas"], execucao["seed"]):
+            return e
+    return None
+
+
+def comparar(execucao, antes, limite):
+    """Imprime a tabela da execução; retorna os cenários que regrediram."""
+    regressoes = []
+    base = (antes or {}).get("resultados", {})
+    print(f"{'cenário':<32}{'mín ms':>11}{'mediana ms':>12}{'anterior':>11}{'razão':>8}")
+    for nome, r in execucao["resultados"].items():
+        a = base.get(nome)
+        linha = f"{nome:<32}{r['min_ms']:>11.2f}{r['mediana_ms']:>12.2f}"
+        if a:
+            razao = r["mediana_ms"] / a["mediana_ms"] if a["mediana_ms"] else 1.0
+            linha += f"{a['mediana_ms']:>11.2f}{razao:>8.2f}"
+            if razao >= limite and r["mediana_ms"] - a["mediana_ms"] >= RUIDO_MS:
+                linha += "  ← REGRESSÃO"
+                regressoes.append(nome)
+        print(linha)
+    if antes:
+        print(f"(comparado com {antes['commit'] or '?'} de {antes['quando']})")
+    return regressoes
+
+
+def evolucao(historico, nome):
+    print(f"{'quando':<20}{'commit':<12}{'linhas':>10}{'mediana ms':>12}")
+    for e in historico:
+        r = e["resultados"].get(nome)
+        if r:
+            print(f"{e['quando']:<20}{e['commit'] or '?':<12}{e['linhas']:>10}{r['mediana_ms']:>12.2f}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmarks do DailyCheck com histórico")
+    ap.add_argument("--linhas", type=int, nargs="+", default=[10000, 100000])
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--repeticoes", type=int, default=5)
+    ap.add_argument("--cenario", action="append", help="só os cenários cujo nome contém o texto")
+    ap.add_argument("--arquivo", default=HISTORICO, help="histórico JSONL")
+    ap.add_argument("--nao-salvar", action="store_true", help="não grava no histórico")
+    ap.add_argument("--limite", type=float, default=LIMITE)
+    ap.add_argument("--falhar", action="store_true", help="código 1 se houver regressão")
+    ap.add_argument("--historico", metavar="CENARIO", help="mostra a evolução de um cenário e sai")
+    args = ap.parse_args(argv)
+
+    historico = ler_historico(args.arquivo)
+    if args.historico:
+        evolucao(historico, args.historico)
+        return 0
+    escolhidos = [c for nome, c in cenarios.CENARIOS.items()
+                  if not args.cenario or any(t.lower() in nome.lower() for t in args.cenario)]
+    if not escolhidos:
+        ap.error("nenhum cenário com esse nome")
+
+    regressoes = []
+    for linhas in args.linhas:
+        t0 = time.perf_counter()
+        caminho = gerador.banco(linhas, args.seed)
+        print(f"\n== {linhas} linhas ({os.path.getsize(caminho) / 1024 / 1024:.0f} MB, "
+              f"pronto em {time.perf_counter() - t0:.1f}s)")
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(caminho)
+            try:
+                init_db(db)
+                b = cenarios.Bancada(db, linhas, args.seed, tmp)
+                resultados = {c.nome: medir(c, b, args.repeticoes) for c in escolhidos}
+            finally:
+                db.close()
+        execucao = {"quando": time.strftime("%Y-%m-%d %H:%M:%S"), "commit": commit(), "maquina": maquina(),
+                    "linhas": linhas, "seed": args.seed, "resultados": resultados}
+        regressoes += [f"{nome} ({linhas})" for nome in
+                       comparar(execucao, anterior(historico, execucao), args.limite)]
+        if not args.nao_salvar:
+            os.makedirs(os.path.dirname(args.arquivo), exist_ok=True)
+            with open(args.arquivo, "a", encoding="utf-8") as f:
+                f.write(json.dumps(execucao, ensure_ascii=False) + "\n")
+            historico.append(execucao)
+    if regressoes:
+        print(f"\nRegressões: {', '.join(regressoes)}")
+    return 1 if regressoes and args.falhar else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+# Busca ao vivo: debounce das teclas, consulta numa thread de fundo e
+# cancelamento (sqlite3 interrupt) da consulta anterior quando chega outra.
+# O resultado volta para o loop do Tk por after(); o Tk só é tocado na thread da UI.
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentacao import medir
+
+ATRASO_MS = 250      # espera após a última tecla
+VERIFICAR_MS = 25    # intervalo para checar se a consulta terminou
+LOTE = 1000          # linhas por fetchmany na thread de fundo
+
+
+class BuscaAoVivo:
+    def __init__(self, widget, db, ao_concluir, ao_erro=None, atraso_ms=ATRASO_MS):
+        """
+        widget: qualquer widget Tk (usado para after/after_cancel)
+        ao_concluir(rows): chamado na thread da UI com a lista de linhas
+        ao_erro(exc): chamado na thread da UI se a consulta falhar
+        """
+        self.widget = widget
+        self.db = db
+        self.ao_concluir = ao_concluir
+        self.ao_erro = ao_erro
+        self.atraso_ms = atraso_ms
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="busca")
+        self._lock = threading.Lock()
+        self._conn_ativa = None
+        self._geracao = 0
+        self._agendado = None
+
+    def agendar(self, montar, atraso_ms=None):
+        """
+        montar: () -> (sql, params) ou None; chamado na thread da UI no disparo,
+        para ler os filtros já com a última tecla digitada. Também pode retornar
+        uma função sem argumentos que devolve as linhas (ex.: backend remoto);
+        essa não é interrompida, só tem o resultado descartado se ficar velho.
+        """
+        if self._agendado is not None:
+            self.widget.after_cancel(self._agendado)
+        atraso = self.atraso_ms if atraso_ms is None else atraso_ms
+        self._agendado = self.widget.after(atraso, lambda: self._disparar(montar))
+
+    def cancelar(self):
+        """Descarta o que estiver agendado ou rodando (ex.: recarga síncrona após uma escrita)."""
+        if self._agendado is not None:
+            self.widget.after_cancel(self._agendado)
+            self._agendado = None
+        self._geracao += 1
+        self._interromper()
+
+    def fechar(self):
+        self.cancelar()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------- Interno ----------------
+    def _disparar(self, montar):
+        self._agendado = None
+        consulta = montar()
+        if consulta is None:
+            return
+        self.cancelar()
+        geracao = self._geracao
+        if callable(consulta):
+            futuro = self._executor.submit(medir("busca")(consulta))
+        else:
+            sql, params = consulta
+            futuro = self._executor.submit(medir("busca")(self._executar), geracao, sql, params)
+        self.widget.after(VERIFICAR_MS, lambda: self._verificar(geracao, futuro))
+
+    def _interromper(self):
+        with self._lock:
+            if self._conn_ativa is not None:
+                self._conn_ativa.interrupt()
+
+    def _executar(self, geracao, sql, params):
+        # Roda na thread de fundo com uma conexão do pool
+        if geracao != self._geracao:
+            return None
+        with self.db.conectar() as conn:
+            with self._lock:
+                self._conn_ativa = conn
+            cur = None
+            try:
+                self.db.anexar(conn, sql)
+                cur = conn.execute(sql, params)
+                rows = []
+                while geracao == self._geracao:
+                    lote = cur.fetchmany(LOTE)
+                    rows += lote
+                    if len(lote) < LOTE:
+                        return rows
+                return None
+            except sqlite3.OperationalError as e:
+                if "interrupt" in str(e):
+                    return None
+                raise
+            finally:
+                if cur is not None:
+                    cur.close()
+                with self._lock:
+                    self._conn_ativa = None
+
+    def _verificar(self, geracao, futuro):
+        if not futuro.done():
+            self.widget.after(VERIFICAR_MS, lambda: self._verificar(geracao, futuro))
+            return
+        if geracao != self._geracao or futuro.cancelled():
+            return
+        exc = futuro.exception()
+        if exc is not None:
+            if self.ao_erro:
+                self.ao_erro(exc)
+            return
+        rows = futuro.result()
+        if rows is not None:
+            self.ao_concluir(rows)
@@ -0,0 +1,86 @@
+# Conversão de datas entre o formato do banco (ISO) e o da tela (BR)
+# br_data/iso_data são chamadas para cada linha listada ou exportada: o caminho
+# comum (data já no formato canônico) é resolvido por fatiamento, com um cache
+# LRU por cima, e qualquer outra forma cai no strptime original — a saída e os
+# erros são os mesmos das versões com strptime/strftime.
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+CACHE = 4096  # ~11 anos de datas distintas
+
+
+def hoje_str():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _canonica(d, sep, pos_ano):
+    # "AAAA-MM-DD" (pos_ano=0) ou "DD/MM/AAAA" (pos_ano=6), só dígitos ASCII e ano >= 1000
+    if len(d) != 10 or not d.isascii():
+        return None
+    if pos_ano == 0:
+        if d[4] != sep or d[7] != sep:
+            return None
+        a, m, dia = d[0:4], d[5:7], d[8:10]
+    else:
+        if d[2] != sep or d[5] != sep:
+            return None
+        dia, m, a = d[0:2], d[3:5], d[6:10]
+    if not (a.isdigit() and m.isdigit() and dia.isdigit()) or a[0] == "0":
+        return None
+    date(int(a), int(m), int(dia))  # valida o dia do mês (ValueError como o strptime)
+    return a, m, dia
+
+
+@lru_cache(maxsize=CACHE)
+def br_data(d):
+    partes = _canonica(d, "-", 0) if isinstance(d, str) else None
+    if partes is None:
+        return datetime.strptime(d, "%Y-%m-%d").strftime("%d/%m/%Y")
+    a, m, dia = partes
+    return f"{dia}/{m}/{a}"
+
+
+@lru_cache(maxsize=CACHE)
+def iso_data(d):
+    partes = _canonica(d, "/", 6) if isinstance(d, str) else None
+    if partes is None:
+        return datetime.strptime(d, "%d/%m/%Y").strftime("%Y-%m-%d")
+    a, m, dia = partes
+    return f"{a}-{m}-{dia}"
+
+
+def br_datas(valores):
+    """Converte uma sequência de datas ISO (ex.: a coluna de um lote exportado) de uma vez."""
+    unicas = {v: br_data(v) for v in set(valores)}
+    return [unicas[v] for v in valores]
+
+
+# ---------------- Entrada digitada ----------------
+PALAVRAS = {"hoje": 0, "ontem": -1, "amanhã": 1, "amanha": 1, "anteontem": -2}
+
+
+def interpretar_data(texto, hoje=None):
+    """
+    Data digitada pelo usuário -> ISO. Aceita DD/MM/AAAA, DD/MM/AA, DD/MM (ano
+    corrente), D/M, separadores "/", "-" ou ".", AAAA-MM-DD e as palavras
+    hoje/ontem/anteontem/amanhã. ValueError se não reconhecer.
+    """
+    hoje = hoje or date.today()
+    t = texto.strip().lower()
+    if t in PALAVRAS:
+        return (hoje + timedelta(days=PALAVRAS[t])).isoformat()
+    if len(t) == 10 and t[4] == "-" and t[7] == "-":
+        return date.fromisoformat(t).isoformat()
+    partes = t.replace("-", "/").replace(".", "/").split("/")
+    if len(partes) not in (2, 3) or not all(p.isdigit() and p.isascii() for p in partes):
+        raise ValueError(f"data inválida: {texto!r}")
+    dia, mes = int(partes[0]), int(partes[1])
+    if len(partes) == 2:
+        ano = hoje.year
+    else:
+        ano = int(partes[2])
+        if len(partes[2]) <= 2:
+            ano += 2000
+        elif len(partes[2]) != 4:
+            raise ValueError(f"data inválida: {texto!r}")
+    return date(ano, mes, dia).isoformat()
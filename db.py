@@ -0,0 +1,724 @@
+# Camada de acesso a dados (sem dependência da interface Tk)
+# Mantém uma conexão persistente para a thread da UI e um pool pequeno
+# para threads de fundo, com WAL e pragmas ajustados.
+import os
+import pathlib
+import queue
+import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from instrumentacao import fabrica
+
+DB_FILE = "reuniao_suporte.db"
+
+# WAL depende de memória compartilhada entre processos; em alguns compartilhamentos
+# de rede isso não funciona — DAILYCHECK_JOURNAL=DELETE volta ao journal clássico.
+JOURNAL_MODE = os.environ.get("DAILYCHECK_JOURNAL", "WAL")
+
+PRAGMAS = (
+    ("synchronous", "NORMAL"),   # seguro com WAL e bem mais rápido que FULL
+    ("cache_size", -16000),      # ~16 MB de cache de páginas
+    ("temp_store", "MEMORY"),
+    ("busy_timeout", 5000),      # espera até 5s por lock de outro analista
+)
+
+
+def sem_acento(texto):
+    """Minúsculas e sem diacríticos ("Manutenção" -> "manutencao"); usado na busca por LIKE."""
+    if texto is None:
+        return None
+    texto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(ch for ch in texto if not unicodedata.combining(ch)).casefold()
+
+
+# Observações longas (logs colados) não ficam em `processos`: lá fica só o começo,
+# que a busca e o FTS usam e que mantém a linha dentro de uma página; o texto
+# inteiro vai comprimido para `observacoes_grandes`.
+OBS_GRANDE = 2048   # caracteres a partir dos quais o texto vai para observacoes_grandes
+OBS_PREFIXO = 1024  # caracteres mantidos em processos.observacoes
+
+
+def separar_obs(texto):
+    """(texto para processos.observacoes, texto comprimido ou None); só espaços vira None."""
+    if texto is None or not texto.strip():
+        return None, None
+    if len(texto) < OBS_GRANDE:
+        return texto, None
+    return texto[:OBS_PREFIXO], zlib.compress(texto.encode("utf-8"))
+
+
+def descomprimir(dados):
+    return None if dados is None else zlib.decompress(dados).decode("utf-8")
+
+
+# Dias antigos ficam em bancos por ano (arquivo.py), anexados sob demanda como
+# arqAAAA (somente leitura). O SQLite limita os bancos anexados por conexão (10
+# no build padrão): os menos usados saem quando é preciso espaço.
+ANEXADOS_MAX = 10
+COLUNAS_PROCESSOS = "id, data, processo, titulo, cliente, responsavel, status, observacoes, versao"
+_ESQUEMA_ARQUIVO = re.compile(r"\barq(\d{4})\.")
+
+
+def esquema_arquivo(ano):
+    return f"arq{ano}"
+
+
+class Database:
+    """
+    Conexão persistente com o banco.
+
+    - `conn` pertence à thread que criou o objeto (a thread da UI);
+    - `conectar()` devolve `conn` nessa thread e, nas demais, empresta uma
+      conexão do pool (criada sob demanda, até `pool_size`);
+    - `transaction()` abre BEGIN IMMEDIATE ... COMMIT/ROLLBACK e aceita aninhamento
+      via SAVEPOINT.
+    As conexões usam autocommit (isolation_level=None): toda escrita deve passar
+    por `transaction()`.
+    """
+
+    def __init__(self, path=DB_FILE, pool_size=2, journal_mode=JOURNAL_MODE):
+        self.path = path
+        self.journal_mode = journal_mode
+        self.pool_size = pool_size
+        self._dono = threading.get_ident()
+        self._pool = queue.LifoQueue()
+        self._criadas = 0
+        self._lock = threading.Lock()
+        self._sp = 0
+        self.fts = False  # definido por init_db conforme o SQLite tenha FTS5
+        # Contadores de escrita local usados para invalidar caches por data
+        self._versoes = {}
+        self._geral = 0
+        # Arquivos por ano (tabela `arquivos`, lida por ler_arquivos)
+        self.arquivos = {}          # ano -> (caminho, ate, id_min, id_max)
+        self.arquivado_ate = None   # dias até esta data (ISO) estão nos arquivos
+        self._anexados = {}         # id(conexão) -> anos anexados, do menos para o mais usado
+        self.conn = self._abrir(mesma_thread=True)
+
+    def _abrir(self, mesma_thread=False):
+        conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,
+            check_same_thread=mesma_thread,
+            uri=True,               # ATTACH dos arquivos com ?mode=ro
+            cached_statements=256,  # reaproveita statements preparados (SQL constante)
+            factory=fabrica(),      # mede latência/linhas de cada consulta (instrumentacao.py)
+        )
+        modo = conn.execute(f"PRAGMA journal_mode={self.journal_mode}").fetchone()[0]
+        self.journal_mode_ativo = modo
+        for nome, valor in PRAGMAS:
+            conn.execute(f"PRAGMA {nome}={valor}")
+        conn.create_function("sem_acento", 1, sem_acento, deterministic=True)
+        conn.create_function("descomprimir", 1, descomprimir, deterministic=True)
+        return conn
+
+    # ---------------- Conexões ----------------
+    @contextmanager
+    def conectar(self):
+        if threading.get_ident() == self._dono:
+            yield self.conn
+            return
+        conn = self._emprestar()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._pool.put(conn)
+
+    def _emprestar(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._criadas < self.pool_size:
+                self._criadas += 1
+                return self._abrir()
+        return self._pool.get()
+
+    # ---------------- Transações ----------------
+    @contextmanager
+    def transaction(self, conn=None):
+        conn = conn or self.conn
+        if conn.in_transaction:
+            # Transação já aberta: usa SAVEPOINT para permitir rollback parcial
+            self._sp += 1
+            nome = f"sp{self._sp}"
+            conn.execute(f"SAVEPOINT {nome}")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute(f"ROLLBACK TO {nome}")
+                conn.execute(f"RELEASE {nome}")
+                raise
+            conn.execute(f"RELEASE {nome}")
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def carga_em_massa(self):
+        """
+        Transação para inserções grandes em `processos`: synchronous=OFF e cache
+        maior durante a carga, e o índice FTS e os totais dos relatórios são
+        alimentados com um único INSERT ... SELECT no final em vez de linha a
+        linha pelos triggers.
+        """
+        with self.conectar() as conn:
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA cache_size=-65536")
+            try:
+                with self.transaction(conn):
+                    ultimo = conn.execute("SELECT coalesce(max(id), 0) FROM processos").fetchone()[0]
+                    # Em vez de uma linha por inserção no feed, um único aviso 'R' (recarregar)
+                    conn.execute("DROP TRIGGER IF EXISTS alteracoes_ai")
+                    conn.execute("DROP TRIGGER IF EXISTS totais_ai")
+                    if self.fts:
+                        conn.execute("DROP TRIGGER IF EXISTS processos_fts_ai")
+                    yield conn
+                    if self.fts:
+                        # Durante a carga o FTS5 só grava segmentos novos (sem automerge e com
+                        # crisismerge alto); depois os padrões (4 e 16) voltam e um merge limitado
+                        # junta parte deles, o resto se junta nas próximas escritas
+                        for opcao, valor in (("automerge", 0), ("crisismerge", 64)):
+                            conn.execute("INSERT INTO processos_fts(processos_fts, rank) VALUES (?, ?)", (opcao, valor))
+                        conn.execute("""INSERT INTO processos_fts(rowid, processo, titulo, cliente, responsavel, observacoes)
+                                        SELECT id, processo, titulo, cliente, responsavel, observacoes
+                                        FROM processos WHERE id > ?""", (ultimo,))
+                        for opcao, valor in (("automerge", 4), ("crisismerge", 16), ("merge", 500)):
+                            conn.execute("INSERT INTO processos_fts(processos_fts, rank) VALUES (?, ?)", (opcao, valor))
+                        conn.execute(FTS_TRIGGERS[0])
+                    conn.execute("INSERT INTO alteracoes (processo_id, operacao) VALUES (0, 'R')")
+                    conn.execute(ALTERACOES_TRIGGERS[0])
+                    # Os ciclos são recalculados por processo no fim, não a cada linha de processo_dias
+                    for gatilho in ("processo_ciclo_ai", "ciclo_hist_ai", "ciclo_hist_au"):
+                        conn.execute(f"DROP TRIGGER IF EXISTS {gatilho}")
+                    _somar_totais(conn, "WHERE id > ?", (ultimo,))
+                    _somar_ciclos(conn, "WHERE id > ?", (ultimo,))
+                    for i in (0, 3, 5, 7):
+                        conn.execute(TOTAIS_TRIGGERS[i])
+            finally:
+                for nome, valor in PRAGMAS:
+                    conn.execute(f"PRAGMA {nome}={valor}")
+
+    # ---------------- Arquivos por ano ----------------
+    def ler_arquivos(self, conn=None):
+        """Relê a tabela `arquivos` (depois de arquivar, ou quando outro processo arquivou)."""
+        conn = conn or self.conn
+        pasta = os.path.dirname(os.path.abspath(self.path))
+        try:
+            rows = conn.execute("SELECT ano, arquivo, ate, id_min, id_max FROM arquivos ORDER BY ano").fetchall()
+        except sqlite3.OperationalError:  # banco ainda sem a migração 7
+            rows = []
+        self.arquivos = {ano: (os.path.join(pasta, nome), ate, id_min, id_max)
+                         for ano, nome, ate, id_min, id_max in rows}
+        self.arquivado_ate = max((r[2] for r in rows), default=None)
+
+    def arquivado(self, data_iso):
+        return self.arquivado_ate is not None and data_iso <= self.arquivado_ate
+
+    def fontes(self, inicio, fim=None):
+        """Esquemas com os dias inicio..fim (ISO), em ordem cronológica: 'arq2019', ..., 'main'."""
+        fim = fim or inicio
+        if self.arquivado_ate is None or inicio > self.arquivado_ate:
+            return ["main"]
+        esquemas = [esquema_arquivo(ano) for ano in self.arquivos if int(inicio[:4]) <= ano <= int(fim[:4])]
+        if fim > self.arquivado_ate or not esquemas:
+            esquemas.append("main")
+        return esquemas
+
+    def trechos(self, inicio, fim):
+        """inicio..fim dividido em períodos que usam até ANEXADOS_MAX - 1 arquivos cada (uma consulta por trecho)."""
+        anos = [ano for ano in self.arquivos if int(inicio[:4]) <= ano <= int(fim[:4])]
+        passo = ANEXADOS_MAX - 1
+        trechos, de = [], inicio
+        for i in range(passo, len(anos), passo):
+            trechos.append((de, f"{anos[i] - 1}-12-31"))
+            de = f"{anos[i]}-01-01"
+        return trechos + [(de, fim)]
+
+    def anexar(self, conn, sql):
+        """
+        ATTACH (somente leitura) dos arquivos que `sql` cita como arqAAAA e que
+        `conn` ainda não tem. Precisa rodar fora de transação; os anexados menos
+        usados saem (DETACH) quando a conexão chega a ANEXADOS_MAX.
+        """
+        if not self.arquivos:
+            return
+        anos = [int(a) for a in _ESQUEMA_ARQUIVO.findall(sql)]
+        if not anos:
+            return
+        anexados = self._anexados.setdefault(id(conn), OrderedDict())
+        for ano in anos:
+            if ano in anexados:
+                anexados.move_to_end(ano)
+                continue
+            for velho in list(anexados):
+                if len(anexados) < ANEXADOS_MAX:
+                    break
+                if velho in anos:
+                    continue
+                try:
+                    conn.execute(f"DETACH {esquema_arquivo(velho)}")
+                except sqlite3.OperationalError:
+                    continue  # um cursor ainda lê esse arquivo
+                del anexados[velho]
+            uri = pathlib.Path(self.arquivos[ano][0]).as_uri() + "?mode=ro"
+            conn.execute(f"ATTACH ? AS {esquema_arquivo(ano)}", (uri,))
+            anexados[ano] = None
+
+    def desanexar(self, conn):
+        """DETACH de todos os arquivos de `conn` (para que outra conexão possa gravar neles)."""
+        for ano in list(self._anexados.pop(id(conn), ())):
+            conn.execute(f"DETACH {esquema_arquivo(ano)}")
+
+    # ---------------- Versões (invalidação de caches) ----------------
+    def tocar(self, datas=None):
+        """Registra uma escrita local nas datas ISO informadas (None = qualquer data)."""
+        if datas is None:
+            self._geral += 1
+            return
+        for d in datas:
+            self._versoes[d] = self._versoes.get(d, 0) + 1
+
+    def versao(self, data):
+        """
+        Identifica o estado de uma data: muda quando este processo escreve nela
+        (tocar) ou quando outra conexão faz commit (PRAGMA data_version).
+        """
+        externo = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        return (externo, self._geral, self._versoes.get(data, 0))
+
+    # ---------------- Atalhos ----------------
+    def execute(self, sql, params=()):
+        self.anexar(self.conn, sql)
+        return self.conn.execute(sql, params)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        self.conn.close()
+        self._anexados.clear()
+
+
+# ---------------- Migrações ----------------
+# Cada migração leva o esquema de user_version = n-1 para n. As pendentes rodam
+# todas numa única transação, depois de um backup do arquivo.
+
+def _m1_esquema_inicial(conn):
+    # Esquema original (bancos antigos já o têm; tudo é IF NOT EXISTS)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS processos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TEXT NOT NULL,                 -- YYYY-MM-DD
+            processo TEXT NOT NULL,
+            titulo TEXT NOT NULL,
+            cliente TEXT,
+            responsavel TEXT,
+            canal TEXT,
+            prioridade TEXT,
+            status TEXT NOT NULL,
+            observacoes TEXT,
+            minutos_gastos INTEGER DEFAULT 0
+        )
+    """)
+
+
+def _m2_sem_colunas_antigas(conn):
+    # canal/prioridade/minutos_gastos não são usados desde a simplificação da UI.
+    # Reconstrói a tabela preservando ids e a sequência do AUTOINCREMENT.
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name='processos'").fetchone()
+    conn.execute("""
+        CREATE TABLE processos_novo (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data TEXT NOT NULL,                 -- YYYY-MM-DD
+            processo TEXT NOT NULL,             -- Nº/ID do chamado ou referência
+            titulo TEXT NOT NULL,
+            cliente TEXT,
+            responsavel TEXT,
+            status TEXT NOT NULL,               -- Uma das STATUS_OPCOES
+            observacoes TEXT
+        )
+    """)
+    conn.execute("""INSERT INTO processos_novo (id, data, processo, titulo, cliente, responsavel, status, observacoes)
+                    SELECT id, data, processo, titulo, cliente, responsavel, status, observacoes
+                    FROM processos ORDER BY id""")
+    conn.execute("DROP TABLE processos")  # leva junto índices e triggers antigos
+    conn.execute("ALTER TABLE processos_novo RENAME TO processos")
+    if seq:
+        conn.execute("UPDATE sqlite_sequence SET seq = max(seq, ?) WHERE name='processos'", seq)
+
+
+def _m3_indices_compostos(conn):
+    # Formatos reais das consultas:
+    #   lista/resumo: WHERE data=? [AND status=?] ORDER BY [status,] id DESC
+    #   agregados:    WHERE data BETWEEN ? AND ? GROUP BY data, status, responsavel
+    #   importação:   WHERE data=? AND processo=?
+    #   relatórios:   WHERE responsavel=? AND data BETWEEN ...
+    # (data, status, responsavel) + rowid implícito atende os agregados só pelo
+    # índice; idx_proc_data é prefixo dos compostos e idx_proc_status (5 valores) não ajuda.
+    conn.execute("DROP INDEX IF EXISTS idx_proc_data")
+    conn.execute("DROP INDEX IF EXISTS idx_proc_status")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_proc_data_status ON processos(data, status, responsavel)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_proc_data_processo ON processos(data, processo)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_proc_resp_data ON processos(responsavel, data)")
+
+
+# Feed de alterações: cada escrita em `processos` deixa uma linha em `alteracoes`,
+# que as janelas abertas leem quando PRAGMA data_version indica commit de outro
+# processo. operacao: I/U/D por linha, R = carga em massa (recarregar tudo).
+ALTERACOES_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS alteracoes_ai AFTER INSERT ON processos BEGIN
+           INSERT INTO alteracoes (processo_id, data, operacao) VALUES (new.id, new.data, 'I');
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS alteracoes_au AFTER UPDATE ON processos BEGIN
+           INSERT INTO alteracoes (processo_id, data, data_anterior, operacao)
+           VALUES (new.id, new.data, old.data, 'U');
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS alteracoes_ad AFTER DELETE ON processos BEGIN
+           INSERT INTO alteracoes (processo_id, data, operacao) VALUES (old.id, old.data, 'D');
+       END""",
+)
+MANTER_ALTERACOES = 50000  # entradas mantidas no feed; quem ficar para trás recarrega tudo
+
+
+def _m4_versao_e_alteracoes(conn):
+    # versao: incrementada a cada UPDATE, usada na edição otimista
+    conn.execute("ALTER TABLE processos ADD COLUMN versao INTEGER NOT NULL DEFAULT 0")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alteracoes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            processo_id INTEGER NOT NULL,
+            data TEXT,
+            data_anterior TEXT,
+            operacao TEXT NOT NULL
+        )
+    """)
+    for sql in ALTERACOES_TRIGGERS:
+        conn.execute(sql)
+
+
+# Totais para os relatórios (relatorios.py), mantidos por triggers. Cada tabela
+# guarda contagens por uma chave; semana e mês já vêm calculados na escrita,
+# então um relatório de anos agrupa algumas centenas de linhas por ano, não uma
+# por dia (os dias avulsos nas pontas do período saem de totais_dia/totais_cliente).
+#   totais_dia / totais_semana / totais_mes   (período, responsavel, status) -> n
+#   totais_cliente / totais_cliente_mes       (período, cliente) -> n
+#   processo_dias  (processo, data) -> n   dias em que cada processo aparece
+#   processo_ciclo processo -> primeira, ultima, dias, corridos   (de processo_dias)
+#   ciclo_hist     (primeira, corridos) -> n   distribuição para média/mediana/p90
+# Responsável/cliente vazios viram '' para caberem na chave primária.
+SEMANA_SQL = "date({}, 'weekday 0', '-6 days')"  # segunda-feira da semana
+MES_SQL = "substr({}, 1, 7)"
+
+# tabela -> (colunas da chave, expressões sobre a linha {p} de processos)
+TOTAIS = {
+    "totais_dia": (("data", "responsavel", "status"),
+                   ("{p}.data", "coalesce({p}.responsavel, '')", "{p}.status")),
+    "totais_semana": (("semana", "responsavel", "status"),
+                      (SEMANA_SQL.format("{p}.data"), "coalesce({p}.responsavel, '')", "{p}.status")),
+    "totais_mes": (("mes", "responsavel", "status"),
+                   (MES_SQL.format("{p}.data"), "coalesce({p}.responsavel, '')", "{p}.status")),
+    "totais_cliente": (("data", "cliente"), ("{p}.data", "coalesce({p}.cliente, '')")),
+    "totais_cliente_mes": (("mes", "cliente"), (MES_SQL.format("{p}.data"), "coalesce({p}.cliente, '')")),
+    "processo_dias": (("processo", "data"), ("{p}.processo", "{p}.data")),
+}
+CICLO_HIST = {"ciclo_hist": (("primeira", "corridos"), ("{p}.primeira", "{p}.corridos"))}
+CORRIDOS_SQL = "CAST(julianday({u}) - julianday({p}) AS INTEGER) + 1"
+
+
+def _mais(p, totais=TOTAIS):
+    partes = []
+    for tabela, (colunas, exprs) in totais.items():
+        chave = ", ".join(colunas)
+        valores = ", ".join(e.format(p=p) for e in exprs)
+        partes.append(f"INSERT INTO {tabela} ({chave}, n) VALUES ({valores}, 1) "
+                      f"ON CONFLICT ({chave}) DO UPDATE SET n = n + 1;")
+    return "\n        ".join(partes)
+
+
+def _menos(p, totais=TOTAIS):
+    partes = []
+    for tabela, (colunas, exprs) in totais.items():
+        chave = " AND ".join(f"{c} = {e.format(p=p)}" for c, e in zip(colunas, exprs))
+        partes.append(f"UPDATE {tabela} SET n = n - 1 WHERE {chave};")
+        partes.append(f"DELETE FROM {tabela} WHERE {chave} AND n <= 0;")
+    return "\n        ".join(partes)
+
+
+TOTAIS_TRIGGERS = (
+    f"CREATE TRIGGER IF NOT EXISTS totais_ai AFTER INSERT ON processos BEGIN {_mais('new')} END",
+    f"CREATE TRIGGER IF NOT EXISTS totais_ad AFTER DELETE ON processos BEGIN {_menos('old')} END",
+    f"""CREATE TRIGGER IF NOT EXISTS totais_au
+        AFTER UPDATE OF data, processo, cliente, responsavel, status ON processos
+        BEGIN {_menos('old')} {_mais('new')} END""",
+    f"""CREATE TRIGGER IF NOT EXISTS processo_ciclo_ai AFTER INSERT ON processo_dias BEGIN
+           INSERT INTO processo_ciclo (processo, primeira, ultima, dias, corridos)
+           VALUES (new.processo, new.data, new.data, 1, 1)
+           ON CONFLICT (processo) DO UPDATE SET
+               primeira = min(primeira, excluded.primeira), ultima = max(ultima, excluded.ultima),
+               dias = dias + 1,
+               corridos = {CORRIDOS_SQL.format(u="max(ultima, excluded.ultima)", p="min(primeira, excluded.primeira)")};
+       END""",
+    f"""CREATE TRIGGER IF NOT EXISTS processo_ciclo_ad AFTER DELETE ON processo_dias BEGIN
+           DELETE FROM processo_ciclo WHERE processo = old.processo AND dias <= 1;
+           UPDATE processo_ciclo
+           SET dias = dias - 1,
+               primeira = (SELECT min(data) FROM processo_dias WHERE processo = old.processo),
+               ultima = (SELECT max(data) FROM processo_dias WHERE processo = old.processo)
+           WHERE processo = old.processo;
+           UPDATE processo_ciclo SET corridos = {CORRIDOS_SQL.format(u="ultima", p="primeira")}
+           WHERE processo = old.processo;
+       END""",
+    f"CREATE TRIGGER IF NOT EXISTS ciclo_hist_ai AFTER INSERT ON processo_ciclo BEGIN {_mais('new', CICLO_HIST)} END",
+    f"CREATE TRIGGER IF NOT EXISTS ciclo_hist_ad AFTER DELETE ON processo_ciclo BEGIN {_menos('old', CICLO_HIST)} END",
+    f"""CREATE TRIGGER IF NOT EXISTS ciclo_hist_au AFTER UPDATE OF primeira, corridos ON processo_ciclo
+        BEGIN {_menos('old', CICLO_HIST)} {_mais('new', CICLO_HIST)} END""",
+)
+
+
+# Totais que a carga em massa tira dos totais de outra tabela em vez de reagrupar `processos`
+TOTAIS_DERIVADOS = {"totais_semana": "totais_dia", "totais_mes": "totais_dia",
+                    "totais_cliente_mes": "totais_cliente"}
+
+
+def _somar_totais(conn, where="", params=()):
+    """
+    Soma aos totais as linhas de `processos` selecionadas por `where` (carga em massa).
+    Só os totais por dia, por cliente e processo_dias agrupam `processos`; os
+    por semana e mês saem desses agrupamentos (tabelas temporárias carga_*), que
+    são bem menores que as linhas carregadas.
+    """
+    bases = set(TOTAIS_DERIVADOS.values())
+    for tabela, (colunas, exprs) in TOTAIS.items():
+        chave = ", ".join(colunas)
+        grupos = ", ".join(str(i) for i in range(1, len(colunas) + 1))
+        if tabela in TOTAIS_DERIVADOS:
+            valores = ", ".join(e.format(p="p") for e in exprs)
+            origem, args = f"SELECT {valores}, sum(p.n) FROM temp.carga_{TOTAIS_DERIVADOS[tabela]} p", ()
+        else:
+            valores = ", ".join(f"{e.format(p='p')} AS {c}" for c, e in zip(colunas, exprs))
+            origem, args = f"SELECT {valores}, count(*) AS n FROM processos p {where}", params
+        origem += f" GROUP BY {grupos}"
+        if tabela in bases:
+            conn.execute(f"DROP TABLE IF EXISTS temp.carga_{tabela}")
+            conn.execute(f"CREATE TEMP TABLE carga_{tabela} AS {origem}", args)
+            origem, args = f"SELECT * FROM temp.carga_{tabela} WHERE 1", ()  # WHERE: ambiguidade do upsert
+        conn.execute(f"""INSERT INTO {tabela} ({chave}, n) {origem}
+                         ON CONFLICT ({chave}) DO UPDATE SET n = n + excluded.n""", args)
+    for tabela in bases:
+        conn.execute(f"DROP TABLE temp.carga_{tabela}")
+
+
+def _somar_ciclos(conn, where, params):
+    """
+    processo_ciclo e ciclo_hist dos processos que a carga tocou, recalculados de
+    uma vez a partir de processo_dias (os triggers fariam isso linha a linha):
+    tira do histograma o ciclo antigo desses processos e soma o novo.
+    """
+    conn.execute("DROP TABLE IF EXISTS temp.carga_processos")
+    conn.execute(f"""CREATE TEMP TABLE carga_processos AS
+                     SELECT DISTINCT processo FROM processos {where}""", params)
+    tocados = "WHERE processo IN temp.carga_processos"
+    conn.execute(f"""INSERT INTO ciclo_hist (primeira, corridos, n)
+                     SELECT primeira, corridos, -count(*) FROM processo_ciclo {tocados} GROUP BY 1, 2
+                     ON CONFLICT (primeira, corridos) DO UPDATE SET n = n + excluded.n""")
+    conn.execute("DELETE FROM ciclo_hist WHERE n <= 0")
+    conn.execute(f"""INSERT INTO processo_ciclo (processo, primeira, ultima, dias, corridos)
+                     SELECT processo, min(data), max(data), count(*),
+                            {CORRIDOS_SQL.format(u="max(data)", p="min(data)")}
+                     FROM processo_dias {tocados} GROUP BY processo
+                     ON CONFLICT (processo) DO UPDATE SET
+                         primeira = excluded.primeira, ultima = excluded.ultima,
+                         dias = excluded.dias, corridos = excluded.corridos""")
+    conn.execute(f"""INSERT INTO ciclo_hist (primeira, corridos, n)
+                     SELECT primeira, corridos, count(*) FROM processo_ciclo {tocados} GROUP BY 1, 2
+                     ON CONFLICT (primeira, corridos) DO UPDATE SET n = n + excluded.n""")
+    conn.execute("DROP TABLE temp.carga_processos")
+
+
+def _m5_totais_relatorios(conn):
+    for tabela, (colunas, _exprs) in TOTAIS.items():
+        definicao = ", ".join(f"{c} TEXT NOT NULL" for c in colunas)
+        conn.execute(f"""CREATE TABLE IF NOT EXISTS {tabela} ({definicao}, n INTEGER NOT NULL,
+                             PRIMARY KEY ({', '.join(colunas)})) WITHOUT ROWID""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS processo_ciclo (
+                        processo TEXT PRIMARY KEY, primeira TEXT NOT NULL, ultima TEXT NOT NULL,
+                        dias INTEGER NOT NULL, corridos INTEGER NOT NULL) WITHOUT ROWID""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ciclo_primeira ON processo_ciclo(primeira)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ciclo_corridos ON processo_ciclo(corridos, primeira)")
+    conn.execute("""CREATE TABLE IF NOT EXISTS ciclo_hist (
+                        primeira TEXT NOT NULL, corridos INTEGER NOT NULL, n INTEGER NOT NULL,
+                        PRIMARY KEY (primeira, corridos)) WITHOUT ROWID""")
+    # Preenche a partir do histórico antes de criar os triggers
+    _somar_totais(conn)
+    conn.execute(f"""INSERT INTO processo_ciclo (processo, primeira, ultima, dias, corridos)
+                     SELECT processo, min(data), max(data), count(*),
+                            {CORRIDOS_SQL.format(u="max(data)", p="min(data)")}
+                     FROM processo_dias GROUP BY processo""")
+    conn.execute("""INSERT INTO ciclo_hist (primeira, corridos, n)
+                    SELECT primeira, corridos, count(*) FROM processo_ciclo GROUP BY 1, 2""")
+    for sql in TOTAIS_TRIGGERS:
+        conn.execute(sql)
+
+
+OBS_GRANDES_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS observacoes_grandes_ad AFTER DELETE ON processos BEGIN
+        DELETE FROM observacoes_grandes WHERE id = old.id;
+    END"""
+
+
+def _m6_observacoes_grandes(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS observacoes_grandes (
+                        id INTEGER PRIMARY KEY,     -- processos.id
+                        texto BLOB NOT NULL         -- UTF-8 comprimido com zlib
+                    )""")
+    conn.execute(OBS_GRANDES_TRIGGER)
+    # A lista mostra só se há observação (IS NOT NULL): só espaços vira NULL
+    conn.execute("UPDATE processos SET observacoes = NULL WHERE trim(observacoes) = ''")
+    grandes = conn.execute("SELECT id, observacoes FROM processos WHERE length(observacoes) >= ?",
+                           (OBS_GRANDE,)).fetchall()
+    for _id, texto in grandes:
+        prefixo, comprimido = separar_obs(texto)
+        conn.execute("INSERT INTO observacoes_grandes (id, texto) VALUES (?, ?)", (_id, comprimido))
+        conn.execute("UPDATE processos SET observacoes = ? WHERE id = ?", (prefixo, _id))
+
+
+def _m7_arquivos(conn):
+    # Um registro por banco de arquivo (arquivo.py); `ate` é o último dia já
+    # movido daquele ano e id_min/id_max dizem onde procurar um id que saiu daqui
+    conn.execute("""CREATE TABLE IF NOT EXISTS arquivos (
+                        ano INTEGER PRIMARY KEY,
+                        arquivo TEXT NOT NULL,      -- nome do arquivo, na pasta do banco principal
+                        ate TEXT NOT NULL,          -- YYYY-MM-DD
+                        linhas INTEGER NOT NULL,
+                        id_min INTEGER NOT NULL,
+                        id_max INTEGER NOT NULL
+                    )""")
+
+
+MIGRACOES = (
+    _m1_esquema_inicial,
+    _m2_sem_colunas_antigas,
+    _m3_indices_compostos,
+    _m4_versao_e_alteracoes,
+    _m5_totais_relatorios,
+    _m6_observacoes_grandes,
+    _m7_arquivos,
+)
+VERSAO_ESQUEMA = len(MIGRACOES)
+
+
+def _backup_antes_de_migrar(db, versao):
+    """Cópia consistente do banco (API de backup do SQLite) antes de alterar o esquema."""
+    if db.path == ":memory:":
+        return None
+    tem_dados = db.conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='processos'").fetchone()
+    if not tem_dados:
+        return None
+    destino = f"{db.path}.v{versao}.bak"
+    copia = sqlite3.connect(destino)
+    try:
+        db.conn.backup(copia)
+    finally:
+        copia.close()
+    return destino
+
+
+def migrar(db):
+    """Aplica as migrações pendentes; retorna (versão anterior, versão atual)."""
+    conn = db.conn
+    versao = conn.execute("PRAGMA user_version").fetchone()[0]
+    if versao >= VERSAO_ESQUEMA:
+        return versao, versao
+    _backup_antes_de_migrar(db, versao)
+    with db.transaction():
+        for n, migracao in enumerate(MIGRACOES[versao:], start=versao + 1):
+            migracao(conn)
+            conn.execute(f"PRAGMA user_version={n}")
+    if versao < 2:
+        # A reconstrução da tabela (v2) deixa páginas livres: devolve o espaço ao disco
+        conn.execute("VACUUM")
+    return versao, VERSAO_ESQUEMA
+
+
+def init_db(db):
+    migrar(db)
+    with db.transaction() as conn:
+        # FTS5 depende do build do SQLite, por isso fica fora da numeração
+        db.fts = _migrar_fts(conn)
+        conn.execute("DELETE FROM alteracoes WHERE seq <= (SELECT max(seq) FROM alteracoes) - ?",
+                     (MANTER_ALTERACOES,))
+    db.ler_arquivos()
+
+
+def conferir_db(db):
+    """
+    Só leitura, para a thread da UI depois que init_db já rodou em outra conexão
+    (abertura em fundo): confere o user_version, vê se há FTS5 e lê os arquivos.
+    Sem nenhum BEGIN IMMEDIATE, não espera por quem estiver gravando no banco.
+    Se o esquema ainda não estiver em dia (ex.: :memory:), roda o init_db completo.
+    """
+    conn = db.conn
+    if conn.execute("PRAGMA user_version").fetchone()[0] < VERSAO_ESQUEMA:
+        init_db(db)
+        return
+    db.fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='processos_fts'").fetchone() is not None
+    db.ler_arquivos()
+
+
+# Índice de texto completo sincronizado com `processos` por triggers.
+# remove_diacritics faz "manutencao" casar com "manutenção".
+FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS processos_fts_ai AFTER INSERT ON processos BEGIN
+           INSERT INTO processos_fts(rowid, processo, titulo, cliente, responsavel, observacoes)
+           VALUES (new.id, new.processo, new.titulo, new.cliente, new.responsavel, new.observacoes);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS processos_fts_ad AFTER DELETE ON processos BEGIN
+           INSERT INTO processos_fts(processos_fts, rowid, processo, titulo, cliente, responsavel, observacoes)
+           VALUES ('delete', old.id, old.processo, old.titulo, old.cliente, old.responsavel, old.observacoes);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS processos_fts_au AFTER UPDATE ON processos BEGIN
+           INSERT INTO processos_fts(processos_fts, rowid, processo, titulo, cliente, responsavel, observacoes)
+           VALUES ('delete', old.id, old.processo, old.titulo, old.cliente, old.responsavel, old.observacoes);
+           INSERT INTO processos_fts(rowid, processo, titulo, cliente, responsavel, observacoes)
+           VALUES (new.id, new.processo, new.titulo, new.cliente, new.responsavel, new.observacoes);
+       END""",
+)
+
+
+def _migrar_fts(conn):
+    """Cria (e popula na primeira vez) o índice FTS5. Retorna False se o SQLite não tiver FTS5."""
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='processos_fts'").fetchone()
+    if not existe:
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE processos_fts USING fts5(
+                    processo, titulo, cliente, responsavel, observacoes,
+                    content='processos', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False  # build sem FTS5: a busca usa LIKE
+        conn.execute("INSERT INTO processos_fts(processos_fts) VALUES ('rebuild')")
+    for sql in FTS_TRIGGERS:
+        conn.execute(sql)
+    return True
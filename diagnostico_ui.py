@@ -0,0 +1,130 @@
+# Painel de diagnóstico: latência das operações e consultas (instrumentacao.py)
+# Operação lenta com SQL rápido aponta o Tk (linhas "tk: ...") ou a rede (modo servidor);
+# SQL lento com plano "SCAN" aponta índice faltando; com "SEARCH ... USING INDEX", o disco.
+import json
+import time
+from tkinter import filedialog, messagebox, ttk
+
+import customtkinter as ctk
+
+import instrumentacao
+from instrumentacao import METRICAS
+
+COLUNAS = (("n", "N", 60), ("p50", "p50 ms", 70), ("p95", "p95 ms", 70), ("max", "Máx ms", 80),
+           ("total", "Total ms", 90), ("linhas", "Linhas", 80))
+
+
+class JanelaDiagnostico(ctk.CTkToplevel):
+    def __init__(self, master, backend):
+        super().__init__(master)
+        self.backend = backend
+        self.title("Diagnóstico de desempenho")
+        self.geometry("980x640")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=3)
+        self.grid_rowconfigure(2, weight=2)
+
+        self.lbl = ctk.CTkLabel(self, text="", anchor="w", justify="left")
+        self.lbl.grid(row=0, column=0, sticky="ew", padx=12, pady=(12, 6))
+
+        self.tree = ttk.Treeview(self, columns=[c for c, _t, _l in COLUNAS], show="tree headings",
+                                 selectmode="browse")
+        self.tree.heading("#0", text="Operação / consulta")
+        self.tree.column("#0", width=420, anchor="w")
+        for col, titulo, largura in COLUNAS:
+            self.tree.heading(col, text=titulo)
+            self.tree.column(col, width=largura, anchor="e")
+        self.tree.grid(row=1, column=0, sticky="nsew", padx=12, pady=6)
+        self.tree.bind("<<TreeviewSelect>>", self._ao_selecionar)
+
+        self.txt = ctk.CTkTextbox(self, wrap="none", font=ctk.CTkFont(family="Consolas", size=12))
+        self.txt.grid(row=2, column=0, sticky="nsew", padx=12, pady=6)
+
+        rodape = ctk.CTkFrame(self, fg_color="transparent")
+        rodape.grid(row=3, column=0, sticky="ew", padx=12, pady=(6, 12))
+        rodape.grid_columnconfigure(1, weight=1)
+        # Medir cada consulta pesa nas telas rápidas: fica desligado até alguém precisar
+        self.sw_sql = ctk.CTkSwitch(rodape, text="Medir consultas SQL", command=self._ligar_sql)
+        self.sw_sql.grid(row=0, column=0, sticky="w")
+        if instrumentacao.ATIVO:
+            self.sw_sql.select()
+        btns = ctk.CTkFrame(rodape, fg_color="transparent")
+        btns.grid(row=0, column=1, sticky="e")
+        for i, (texto, comando) in enumerate((
+                ("Atualizar", self._atualizar), ("Zerar", self._zerar),
+                ("Exportar JSON…", self._exportar_json), ("Exportar Prometheus…", self._exportar_prometheus),
+                ("Fechar", self.destroy))):
+            ctk.CTkButton(btns, text=texto, width=140, command=comando).grid(row=0, column=i, padx=4)
+
+        self._detalhes = {}  # iid -> texto mostrado ao selecionar
+        self._lentas = ""
+        self._atualizar()
+
+    def _atualizar(self):
+        try:
+            dados = self.backend.metricas()
+        except Exception as e:
+            messagebox.showerror("Erro no diagnóstico", str(e), parent=self)
+            return
+        banco = dados.get("banco") or (dados.get("servidor") or {}).get("banco") or {}
+        self.lbl.configure(text=(
+            f"Banco: {banco.get('caminho', '?')} (journal {banco.get('journal_mode', '?')})   "
+            f"Desde {time.strftime('%H:%M:%S', time.localtime(dados['desde']))}   "
+            f"Lentas (≥ {dados['lenta_ms']:g} ms): {dados['n_lentas']}"))
+        self.tree.delete(*self.tree.get_children())
+        self._detalhes.clear()
+        grupos = [("Operações", dados["operacoes"]), ("Consultas SQL", dados["consultas"])]
+        servidor = dados.get("servidor")
+        if servidor:
+            grupos += [("Servidor: requisições", servidor["operacoes"]), ("Servidor: consultas SQL", servidor["consultas"])]
+        for g, (titulo, itens) in enumerate(grupos):
+            pai = self.tree.insert("", "end", iid=f"g{g}", text=f"{titulo} ({len(itens)})", open=True)
+            for i, (nome, h) in enumerate(sorted(itens.items(), key=lambda kv: -kv[1]["total_ms"])):
+                iid = f"g{g}.{i}"
+                self.tree.insert(pai, "end", iid=iid, text=nome.replace("\n", " ")[:200], values=(
+                    h["n"], f"{h['p50_ms']:g}", f"{h['p95_ms']:g}", f"{h['max_ms']:.1f}",
+                    f"{h['total_ms']:.1f}", h["linhas"]))
+                self._detalhes[iid] = nome + (f"\n\nEXPLAIN QUERY PLAN:\n{h['plano']}" if h.get("plano") else "")
+        lentas = dados["lentas"] + ((servidor or {}).get("lentas") or [])
+        self._lentas = "\n".join(
+            f"{time.strftime('%H:%M:%S', time.localtime(l['quando']))}  {l['ms']:>9.1f} ms  "
+            f"{l['linhas']:>7} linhas  [{l['thread']}]  {l['sql'][:160]}"
+            for l in sorted(lentas, key=lambda l: -l["quando"])) or "Nenhuma consulta lenta."
+        self._mostrar(self._lentas)
+
+    def _ao_selecionar(self, _event):
+        sel = self.tree.selection()
+        self._mostrar(self._detalhes.get(sel[0], self._lentas) if sel else self._lentas)
+
+    def _mostrar(self, texto):
+        self.txt.configure(state="normal")
+        self.txt.delete("1.0", "end")
+        self.txt.insert("1.0", texto)
+        self.txt.configure(state="disabled")
+
+    def _ligar_sql(self):
+        instrumentacao.ligar(bool(self.sw_sql.get()))
+        self._atualizar()
+
+    def _zerar(self):
+        METRICAS.zerar()
+        self._atualizar()
+
+    def _exportar_json(self):
+        caminho = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                               initialfile="diagnostico.json", filetypes=[("JSON", "*.json")])
+        if not caminho:
+            return
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump(self.backend.metricas(), f, ensure_ascii=False, indent=2)
+        messagebox.showinfo("Exportado", f"Métricas salvas em:\n{caminho}", parent=self)
+
+    def _exportar_prometheus(self):
+        caminho = filedialog.asksaveasfilename(parent=self, defaultextension=".prom",
+                                               initialfile="dailycheck.prom",
+                                               filetypes=[("Prometheus", "*.prom"), ("Texto", "*.txt")])
+        if not caminho:
+            return
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.write(METRICAS.prometheus())
+        messagebox.showinfo("Exportado", f"Métricas salvas em:\n{caminho}", parent=self)
@@ -0,0 +1,150 @@
+# Exportação em streaming (sem dependência da interface)
+# O cursor é lido em lotes (fetchmany) e cada lote é gravado antes do próximo,
+# então a memória fica constante qualquer que seja o intervalo exportado.
+# Formatos: CSV (";" e datas BR, como a tela), JSON Lines (datas ISO) e,
+# se o pyarrow estiver instalado, Parquet.
+# Períodos que passam pelos dias arquivados leem também os arquivos por ano; um
+# período com muitos anos arquivados é lido em trechos (limite de ATTACH do SQLite).
+import csv
+import json
+
+import processos
+from datas import br_datas
+
+CABECALHO = ["data", "processo", "titulo", "cliente", "responsavel", "status", "observacoes"]
+COLUNAS = f"p.data, p.processo, p.titulo, p.cliente, p.responsavel, p.status, {processos.OBSERVACOES_SQL}"
+LOTE = 5000
+
+FORMATOS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+
+
+class ExportacaoCancelada(Exception):
+    pass
+
+
+def parquet_disponivel():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def formato_do_arquivo(nome, padrao="csv"):
+    for formato, ext in FORMATOS.items():
+        if nome.lower().endswith(ext):
+            return formato
+    return padrao
+
+
+def _cursor(db, conn, inicio, fim, status, busca):
+    sql, params = processos.consulta(db, COLUNAS, inicio, status, busca, fim=fim)
+    db.anexar(conn, sql)
+    return conn.execute(sql, params)
+
+
+def _trechos(db, inicio, fim):
+    return [(inicio, None)] if fim is None else db.trechos(inicio, fim)
+
+
+def _lotes(db, inicio, fim, status, busca, progresso, cancelar, lote):
+    # Funciona em qualquer thread: fora da thread da UI usa uma conexão do pool
+    n = 0
+    with db.conectar() as conn:
+        for de, ate in _trechos(db, inicio, fim):
+            cur = _cursor(db, conn, de, ate, status, busca)
+            try:
+                while True:
+                    if cancelar is not None and cancelar.is_set():
+                        raise ExportacaoCancelada()
+                    rows = cur.fetchmany(lote)
+                    if not rows:
+                        break
+                    yield rows
+                    n += len(rows)
+                    if progresso:
+                        progresso(n)
+            finally:
+                cur.close()
+
+
+def contar(db, inicio, fim=None, status=None, busca=None):
+    total = 0
+    with db.conectar() as conn:
+        for de, ate in _trechos(db, inicio, fim):
+            sql, params = processos.consulta(db, "count(*)", de, status, busca, fim=ate, ordenar=False)
+            db.anexar(conn, sql)
+            total += conn.execute(sql, params).fetchone()[0]
+    return total
+
+
+def tem_registros(db, inicio, fim=None, status=None, busca=None):
+    with db.conectar() as conn:
+        for de, ate in _trechos(db, inicio, fim):
+            cur = _cursor(db, conn, de, ate, status, busca)
+            try:
+                if cur.fetchone() is not None:
+                    return True
+            finally:
+                cur.close()
+    return False
+
+
+def exportar_csv(db, arquivo, inicio, fim=None, status=None, busca=None,
+                 progresso=None, cancelar=None, lote=LOTE):
+    """
+    Grava no arquivo (objeto de texto aberto) as linhas filtradas.
+    progresso(n): chamado a cada lote com o total já gravado.
+    cancelar: threading.Event opcional; se ligado, interrompe com ExportacaoCancelada.
+    Retorna a quantidade de linhas exportadas.
+    """
+    w = csv.writer(arquivo, delimiter=";")
+    w.writerow(CABECALHO)
+    n = 0
+    for rows in _lotes(db, inicio, fim, status, busca, progresso, cancelar, lote):
+        datas = br_datas([r[0] for r in rows])  # data em BR, convertida por lote
+        w.writerows((d,) + r[1:] for d, r in zip(datas, rows))
+        n += len(rows)
+    return n
+
+
+def exportar_jsonl(db, arquivo, inicio, fim=None, status=None, busca=None,
+                   progresso=None, cancelar=None, lote=LOTE):
+    dumps = json.dumps
+    n = 0
+    for rows in _lotes(db, inicio, fim, status, busca, progresso, cancelar, lote):
+        arquivo.writelines(dumps(dict(zip(CABECALHO, r)), ensure_ascii=False) + "\n" for r in rows)
+        n += len(rows)
+    return n
+
+
+def exportar_parquet(db, caminho, inicio, fim=None, status=None, busca=None,
+                     progresso=None, cancelar=None, lote=LOTE):
+    """Cada lote vira um row group; requer pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Exportação Parquet requer o pacote pyarrow (pip install pyarrow).")
+
+    schema = pa.schema([(c, pa.string()) for c in CABECALHO])
+    n = 0
+    with pq.ParquetWriter(caminho, schema, compression="zstd") as writer:
+        for rows in _lotes(db, inicio, fim, status, busca, progresso, cancelar, lote):
+            colunas = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=pa.string()) for col in colunas], schema=schema))
+            n += len(rows)
+    return n
+
+
+def exportar(db, caminho, formato, inicio, fim=None, status=None, busca=None,
+             progresso=None, cancelar=None, lote=LOTE):
+    """Exporta para o arquivo `caminho` no formato indicado; retorna a quantidade de linhas."""
+    kw = dict(fim=fim, status=status, busca=busca, progresso=progresso, cancelar=cancelar, lote=lote)
+    if formato == "parquet":
+        return exportar_parquet(db, caminho, inicio, **kw)
+    escrever = {"csv": exportar_csv, "jsonl": exportar_jsonl}[formato]
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        return escrever(db, f, inicio, **kw)
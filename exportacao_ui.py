@@ -0,0 +1,136 @@
+# Janela de exportação: intervalo de datas, formato e progresso
+# A exportação roda numa thread; a janela só lê o progresso por after().
+import os
+import threading
+from tkinter import messagebox, filedialog
+
+import customtkinter as ctk
+
+import exportacao
+from datas import interpretar_data
+
+VERIFICAR_MS = 100
+
+
+class JanelaExportacao(ctk.CTkToplevel):
+    def __init__(self, master, backend, data_br, status=None, busca=None):
+        super().__init__(master)
+        self.backend = backend
+        self.status = status
+        self.busca = busca
+        self.title("Exportar")
+        self.geometry("460x230")
+        self.resizable(False, False)
+        self.grid_columnconfigure(1, weight=1)
+
+        ctk.CTkLabel(self, text="De:").grid(row=0, column=0, padx=(12, 6), pady=(12, 4), sticky="w")
+        self.e_inicio = ctk.CTkEntry(self, width=110)
+        self.e_inicio.grid(row=0, column=1, padx=6, pady=(12, 4), sticky="w")
+        self.e_inicio.insert(0, data_br)
+        ctk.CTkLabel(self, text="Até:").grid(row=1, column=0, padx=(12, 6), pady=4, sticky="w")
+        self.e_fim = ctk.CTkEntry(self, width=110)
+        self.e_fim.grid(row=1, column=1, padx=6, pady=4, sticky="w")
+        self.e_fim.insert(0, data_br)
+
+        formatos = self.backend.formatos
+        ctk.CTkLabel(self, text="Formato:").grid(row=2, column=0, padx=(12, 6), pady=4, sticky="w")
+        self.combo_formato = ctk.CTkComboBox(self, values=formatos, width=110)
+        self.combo_formato.grid(row=2, column=1, padx=6, pady=4, sticky="w")
+        self.combo_formato.set("CSV")
+
+        filtros = []
+        if status:
+            filtros.append(f"status: {status}")
+        if busca:
+            filtros.append(f"busca: {busca}")
+        self.lbl = ctk.CTkLabel(self, text="Filtros atuais — " + ("; ".join(filtros) or "nenhum"))
+        self.lbl.grid(row=3, column=0, columnspan=2, padx=12, pady=4, sticky="w")
+
+        self.barra = ctk.CTkProgressBar(self)
+        self.barra.grid(row=4, column=0, columnspan=2, padx=12, pady=4, sticky="ew")
+        self.barra.set(0)
+
+        btns = ctk.CTkFrame(self, fg_color="transparent")
+        btns.grid(row=5, column=0, columnspan=2, padx=12, pady=(6, 12), sticky="e")
+        self.btn_exportar = ctk.CTkButton(btns, text="Exportar", width=100, command=self._exportar)
+        self.btn_exportar.grid(row=0, column=0, padx=4)
+        self.btn_cancelar = ctk.CTkButton(btns, text="Fechar", width=100, command=self._cancelar)
+        self.btn_cancelar.grid(row=0, column=1, padx=4)
+
+        self._cancelar_evt = threading.Event()
+        self._thread = None
+        self._feitas = 0
+        self._total = 0
+        self._resultado = None  # (n, erro, arquivo)
+        self.protocol("WM_DELETE_WINDOW", self._cancelar)
+
+    def _exportar(self):
+        try:
+            inicio = interpretar_data(self.e_inicio.get())
+            fim = interpretar_data(self.e_fim.get())
+        except Exception:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.", parent=self)
+            return
+        if fim < inicio:
+            inicio, fim = fim, inicio
+        formato = self.combo_formato.get().lower()
+        ext = exportacao.FORMATOS[formato]
+        nome = f"reuniao_{inicio}{ext}" if inicio == fim else f"reuniao_{inicio}_a_{fim}{ext}"
+        filename = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=ext,
+            filetypes=[(formato.upper(), f"*{ext}")],
+            initialfile=nome,
+        )
+        if not filename:
+            return
+
+        self.btn_exportar.configure(state="disabled")
+        self.btn_cancelar.configure(text="Cancelar")
+        self.lbl.configure(text="Contando registros…")
+        self._thread = threading.Thread(
+            target=self._rodar, args=(filename, formato, inicio, fim), daemon=True)
+        self._thread.start()
+        self.after(VERIFICAR_MS, self._verificar)
+
+    def _rodar(self, filename, formato, inicio, fim):
+        # Thread de fundo: não toca em widgets
+        def progresso(n):
+            self._feitas = n
+        try:
+            self._total = self.backend.contar(inicio, fim, self.status, self.busca)
+            n = self.backend.exportar(filename, formato, inicio, fim, self.status, self.busca,
+                                      progresso=progresso, cancelar=self._cancelar_evt)
+            if n == 0 and os.path.exists(filename):
+                os.remove(filename)
+            self._resultado = (n, None, filename)
+        except Exception as e:
+            if os.path.exists(filename):
+                os.remove(filename)
+            self._resultado = (0, e, filename)
+
+    def _verificar(self):
+        if self._total:
+            self.barra.set(min(1.0, self._feitas / self._total))
+            self.lbl.configure(text=f"{self._feitas} de {self._total} registro(s)…")
+        if self._resultado is None:
+            self.after(VERIFICAR_MS, self._verificar)
+            return
+        n, erro, filename = self._resultado
+        self._thread = None
+        if isinstance(erro, exportacao.ExportacaoCancelada):
+            self.destroy()
+            return
+        if erro is not None:
+            messagebox.showerror("Erro na exportação", str(erro), parent=self)
+        elif n == 0:
+            messagebox.showinfo("Sem dados", "Nenhum registro para exportar com os filtros atuais.", parent=self)
+        else:
+            messagebox.showinfo("Exportado", f"{n} registro(s) salvos em:\n{filename}", parent=self)
+        self.destroy()
+
+    def _cancelar(self):
+        if self._thread is not None:
+            self._cancelar_evt.set()  # a thread termina no próximo lote
+        else:
+            self.destroy()
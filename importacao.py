@@ -0,0 +1,130 @@
+# Importação em massa do CSV no formato da exportação (";" e datas BR)
+# O arquivo é lido em streaming, validado linha a linha e carregado em lotes
+# (executemany) numa tabela temporária com índice único (data, processo), que
+# descarta repetições dentro do próprio arquivo. No fim, um único INSERT ... SELECT
+# copia para `processos` só os pares (data, processo) que ainda não existem.
+# Tudo numa transação: ou entra o arquivo inteiro, ou nada.
+# Linhas de dias já arquivados são recusadas como inválidas (esses dias são só leitura).
+import csv
+
+from datas import iso_data
+from db import separar_obs
+from processos import STATUS_OPCOES, DiaArquivado, arquivado_ate
+
+LOTE = 10000
+MAX_ERROS = 100  # erros guardados no relatório (o total é sempre contado)
+OBRIGATORIAS = ("data", "processo", "titulo")
+CAMPOS = ("data", "processo", "titulo", "cliente", "responsavel", "status", "observacoes")
+
+
+class Relatorio:
+    def __init__(self):
+        self.lidas = 0
+        self.inseridas = 0
+        self.invalidas = 0
+        self.erros = []  # (linha, motivo)
+
+    @property
+    def duplicadas(self):
+        return self.lidas - self.invalidas - self.inseridas
+
+    def erro(self, linha, motivo):
+        self.invalidas += 1
+        if len(self.erros) < MAX_ERROS:
+            self.erros.append((linha, motivo))
+
+    def texto(self):
+        partes = [f"{self.lidas} linha(s) lida(s): {self.inseridas} importada(s), "
+                  f"{self.duplicadas} duplicada(s), {self.invalidas} inválida(s)."]
+        for linha, motivo in self.erros:
+            partes.append(f"  linha {linha}: {motivo}")
+        if self.invalidas > len(self.erros):
+            partes.append(f"  … e mais {self.invalidas - len(self.erros)} erro(s).")
+        return "\n".join(partes)
+
+
+def validar(row, pos):
+    """
+    Converte uma linha do CSV (lista) no registro do banco; pos[i] é a posição
+    de CAMPOS[i] no cabeçalho (None se a coluna não existe). ValueError com o
+    motivo se inválida.
+    """
+    n = len(row)
+    data, processo, titulo, cliente, responsavel, status, observacoes = [
+        row[i].strip() if i is not None and i < n else "" for i in pos]
+    if not (data and processo and titulo):
+        col = "data" if not data else "processo" if not processo else "titulo"
+        raise ValueError(f"campo '{col}' vazio")
+    try:
+        data = iso_data(data)
+    except ValueError:
+        raise ValueError(f"data inválida {data!r} (use DD/MM/AAAA)")
+    status = status or STATUS_OPCOES[0]
+    if status not in STATUS_OPCOES:
+        raise ValueError(f"status desconhecido {status!r}")
+    return (data, processo, titulo, cliente or None, responsavel or None, status, observacoes or None)
+
+
+def _lotes_validos(arquivo, relatorio, progresso, ate=None):
+    leitor = csv.reader(arquivo, delimiter=";")
+    cabecalho = [c.strip() for c in next(leitor, [])]
+    faltando = [c for c in OBRIGATORIAS if c not in cabecalho]
+    if faltando:
+        raise ValueError(f"Cabeçalho sem a(s) coluna(s): {', '.join(faltando)}")
+    idx = {c: i for i, c in enumerate(cabecalho)}
+    pos = tuple(idx.get(c) for c in CAMPOS)
+    lote = []
+    for row in leitor:
+        if not row:
+            continue
+        relatorio.lidas += 1
+        try:
+            reg = validar(row, pos)
+            if ate is not None and reg[0] <= ate:
+                raise DiaArquivado(reg[0])
+            lote.append(reg)
+        except ValueError as e:
+            relatorio.erro(leitor.line_num, str(e))
+            continue
+        if len(lote) >= LOTE:
+            yield lote
+            lote = []
+            if progresso:
+                progresso(relatorio.lidas)
+    if lote:
+        yield lote
+    if progresso:
+        progresso(relatorio.lidas)
+
+
+def importar_csv(db, arquivo, progresso=None):
+    """
+    arquivo: objeto de texto aberto (use newline="" e encoding="utf-8-sig").
+    progresso(lidas): chamado a cada lote. Retorna um Relatorio.
+    """
+    relatorio = Relatorio()
+    with db.carga_em_massa() as conn:
+        conn.execute("""CREATE TEMP TABLE IF NOT EXISTS importacao (
+                            data TEXT NOT NULL, processo TEXT NOT NULL, titulo TEXT NOT NULL,
+                            cliente TEXT, responsavel TEXT, status TEXT NOT NULL, observacoes TEXT,
+                            obs_comprimida BLOB,
+                            UNIQUE (data, processo) ON CONFLICT IGNORE)""")
+        conn.execute("DELETE FROM temp.importacao")
+        ultimo = conn.execute("SELECT coalesce(max(id), 0) FROM processos").fetchone()[0]
+        for lote in _lotes_validos(arquivo, relatorio, progresso, arquivado_ate(conn)):
+            conn.executemany("INSERT INTO temp.importacao VALUES (?,?,?,?,?,?,?,?)",
+                             (r[:6] + separar_obs(r[6]) for r in lote))
+        relatorio.inseridas = conn.execute(
+            """INSERT INTO processos
+               (data, processo, titulo, cliente, responsavel, status, observacoes)
+               SELECT i.data, i.processo, i.titulo, i.cliente, i.responsavel, i.status, i.observacoes
+               FROM temp.importacao i
+               WHERE NOT EXISTS (SELECT 1 FROM processos p WHERE p.data = i.data AND p.processo = i.processo)
+               ORDER BY i.rowid""").rowcount
+        conn.execute("""INSERT INTO observacoes_grandes (id, texto)
+                        SELECT p.id, i.obs_comprimida FROM temp.importacao i
+                        JOIN processos p ON p.data = i.data AND p.processo = i.processo AND p.id > ?
+                        WHERE i.obs_comprimida IS NOT NULL""", (ultimo,))
+        conn.execute("DROP TABLE temp.importacao")
+    db.tocar()
+    return relatorio
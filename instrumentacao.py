@@ -0,0 +1,295 @@
+# Instrumentação do acesso a dados: latência, linhas e plano das consultas lentas
+# Toda conexão aberta por db.Database usa ConexaoMedida (factory do sqlite3.connect):
+# cada execute é medido até o cursor se esgotar — só o tempo dentro do SQLite, sem
+# o que o chamador faz entre um fetchmany e outro. As operações do backend e da
+# interface (listar, resumo, exportar, CRUD, pintar a lista...) são medidas com medir().
+# Consultas acima de LENTA_MS guardam o EXPLAIN QUERY PLAN: SCAN sem índice aponta
+# índice faltando; plano bom com tempo alto (e COMMIT lento, que inclui o fsync)
+# aponta disco ou compartilhamento de rede; operação lenta com SQL rápido, o Tk.
+# A medição das consultas custa ~14 µs por statement (o dobro de uma busca por
+# id), por isso começa desligada: DAILYCHECK_INSTRUMENTAR=1 liga desde a abertura
+# e a janela de diagnóstico liga/desliga com o app aberto (ligar()). Desligada, a
+# conexão só repassa para o sqlite3 (~0,4 µs). As operações (medir) são sempre medidas.
+import os
+import re
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+ATIVO = os.environ.get("DAILYCHECK_INSTRUMENTAR", "0") not in ("", "0")
+LENTA_MS = float(os.environ.get("DAILYCHECK_LENTA_MS", "100"))
+LIMITES_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)  # baldes dos histogramas
+LENTAS_GUARDADAS = 50
+CONSULTAS_MAX = 500  # SQLs distintos acompanhados; o resto soma em OUTRAS
+OUTRAS = "(outras)"
+ITERAR_LOTE = 256    # linhas por fetchmany quando o cursor é percorrido com for
+
+_COM_PLANO = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+_ESPACOS = re.compile(r"\s+")
+_LISTA = re.compile(r"\?(?:\s*,\s*\?)+")           # IN (?, ?, ?) de tamanho variável
+_SAVEPOINT = re.compile(r"^(SAVEPOINT|RELEASE|ROLLBACK TO) \w+$")
+
+
+def normalizar(sql):
+    """Uma chave por forma de consulta: espaços colapsados, listas de ? e savepoints unificados."""
+    chave = _ESPACOS.sub(" ", sql).strip()
+    chave = _LISTA.sub("?, …", chave)
+    return _SAVEPOINT.sub(r"\1 sp", chave)
+
+
+class Histograma:
+    __slots__ = ("baldes", "n", "soma", "maximo", "linhas")
+
+    def __init__(self):
+        self.baldes = [0] * (len(LIMITES_MS) + 1)
+        self.n = 0
+        self.soma = 0.0
+        self.maximo = 0.0
+        self.linhas = 0
+
+    def registrar(self, ms, linhas=0):
+        self.baldes[bisect_left(LIMITES_MS, ms)] += 1
+        self.n += 1
+        self.soma += ms
+        self.linhas += linhas
+        if ms > self.maximo:
+            self.maximo = ms
+
+    def quantil(self, q):
+        """Estimativa pelo limite superior do balde (o máximo no último)."""
+        alvo, acumulado = q * self.n, 0
+        for limite, n in zip(LIMITES_MS, self.baldes):
+            acumulado += n
+            if n and acumulado >= alvo:
+                return min(limite, self.maximo)
+        return self.maximo
+
+    def como_dict(self):
+        return {"n": self.n, "total_ms": round(self.soma, 3), "max_ms": round(self.maximo, 3),
+                "p50_ms": self.quantil(0.5), "p95_ms": self.quantil(0.95), "linhas": self.linhas,
+                "baldes": dict(zip([str(l) for l in LIMITES_MS] + ["+Inf"], self.baldes))}
+
+
+class Metricas:
+    """Registro das medições de todas as threads (UI, busca, exportação, servidor)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chaves = {}  # sql -> chave normalizada (o mesmo texto volta sempre)
+        self.zerar()
+
+    def zerar(self):
+        with self._lock:
+            self.operacoes = {}
+            self.consultas = {}
+            self.planos = {}
+            self.lentas = deque(maxlen=LENTAS_GUARDADAS)
+            self.n_lentas = 0
+            self.desde = time.time()
+
+    def operacao(self, nome, ms, linhas=0):
+        with self._lock:
+            h = self.operacoes.get(nome)
+            if h is None:
+                h = self.operacoes[nome] = Histograma()
+            h.registrar(ms, linhas)
+
+    def consulta(self, sql, ms, linhas, conn=None, params=()):
+        chave = self._chaves.get(sql)
+        if chave is None:
+            chave = normalizar(sql)
+            if len(self._chaves) < 4 * CONSULTAS_MAX:
+                self._chaves[sql] = chave
+        plano = None
+        if ms >= LENTA_MS and conn is not None and chave not in self.planos:
+            plano = explicar(conn, sql, params)
+        with self._lock:
+            h = self.consultas.get(chave)
+            if h is None:
+                if len(self.consultas) >= CONSULTAS_MAX:
+                    chave = OUTRAS
+                h = self.consultas.setdefault(chave, Histograma())
+            h.registrar(ms, linhas)
+            if ms >= LENTA_MS:
+                self.n_lentas += 1
+                if plano is not None:
+                    self.planos[chave] = plano
+                self.lentas.append({"quando": time.time(), "ms": round(ms, 3), "linhas": linhas,
+                                    "thread": threading.current_thread().name, "sql": chave})
+
+    def como_dict(self):
+        with self._lock:
+            return {
+                "desde": self.desde,
+                "lenta_ms": LENTA_MS,
+                "operacoes": {nome: h.como_dict() for nome, h in self.operacoes.items()},
+                "consultas": {sql: dict(h.como_dict(), plano=self.planos.get(sql))
+                              for sql, h in self.consultas.items()},
+                "n_lentas": self.n_lentas,
+                "lentas": list(self.lentas),
+            }
+
+    def prometheus(self, prefixo="dailycheck"):
+        """Texto no formato de exposição do Prometheus (tempos em segundos)."""
+        linhas = []
+        with self._lock:
+            for metrica, rotulo, itens, ajuda in (
+                    ("operacao", "operacao", self.operacoes, "Latência das operações do app"),
+                    ("consulta", "sql", self.consultas, "Latência das consultas SQL (até esgotar o cursor)")):
+                nome = f"{prefixo}_{metrica}_segundos"
+                linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} histogram"]
+                for chave, h in sorted(itens.items()):
+                    r = f'{rotulo}="{_escapar(chave)}"'
+                    acumulado = 0
+                    for limite, n in zip(LIMITES_MS, h.baldes):
+                        acumulado += n
+                        linhas.append(f'{nome}_bucket{{{r},le="{limite / 1000:g}"}} {acumulado}')
+                    linhas.append(f'{nome}_bucket{{{r},le="+Inf"}} {h.n}')
+                    linhas.append(f"{nome}_sum{{{r}}} {h.soma / 1000:.6f}")
+                    linhas.append(f"{nome}_count{{{r}}} {h.n}")
+                nome = f"{prefixo}_{metrica}_linhas_total"
+                linhas += [f"# HELP {nome} Linhas lidas ou gravadas", f"# TYPE {nome} counter"]
+                linhas += [f'{nome}{{{rotulo}="{_escapar(chave)}"}} {h.linhas}'
+                           for chave, h in sorted(itens.items())]
+            nome = f"{prefixo}_consultas_lentas_total"
+            linhas += [f"# HELP {nome} Consultas acima de {LENTA_MS:g} ms",
+                       f"# TYPE {nome} counter", f"{nome} {self.n_lentas}"]
+        return "\n".join(linhas) + "\n"
+
+
+def _escapar(texto):
+    return texto.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def explicar(conn, sql, params=()):
+    """EXPLAIN QUERY PLAN como texto indentado (como no shell do sqlite3), ou None."""
+    if not sql.lstrip()[:7].upper().startswith(_COM_PLANO):
+        return None
+    try:
+        # Pela classe base: o EXPLAIN não entra nas próprias medições
+        rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    except sqlite3.Error:  # outra thread, tabela temporária que já sumiu, interrupt...
+        return None
+    nivel = {0: -1}
+    saida = []
+    for _id, pai, _x, detalhe in rows:
+        nivel[_id] = nivel.get(pai, -1) + 1
+        saida.append("  " * nivel[_id] + detalhe)
+    return "\n".join(saida)
+
+
+METRICAS = Metricas()
+
+
+@contextmanager
+def medir(nome, metricas=METRICAS):
+    """Mede um bloco (ou, como decorador, cada chamada) como a operação `nome`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        metricas.operacao(nome, (time.perf_counter() - t0) * 1000)
+
+
+class CursorMedido(sqlite3.Cursor):
+    _sql = None
+
+    def execute(self, sql, params=()):
+        self._fim()
+        t0 = time.perf_counter()
+        super().execute(sql, params)
+        ms = (time.perf_counter() - t0) * 1000
+        if self.description is None:  # sem linhas para ler: já terminou
+            METRICAS.consulta(sql, ms, max(self.rowcount, 0), self.connection, params)
+        else:
+            self._sql, self._params, self._ms, self._linhas = sql, params, ms, 0
+        return self
+
+    def executemany(self, sql, seq):
+        self._fim()
+        t0 = time.perf_counter()
+        super().executemany(sql, seq)
+        METRICAS.consulta(sql, (time.perf_counter() - t0) * 1000, max(self.rowcount, 0))
+        return self
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        if self._sql is not None:
+            self._ms += (time.perf_counter() - t0) * 1000
+            if row is None:
+                self._fim()
+            else:
+                self._linhas += 1
+        return row
+
+    def fetchmany(self, size=None):
+        t0 = time.perf_counter()
+        size = self.arraysize if size is None else size
+        rows = super().fetchmany(size)
+        if self._sql is not None:
+            self._ms += (time.perf_counter() - t0) * 1000
+            self._linhas += len(rows)
+            if len(rows) < size:
+                self._fim()
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        if self._sql is not None:
+            self._ms += (time.perf_counter() - t0) * 1000
+            self._linhas += len(rows)
+            self._fim()
+        return rows
+
+    def __iter__(self):
+        # for row in cursor: lê em lotes pelo fetchmany medido (medir cada linha pesaria)
+        while True:
+            rows = self.fetchmany(ITERAR_LOTE)
+            yield from rows
+            if len(rows) < ITERAR_LOTE:
+                return
+
+    def close(self):
+        self._fim()
+        super().close()
+
+    def __del__(self):
+        self._fim()
+
+    def _fim(self):
+        # Cursor esgotado, fechado, reutilizado ou descartado: registra o que foi lido
+        if self._sql is None:
+            return
+        sql, self._sql = self._sql, None
+        METRICAS.consulta(sql, self._ms, self._linhas, self.connection, self._params)
+
+
+class ConexaoMedida(sqlite3.Connection):
+    def cursor(self, factory=None):
+        return (factory or (CursorMedido if ATIVO else sqlite3.Cursor))(self)
+
+    def execute(self, sql, params=()):
+        if not ATIVO:
+            return super().execute(sql, params)
+        return CursorMedido(self).execute(sql, params)
+
+    def executemany(self, sql, seq):
+        if not ATIVO:
+            return super().executemany(sql, seq)
+        return CursorMedido(self).executemany(sql, seq)
+
+
+def ligar(ativo=True):
+    """Liga (ou desliga) a medição das consultas nas conexões já abertas e nas próximas."""
+    global ATIVO
+    ATIVO = ativo
+
+
+def fabrica():
+    """factory para sqlite3.connect: sempre ConexaoMedida, para a medição poder ser ligada depois."""
+    return ConexaoMedida
@@ -0,0 +1,34 @@
+# Popup de observações completas (só leitura; tem botão Copiar e Fechar)
+# Importado por app.py no primeiro duplo clique, fora do caminho da abertura.
+from tkinter import messagebox
+
+import customtkinter as ctk
+
+
+class JanelaObservacoes(ctk.CTkToplevel):
+    def __init__(self, master, processo, titulo, obs):
+        super().__init__(master)
+        self.obs = obs or ""
+        self.title(f"Observações — #{processo}")
+        self.geometry("700x450")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        header = ctk.CTkLabel(self, text=f"#{processo} — {titulo}", font=ctk.CTkFont(size=14, weight="bold"))
+        header.grid(row=0, column=0, sticky="ew", padx=12, pady=(12,6))
+
+        txt = ctk.CTkTextbox(self, wrap="word")
+        txt.grid(row=1, column=0, sticky="nsew", padx=12, pady=6)
+        txt.insert("1.0", self.obs)
+        txt.configure(state="disabled")
+
+        btns = ctk.CTkFrame(self)
+        btns.grid(row=2, column=0, sticky="ew", padx=12, pady=(6,12))
+        btns.grid_columnconfigure(1, weight=1)
+        ctk.CTkButton(btns, text="Copiar", command=self._copiar).grid(row=0, column=0, padx=4)
+        ctk.CTkButton(btns, text="Fechar", command=self.destroy).grid(row=0, column=2, padx=4)
+
+    def _copiar(self):
+        self.clipboard_clear()
+        self.clipboard_append(self.obs)
+        messagebox.showinfo("Copiado", "Observações copiadas para a área de transferência.")
@@ -0,0 +1,86 @@
+# Perfil da inicialização: quanto cada fase leva até a janela aparecer com a lista
+# Ligado por DAILYCHECK_PERFIL=1 (ou =arquivo.txt) ou `dailycheck.py gui --perfil`.
+# No .exe do PyInstaller não dá para passar -X importtime, então os imports são
+# medidos por um gancho em builtins.__import__ e saem no mesmo formato.
+# Sem o perfil ligado, marcar() não faz nada e nenhum gancho é instalado.
+import builtins
+import os
+import sys
+import time
+
+INICIO = time.perf_counter()  # dailycheck.py importa este módulo antes de todos os outros
+ARQUIVO_PADRAO = "perfil_inicializacao.txt"  # quando não há stderr (.exe sem console)
+
+_destino = os.environ.get("DAILYCHECK_PERFIL", "")
+ativo = _destino not in ("", "0")
+_fases = []    # (fase, instante)
+_imports = []  # (self µs, acumulado µs, módulo, profundidade) na ordem em que terminaram
+_pilha = []    # µs gastos nos imports aninhados de cada import em andamento
+_import_original = builtins.__import__
+
+
+def _importar(name, globals=None, locals=None, fromlist=(), level=0):
+    if level == 0 and name in sys.modules:
+        return _import_original(name, globals, locals, fromlist, level)
+    novos = len(sys.modules)
+    _pilha.append(0)
+    t0 = time.perf_counter()
+    try:
+        return _import_original(name, globals, locals, fromlist, level)
+    finally:
+        total = int((time.perf_counter() - t0) * 1e6)
+        aninhados = _pilha.pop()
+        if _pilha:
+            _pilha[-1] += total
+        if len(sys.modules) > novos:  # só o que foi carregado agora, como o -X importtime
+            _imports.append((total - aninhados, total, name, len(_pilha)))
+
+
+def ligar(destino="-"):
+    """Liga o perfil (se ainda não estava) e instala o gancho de imports."""
+    global ativo, _destino
+    if not ativo:
+        ativo, _destino = True, destino
+    if builtins.__import__ is not _importar:
+        builtins.__import__ = _importar
+
+
+def marcar(fase):
+    if ativo:
+        _fases.append((fase, time.perf_counter()))
+
+
+def relatorio():
+    linhas = ["Inicialização (ms desde o início do processo):"]
+    anterior = INICIO
+    for fase, t in _fases:
+        linhas.append(f"  {fase:<22}{(t - INICIO) * 1000:>9.1f}  (+{(t - anterior) * 1000:.1f})")
+        anterior = t
+    if _imports:
+        lentos = sorted(_imports, key=lambda i: -i[0])[:15]
+        linhas.append("")
+        linhas.append("Imports mais caros (self):")
+        linhas += [f"  {nome:<40}{proprio / 1000:>9.1f} ms" for proprio, _t, nome, _p in lentos]
+        linhas.append("")
+        linhas.append("import time: self [us] | cumulative | imported package")
+        linhas += [f"import time: {proprio:>9} | {total:>10} | {'  ' * prof}{nome}"
+                   for proprio, total, nome, prof in _imports]
+    return "\n".join(linhas)
+
+
+def gravar():
+    """Escreve o relatório em stderr ou no arquivo de DAILYCHECK_PERFIL / --perfil."""
+    if not ativo:
+        return
+    destino = _destino if _destino not in ("1", "-") else "-"
+    if destino == "-" and sys.stderr is None:
+        destino = ARQUIVO_PADRAO
+    if destino == "-":
+        print(relatorio(), file=sys.stderr)
+    else:
+        with open(destino, "w", encoding="utf-8") as f:
+            f.write(relatorio() + "\n")
+
+
+if ativo:
+    ligar(_destino)
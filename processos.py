@@ -0,0 +1,426 @@
+# Operações sobre a tabela `processos` (uso pela UI ou headless)
+# Todas recebem um db.Database e rodam cada operação em uma única transação.
+# Dias já arquivados (arquivo.py) são lidos dos bancos por ano e não aceitam escrita.
+import pathlib
+import re
+import sqlite3
+
+from datas import br_data
+from db import COLUNAS_PROCESSOS, descomprimir, esquema_arquivo, sem_acento, separar_obs
+
+STATUS_OPCOES = [
+    "Atendido",
+    "Encaminhado p/ Frente de Loja",
+    "Concluído",
+    "Dei uma olhada",
+    "Com dúvida",
+]
+
+# SQLite antigo limita a 999 variáveis por statement; fica uma folga.
+LIMITE_VARIAVEIS = 900
+
+INSERT_SQL = """INSERT INTO processos
+   (data, processo, titulo, cliente, responsavel, status, observacoes)
+   VALUES (?,?,?,?,?,?,?)"""
+
+
+def _lotes(seq, tamanho=LIMITE_VARIAVEIS):
+    seq = list(seq)
+    for i in range(0, len(seq), tamanho):
+        yield seq[i:i + tamanho]
+
+
+def _datas_dos_ids(conn, ids):
+    datas = set()
+    for lote in _lotes(ids):
+        q = f"SELECT DISTINCT data FROM processos WHERE id IN ({','.join('?' * len(lote))})"
+        datas.update(d for (d,) in conn.execute(q, lote))
+    return datas
+
+
+class DiaArquivado(ValueError):
+    """Escrita num dia que já foi para os arquivos por ano: esses dias são só leitura."""
+
+    def __init__(self, data_iso):
+        super().__init__(f"o dia {br_data(data_iso)} está arquivado (somente leitura)")
+        self.data = data_iso
+
+
+def arquivado_ate(conn):
+    """Último dia arquivado, lido na própria conexão (dentro da transação que vai gravar)."""
+    return conn.execute("SELECT max(ate) FROM arquivos").fetchone()[0]
+
+
+def _conferir_datas(conn, datas):
+    ate = arquivado_ate(conn)
+    if ate is not None and datas and min(datas) <= ate:
+        raise DiaArquivado(min(datas))
+
+
+def _conferir_ids(db, conn, ids):
+    """
+    Ids que não estão no banco principal podem ser de dias arquivados: aí a
+    escrita é recusada (DiaArquivado) em vez de não alterar nada em silêncio.
+    O arquivo é lido numa conexão à parte, porque ATTACH não roda dentro da transação.
+    """
+    if arquivado_ate(conn) is None:
+        return
+    presentes = set()
+    for lote in _lotes(ids):
+        q = f"SELECT id FROM processos WHERE id IN ({','.join('?' * len(lote))})"
+        presentes.update(i for (i,) in conn.execute(q, lote))
+    faltando = [i for i in ids if i not in presentes]
+    if not faltando:
+        return
+    db.ler_arquivos(conn)
+    for caminho, _ate, id_min, id_max in db.arquivos.values():
+        dentro = [i for i in faltando if id_min <= i <= id_max]
+        if not dentro:
+            continue
+        arquivo = sqlite3.connect(pathlib.Path(caminho).as_uri() + "?mode=ro", uri=True)
+        try:
+            for lote in _lotes(dentro):
+                q = f"SELECT min(data) FROM processos WHERE id IN ({','.join('?' * len(lote))})"
+                data = arquivo.execute(q, lote).fetchone()[0]
+                if data is not None:
+                    raise DiaArquivado(data)
+        finally:
+            arquivo.close()
+
+
+def _separar(reg):
+    """reg com só o começo das observações longas + o texto comprimido (ou None)."""
+    obs, comprimido = separar_obs(reg[6])
+    return (*reg[:6], obs), comprimido
+
+
+def _guardar_obs(conn, _id, comprimido):
+    conn.execute("DELETE FROM observacoes_grandes WHERE id=?", (_id,))
+    if comprimido is not None:
+        conn.execute("INSERT INTO observacoes_grandes (id, texto) VALUES (?, ?)", (_id, comprimido))
+
+
+def inserir(db, reg):
+    """
+    reg: (data, processo, titulo, cliente, responsavel, status, observacoes)
+    Retorna o id criado.
+    """
+    reg, comprimido = _separar(reg)
+    with db.transaction() as conn:
+        _conferir_datas(conn, [reg[0]])
+        _id = conn.execute(INSERT_SQL, reg).lastrowid
+        if comprimido is not None:
+            _guardar_obs(conn, _id, comprimido)
+    db.tocar([reg[0]])
+    return _id
+
+
+def inserir_varios(db, regs):
+    """Insere vários registros (mesmo formato de `inserir`) numa transação; retorna a quantidade."""
+    grandes = []  # (posição, texto comprimido)
+
+    def separados(ate):
+        for i, reg in enumerate(regs):
+            if ate is not None and reg[0] <= ate:
+                raise DiaArquivado(reg[0])
+            reg, comprimido = _separar(reg)
+            if comprimido is not None:
+                grandes.append((i, comprimido))
+            yield reg
+
+    with db.carga_em_massa() as conn:
+        cur = conn.executemany(INSERT_SQL, separados(arquivado_ate(conn)))
+        if grandes:
+            # ids do AUTOINCREMENT são consecutivos dentro da transação
+            primeiro = conn.execute("SELECT max(id) FROM processos").fetchone()[0] - cur.rowcount + 1
+            conn.executemany("INSERT INTO observacoes_grandes (id, texto) VALUES (?, ?)",
+                             [(primeiro + i, comprimido) for i, comprimido in grandes])
+    db.tocar()
+    return cur.rowcount
+
+
+class ConflitoEdicao(Exception):
+    """O registro mudou (ou sumiu) desde que foi lido; `atual` traz a linha atual ou None."""
+
+    def __init__(self, _id, atual):
+        super().__init__(f"registro {_id} alterado por outro usuário")
+        self.id = _id
+        self.atual = atual
+
+
+def atualizar(db, reg, _id, versao=None):
+    """
+    Com `versao` (lida junto com a linha), só grava se ninguém alterou o registro
+    nesse meio-tempo; caso contrário levanta ConflitoEdicao. Sem `versao`, sobrescreve.
+    """
+    sql = """UPDATE processos
+             SET data=?, processo=?, titulo=?, cliente=?, responsavel=?, status=?, observacoes=?,
+                 versao = versao + 1
+             WHERE id=?"""
+    reg, comprimido = _separar(reg)
+    params = (*reg, _id)
+    if versao is not None:
+        sql += " AND versao=?"
+        params += (versao,)
+    with db.transaction() as conn:
+        _conferir_ids(db, conn, [_id])
+        datas = _datas_dos_ids(conn, [_id]) | {reg[0]}
+        _conferir_datas(conn, datas)
+        n = conn.execute(sql, params).rowcount
+        if n == 0 and versao is not None:
+            atual = conn.execute(f"SELECT {COLUNAS_LISTA} FROM processos p WHERE p.id=?", (_id,)).fetchone()
+            raise ConflitoEdicao(_id, atual)
+        if n:
+            _guardar_obs(conn, _id, comprimido)
+    db.tocar(datas)
+    return n
+
+
+def excluir(db, ids, versoes=None):
+    """
+    Exclui os ids; com `versoes` ({id: versao}) só exclui os que não mudaram
+    desde a leitura. Retorna quantos foram excluídos.
+    """
+    total = 0
+    with db.transaction() as conn:
+        _conferir_ids(db, conn, ids)
+        datas = _datas_dos_ids(conn, ids)
+        if versoes is not None:
+            total = conn.executemany("DELETE FROM processos WHERE id=? AND versao=?",
+                                     [(i, versoes[i]) for i in ids]).rowcount
+        else:
+            for lote in _lotes(ids):
+                q = f"DELETE FROM processos WHERE id IN ({','.join('?' * len(lote))})"
+                total += conn.execute(q, lote).rowcount
+    db.tocar(datas)
+    return total
+
+
+def mover_status(db, ids, novo_status):
+    """Troca o status de vários ids; retorna quantas linhas mudaram."""
+    total = 0
+    with db.transaction() as conn:
+        _conferir_ids(db, conn, ids)
+        datas = _datas_dos_ids(conn, ids)
+        for lote in _lotes(ids):
+            q = (f"UPDATE processos SET status=?, versao = versao + 1 "
+                 f"WHERE id IN ({','.join('?' * len(lote))}) AND status <> ?")
+            total += conn.execute(q, (novo_status, *lote, novo_status)).rowcount
+    db.tocar(datas)
+    return total
+
+
+def duplicar_dia(db, origem, destino):
+    """
+    Copia todos os registros de `origem` para `destino` (datas ISO) com um único
+    INSERT ... SELECT. Retorna a quantidade copiada (0 se a origem estiver vazia).
+    A origem pode estar arquivada; o destino não.
+    """
+    p, g = tabela(db, "processos", origem), tabela(db, "observacoes_grandes", origem)
+    copiar = f"""INSERT INTO processos
+                 (data, processo, titulo, cliente, responsavel, status, observacoes)
+                 SELECT ?, processo, titulo, cliente, responsavel, status, observacoes
+                 FROM {p} WHERE data = ? ORDER BY id"""
+    db.anexar(db.conn, copiar)  # ATTACH não pode ficar dentro da transação
+    with db.transaction() as conn:
+        _conferir_datas(conn, [destino])
+        ultimo = conn.execute("SELECT coalesce(max(id), 0) FROM processos").fetchone()[0]
+        n = conn.execute(copiar, (destino, origem)).rowcount
+        # As cópias saem na ordem dos originais: a n-ésima cópia leva o texto longo do n-ésimo
+        conn.execute(
+            f"""INSERT INTO observacoes_grandes (id, texto)
+                SELECT c.id, g.texto
+                FROM (SELECT id, row_number() OVER (ORDER BY id) AS n FROM {p}
+                      WHERE data = ? AND id <= ?) o
+                JOIN (SELECT id, row_number() OVER (ORDER BY id) AS n FROM processos WHERE id > ?) c
+                  ON c.n = o.n
+                JOIN {g} g ON g.id = o.id""",
+            (origem, ultimo, ultimo),
+        )
+    db.tocar([destino])
+    return n
+
+
+# ---------------- Consultas ----------------
+# A lista só precisa saber se há observação; o texto vem sob demanda (ler_observacoes)
+COLUNAS_LISTA = ("p.id, p.data, p.processo, p.titulo, p.cliente, p.responsavel, p.status, "
+                 "p.observacoes IS NOT NULL, p.versao")
+# Texto completo das observações, descomprimindo as longas ({observacoes_grandes}
+# é preenchido por consulta() com a tabela do banco de onde vêm as linhas)
+OBSERVACOES_SQL = ("coalesce((SELECT descomprimir(g.texto) FROM {observacoes_grandes} g WHERE g.id = p.id), "
+                   "p.observacoes)")
+COLUNAS_BUSCA = ("p.processo", "p.titulo", "p.cliente", "p.responsavel", "p.observacoes")
+_COLUNAS_P = ", ".join("p." + c for c in COLUNAS_PROCESSOS.split(", "))
+
+
+def _de(fontes, nome):
+    if fontes == ["main"]:
+        return nome
+    if len(fontes) == 1:
+        return f"{fontes[0]}.{nome}"
+    colunas = COLUNAS_PROCESSOS if nome == "processos" else "id, texto"
+    return "(" + " UNION ALL ".join(f"SELECT {colunas} FROM {e}.{nome}" for e in fontes) + ")"
+
+
+def tabela(db, nome, inicio, fim=None):
+    """
+    Como `nome` (processos ou observacoes_grandes) entra no FROM para os dias
+    inicio..fim: a tabela do banco principal, a do arquivo do ano ou a união
+    delas. O SQLite leva o WHERE da data para dentro de cada parte da união.
+    """
+    return _de(db.fontes(inicio, fim), nome)
+
+
+def expressao_fts(busca):
+    """
+    Converte o texto digitado numa consulta FTS5: cada palavra vira um prefixo
+    entre aspas ("manut"*), todas obrigatórias. Retorna None se não houver palavras.
+    """
+    termos = re.findall(r"\w+", busca)
+    if not termos:
+        return None
+    return " ".join(f'"{t}"*' for t in termos)
+
+
+def consulta(db, colunas, data_iso, status=None, busca=None, fim=None, ordenar=True, ids=None,
+             abaixo_de=None):
+    """
+    Monta o SELECT usado pela lista e pela exportação; retorna (sql, params).
+    Com `fim`, filtra o intervalo data_iso..fim (inclusive) em ordem cronológica.
+    Com `abaixo_de`, só ids menores (próxima página da lista, que vem por id decrescente).
+    Com busca, usa o índice FTS5 e ordena por relevância; sem FTS5, cai para LIKE
+    sem acentos nas mesmas colunas.
+    Dias arquivados vêm do arquivo do ano (arqAAAA: quem executa chama
+    db.anexar antes); um período que atravessa bancos lê a união deles.
+    """
+    fontes = db.fontes(data_iso, fim)
+    expr = expressao_fts(busca) if busca and db.fts else None
+    de, antes = _de(fontes, "processos"), []
+    if expr and len(fontes) > 1:
+        # Um índice FTS por banco: cada parte da união já faz a sua busca e traz o rank
+        de = "(" + " UNION ALL ".join(
+            f"SELECT {_COLUNAS_P}, f.rank AS rank FROM {e}.processos p "
+            f"JOIN {e}.processos_fts f ON f.rowid = p.id WHERE processos_fts MATCH ?" for e in fontes) + ")"
+        antes = [expr] * len(fontes)
+    sql = f"SELECT {colunas.format(observacoes_grandes=_de(fontes, 'observacoes_grandes'))} FROM {de} p"
+    if fim is None:
+        where = ["p.data = ?"]
+        params = [data_iso]
+        ordem = "p.id DESC"
+    else:
+        where = ["p.data BETWEEN ? AND ?"]
+        params = [data_iso, fim]
+        ordem = "p.data, p.id"
+    if status:
+        where.append("p.status = ?"); params.append(status)
+    if ids is not None:
+        # Restringe a ids conhecidos (atualização pontual da lista); até LIMITE_VARIAVEIS
+        where.append(f"p.id IN ({','.join('?' * len(ids))})"); params += list(ids)
+    if abaixo_de is not None:
+        where.append("p.id < ?"); params.append(abaixo_de)
+    if busca:
+        if antes:
+            ordem = "p.rank, " + ordem
+        elif expr:
+            sql += f" JOIN {_de(fontes, 'processos_fts')} f ON f.rowid = p.id"
+            where.append("processos_fts MATCH ?"); params.append(expr)
+            ordem = "f.rank, " + ordem
+        else:
+            where.append("(" + " OR ".join(f"sem_acento({c}) LIKE ?" for c in COLUNAS_BUSCA) + ")")
+            like = f"%{sem_acento(busca)}%"; params += [like] * len(COLUNAS_BUSCA)
+    sql += " WHERE " + " AND ".join(where)
+    if ordenar:
+        sql += " ORDER BY " + ordem
+    return sql, antes + params
+
+
+class ListaPaginada:
+    """
+    Linhas do dia em páginas, com a interface de cursor que a TabelaVirtual usa
+    (fetchmany). Cada página é uma consulta própria lida inteira: um cursor
+    pendente em db.conn seguraria o snapshot de leitura (o feed e o resumo
+    deixariam de ver commits de fora e a próxima gravação daria "database is locked").
+    Sem busca a próxima página continua do último id (id decrescente); com busca,
+    ordenada por relevância, usa OFFSET.
+    """
+
+    def __init__(self, db, data_iso, status=None, busca=None):
+        self.db = db
+        self.filtros = (data_iso, status, busca)
+        self._ultimo = None
+        self._lidas = 0
+        self._fim = False
+
+    def fetchmany(self, n):
+        if self._fim:
+            return []
+        data_iso, status, busca = self.filtros
+        if busca:
+            sql, params = consulta(self.db, COLUNAS_LISTA, data_iso, status, busca)
+            rows = self.db.execute(sql + " LIMIT ? OFFSET ?", params + [n, self._lidas]).fetchall()
+        else:
+            sql, params = consulta(self.db, COLUNAS_LISTA, data_iso, status, abaixo_de=self._ultimo)
+            rows = self.db.execute(sql + " LIMIT ?", params + [n]).fetchall()
+        if rows:
+            self._ultimo = rows[-1][0]
+        self._lidas += len(rows)
+        self._fim = len(rows) < n
+        return rows
+
+    def fetchall(self):
+        rows = self.fetchmany(-1)  # LIMIT -1: sem limite
+        self._fim = True
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._fim = True
+
+
+def listar(db, data_iso, status=None, busca=None):
+    """Linhas do dia (ListaPaginada), mais recentes primeiro."""
+    return ListaPaginada(db, data_iso, status, busca)
+
+
+def _por_id(db, sql, _id):
+    """
+    Executa `sql` ({processos} e {observacoes_grandes} no lugar das tabelas) no
+    banco principal e, se o id não estiver lá, nos arquivos cuja faixa de ids o inclui.
+    """
+    fontes = ["main"] + [esquema_arquivo(ano) for ano, (_c, _ate, de, ate) in reversed(db.arquivos.items())
+                         if de <= _id <= ate]
+    with db.conectar() as conn:
+        for e in fontes:
+            q = sql.format(processos=_de([e], "processos"), observacoes_grandes=_de([e], "observacoes_grandes"))
+            db.anexar(conn, q)
+            row = conn.execute(q, (_id,)).fetchone()
+            if row is not None:
+                return row
+    return None
+
+
+def obter(db, _id):
+    """Linha de COLUNAS_LISTA seguida das observações completas, ou None."""
+    return _por_id(db, f"SELECT {COLUNAS_LISTA}, {OBSERVACOES_SQL} FROM {{processos}} p WHERE p.id=?", _id)
+
+
+def ler_observacoes(db, _id):
+    """(processo, titulo, observações completas, versao) ou None."""
+    row = _por_id(db, """SELECT p.processo, p.titulo, p.observacoes, g.texto, p.versao
+                         FROM {processos} p LEFT JOIN {observacoes_grandes} g ON g.id = p.id
+                         WHERE p.id=?""", _id)
+    if row is None:
+        return None
+    processo, titulo, obs, comprimido, versao = row
+    return processo, titulo, descomprimir(comprimido) if comprimido is not None else obs, versao
+
+
+def listar_ids(db, ids, data_iso, status=None, busca=None):
+    """Relê só os ids indicados, com os filtros da lista; quem não volta saiu do filtro (ou foi excluído)."""
+    rows = []
+    for lote in _lotes(list(ids)):
+        sql, params = consulta(db, COLUNAS_LISTA, data_iso, status, busca, ids=lote)
+        rows += db.execute(sql, params).fetchall()
+    return rows
@@ -0,0 +1,238 @@
+# Relatórios de produtividade sobre o histórico (sem dependência da interface)
+# As consultas leem só as tabelas de totais (db.TOTAIS), que os triggers mantêm a
+# cada escrita já somadas por semana e por mês: o período é dividido em semanas
+# (ou meses) inteiras, lidas prontas, mais os dias avulsos das pontas, lidos dos
+# totais diários. O custo depende de períodos x responsáveis x status, não da
+# quantidade de processos — anos de histórico saem em milissegundos.
+# Quanto tempo um processo fica aberto vem de processo_ciclo/ciclo_hist: um mesmo
+# número em dias diferentes (como o "Duplicar de Ontem" cria) conta como o mesmo processo.
+from datetime import date, timedelta
+
+from datas import br_data
+from db import MES_SQL, SEMANA_SQL
+from processos import tabela
+
+# agrupar -> (tabela de totais, coluna do período, expressão do período sobre `data`)
+AGRUPAMENTOS = {
+    "semana": ("totais_semana", "semana", SEMANA_SQL.format("data")),
+    "mes": ("totais_mes", "mes", MES_SQL.format("data")),
+}
+SEMANAS_MAX = 16  # acima disso o texto agrupa por mês
+TOP = 10
+CICLO_VARRER = 5000  # até quantos processos no período os mais longos saem pelo índice de primeira
+_VAZIO = ("1", "0")  # intervalo BETWEEN que não casa com nada
+
+
+def _agrupamento(agrupar):
+    try:
+        return AGRUPAMENTOS[agrupar]
+    except KeyError:
+        raise ValueError(f"agrupar deve ser um de: {', '.join(AGRUPAMENTOS)}")
+
+
+def _fatias(inicio, fim, agrupar):
+    """((chave inicial, chave final) dos períodos inteiros, [dias avulsos (de, até)]) com 2 pontas sempre."""
+    d0, d1 = date.fromisoformat(inicio), date.fromisoformat(fim)
+    if agrupar == "semana":
+        primeiro = d0 + timedelta(days=-d0.weekday() % 7)
+        ultimo = d1 - timedelta(days=d1.weekday() + (0 if d1.weekday() == 6 else 7))
+        fim_ultimo = ultimo + timedelta(days=6)
+        chaves = (primeiro.isoformat(), ultimo.isoformat())
+    else:
+        primeiro = d0 if d0.day == 1 else (d0.replace(day=28) + timedelta(days=4)).replace(day=1)
+        seguinte = (d1 + timedelta(days=1)).replace(day=1)  # 1º dia do mês depois do último inteiro
+        fim_ultimo = seguinte - timedelta(days=1)
+        ultimo = fim_ultimo.replace(day=1)
+        chaves = (primeiro.isoformat()[:7], ultimo.isoformat()[:7])
+    if primeiro > ultimo:
+        return _VAZIO, [(inicio, fim), _VAZIO]
+    pontas = [(inicio, (primeiro - timedelta(days=1)).isoformat()) if primeiro > d0 else _VAZIO,
+              ((fim_ultimo + timedelta(days=1)).isoformat(), fim) if fim_ultimo < d1 else _VAZIO]
+    return chaves, pontas
+
+
+def _base(tabela, coluna, tabela_dia, expr, colunas, inicio, fim, agrupar):
+    """SQL (período, colunas..., n) juntando os períodos inteiros e os dias avulsos, e os parâmetros."""
+    chaves, pontas = _fatias(inicio, fim, agrupar)
+    sql = (f"SELECT {coluna} AS periodo, {colunas}, n FROM {tabela} WHERE {coluna} BETWEEN ? AND ?"
+           + f" UNION ALL SELECT {expr} AS periodo, {colunas}, n FROM {tabela_dia} WHERE data BETWEEN ? AND ?" * 2)
+    return sql, (*chaves, *pontas[0], *pontas[1])
+
+
+def por_responsavel(db, inicio, fim, agrupar="semana"):
+    """[(periodo, responsavel, n, variacao, acumulado)]; variação contra o período anterior do mesmo responsável."""
+    tabela, coluna, expr = _agrupamento(agrupar)
+    base, params = _base(tabela, coluna, "totais_dia", expr, "responsavel", inicio, fim, agrupar)
+    with db.conectar() as conn:
+        return conn.execute(f"""
+            WITH t AS (SELECT periodo, responsavel, sum(n) AS n FROM ({base}) GROUP BY 1, 2)
+            SELECT periodo, responsavel, n,
+                   n - lag(n, 1, 0) OVER (PARTITION BY responsavel ORDER BY periodo),
+                   sum(n) OVER (PARTITION BY responsavel ORDER BY periodo)
+            FROM t ORDER BY periodo, n DESC, responsavel""", params).fetchall()
+
+
+def status_no_tempo(db, inicio, fim, agrupar="semana"):
+    """[(periodo, status, n, % do período)]."""
+    tabela, coluna, expr = _agrupamento(agrupar)
+    base, params = _base(tabela, coluna, "totais_dia", expr, "status", inicio, fim, agrupar)
+    with db.conectar() as conn:
+        return conn.execute(f"""
+            WITH t AS (SELECT periodo, status, sum(n) AS n FROM ({base}) GROUP BY 1, 2)
+            SELECT periodo, status, n, round(100.0 * n / sum(n) OVER (PARTITION BY periodo), 1)
+            FROM t ORDER BY periodo, n DESC""", params).fetchall()
+
+
+def top_clientes(db, inicio, fim, limite=TOP):
+    """[(posicao, cliente, n, % do total)]; empates dividem a posição."""
+    base, params = _base("totais_cliente_mes", "mes", "totais_cliente", "''", "cliente", inicio, fim, "mes")
+    with db.conectar() as conn:
+        return conn.execute(f"""
+            WITH t AS (SELECT cliente, sum(n) AS n FROM ({base}) WHERE cliente <> '' GROUP BY cliente)
+            SELECT rank() OVER (ORDER BY n DESC), cliente, n, round(100.0 * n / sum(n) OVER (), 1)
+            FROM t ORDER BY n DESC, cliente LIMIT ?""", (*params, limite)).fetchall()
+
+
+class Ciclo:
+    """Tempo em aberto dos processos que apareceram pela primeira vez no período."""
+    __slots__ = ("total", "media", "mediana", "p90", "maximo", "mesmo_dia", "mais_longos")
+
+    def __init__(self, total=0, media=None, mediana=None, p90=None, maximo=None, mesmo_dia=0, mais_longos=()):
+        self.total = total
+        self.media = media
+        self.mediana = mediana
+        self.p90 = p90
+        self.maximo = maximo
+        self.mesmo_dia = mesmo_dia
+        self.mais_longos = list(mais_longos)  # (processo, primeira, ultima, dias, corridos, status)
+
+
+def ciclo(db, inicio, fim, limite=TOP):
+    # corridos: dias de calendário entre a primeira e a última aparição (inclusive).
+    # As estatísticas saem da distribuição (ciclo_hist), poucas linhas por dia.
+    with db.conectar() as conn:
+        total, media, maximo, mediana, p90, mesmo_dia, corte = conn.execute("""
+            WITH h AS (SELECT corridos, sum(n) AS n FROM ciclo_hist
+                       WHERE primeira BETWEEN ? AND ? GROUP BY corridos),
+                 a AS (SELECT corridos, n, sum(n) OVER (ORDER BY corridos) AS acum,
+                              sum(n) OVER (ORDER BY corridos DESC) AS de_cima,
+                              sum(n) OVER () AS total FROM h)
+            SELECT coalesce(max(total), 0), 1.0 * sum(corridos * n) / max(total), max(corridos),
+                   min(CASE WHEN acum * 2 >= total THEN corridos END),
+                   min(CASE WHEN acum * 10 >= total * 9 THEN corridos END),
+                   coalesce(sum(CASE WHEN corridos = 1 THEN n END), 0),
+                   max(CASE WHEN de_cima >= ? THEN corridos END)
+            FROM a""", (inicio, fim, limite)).fetchone()
+        if not total:
+            return Ciclo()
+        # Os mais longos têm corridos >= corte; com muitos processos no período
+        # o índice de corridos chega neles sem ordenar o período inteiro
+        indice = "idx_ciclo_primeira" if total <= CICLO_VARRER else "idx_ciclo_corridos"
+        longos = conn.execute(f"""
+            SELECT processo, primeira, ultima, dias, corridos
+            FROM processo_ciclo INDEXED BY {indice}
+            WHERE primeira BETWEEN ? AND ? AND corridos >= ?
+            ORDER BY corridos DESC, primeira, processo LIMIT ?""", (inicio, fim, corte or 1, limite)).fetchall()
+        status = _status_no_ultimo_dia(db, conn, [(r[0], r[2]) for r in longos])
+        longos = [(*r, status.get((r[0], r[2]))) for r in longos]
+    return Ciclo(total, media, mediana, p90, maximo, mesmo_dia, longos)
+
+
+def _status_no_ultimo_dia(db, conn, pares):
+    """
+    {(processo, dia): status do último registro do processo no dia}. O dia pode
+    estar num arquivo: só os anos desses dias são anexados, em trechos de até
+    ANEXADOS_MAX - 1 arquivos (db.trechos), para o LRU não desanexar um deles no meio da consulta.
+    """
+    status = {}
+    if not pares:
+        return status
+    dias = sorted({d for _p, d in pares})
+    for de, ate in db.trechos(dias[0], dias[-1]):
+        do_trecho = [d for d in dias if de <= d <= ate]
+        if not do_trecho:
+            continue
+        processos = sorted({p for p, d in pares if de <= d <= ate})
+        sql = f"""SELECT p.processo, p.data, p.status FROM {tabela(db, "processos", de, ate)} p
+                  WHERE p.data IN ({",".join("?" * len(do_trecho))})
+                    AND p.processo IN ({",".join("?" * len(processos))})
+                  ORDER BY p.id"""
+        db.anexar(conn, sql)
+        for proc, d, st in conn.execute(sql, (*do_trecho, *processos)):
+            status[(proc, d)] = st  # ORDER BY id: fica o último do dia
+    return status
+
+
+def agrupamento_padrao(inicio, fim):
+    dias = (date.fromisoformat(fim) - date.fromisoformat(inicio)).days + 1
+    return "semana" if dias <= SEMANAS_MAX * 7 else "mes"
+
+
+def relatorio(db, inicio, fim, agrupar=None):
+    """Tudo num dicionário (JSON para bots e dashboards)."""
+    agrupar = agrupar or agrupamento_padrao(inicio, fim)
+    c = ciclo(db, inicio, fim)
+    return {
+        "inicio": inicio, "fim": fim, "agrupar": agrupar,
+        "por_responsavel": [dict(zip(("periodo", "responsavel", "n", "variacao", "acumulado"), r))
+                            for r in por_responsavel(db, inicio, fim, agrupar)],
+        "status": [dict(zip(("periodo", "status", "n", "pct"), r))
+                   for r in status_no_tempo(db, inicio, fim, agrupar)],
+        "top_clientes": [dict(zip(("posicao", "cliente", "n", "pct"), r))
+                         for r in top_clientes(db, inicio, fim)],
+        "ciclo": {
+            "total": c.total, "media": c.media, "mediana": c.mediana, "p90": c.p90,
+            "maximo": c.maximo, "mesmo_dia": c.mesmo_dia,
+            "mais_longos": [dict(zip(("processo", "primeira", "ultima", "dias", "corridos", "status"), r))
+                            for r in c.mais_longos],
+        },
+    }
+
+
+def _rotulo(periodo, agrupar):
+    if agrupar == "mes":
+        return f"{periodo[5:7]}/{periodo[:4]}"
+    return f"sem. {br_data(periodo)}"
+
+
+def relatorio_texto(db, inicio, fim, agrupar=None):
+    agrupar = agrupar or agrupamento_padrao(inicio, fim)
+    linhas = [f"Relatório {br_data(inicio)} a {br_data(fim)} — Suporte (SIMUS)", ""]
+
+    linhas.append("Processos por responsável" + (" (por semana):" if agrupar == "semana" else " (por mês):"))
+    atual = None
+    for periodo, resp, n, variacao, acumulado in por_responsavel(db, inicio, fim, agrupar):
+        if periodo != atual:
+            atual = periodo
+            linhas.append(f"  {_rotulo(periodo, agrupar)}")
+        sinal = f"{variacao:+d}" if variacao else "="
+        linhas.append(f"    • {resp or '(sem responsável)'}: {n} ({sinal}; acumulado {acumulado})")
+    linhas.append("")
+
+    linhas.append("Status no período:")
+    atual = None
+    for periodo, st, n, pct in status_no_tempo(db, inicio, fim, agrupar):
+        if periodo != atual:
+            atual = periodo
+            linhas.append(f"  {_rotulo(periodo, agrupar)}")
+        linhas.append(f"    • {st}: {n} ({pct:.1f}%)")
+    linhas.append("")
+
+    linhas.append(f"Top {TOP} clientes:")
+    for pos, cli, n, pct in top_clientes(db, inicio, fim):
+        linhas.append(f"  {pos}. {cli}: {n} ({pct:.1f}%)")
+    linhas.append("")
+
+    c = ciclo(db, inicio, fim)
+    linhas.append("Tempo em aberto (processos iniciados no período, em dias corridos):")
+    if not c.total:
+        linhas.append("  (nenhum processo)")
+    else:
+        linhas.append(f"  {c.total} processo(s): média {c.media:.1f}, mediana {c.mediana}, "
+                      f"p90 {c.p90}, máximo {c.maximo}; {c.mesmo_dia} resolvido(s) no mesmo dia")
+        for proc, primeira, ultima, dias, corridos, st in c.mais_longos:
+            if corridos <= 1:
+                break
+            linhas.append(f"   - #{proc}: {br_data(primeira)} a {br_data(ultima)} — {corridos} dia(s), "
+                          f"visto em {dias} | {st or '?'}")
+    return "\n".join(linhas).rstrip()
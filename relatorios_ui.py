@@ -0,0 +1,72 @@
+# Janela de relatórios: período, agrupamento e o texto de relatorios.relatorio_texto
+# As consultas leem só as tabelas de totais, então rodam direto na thread da UI.
+from datetime import date
+from tkinter import messagebox
+
+import customtkinter as ctk
+
+from datas import br_data, interpretar_data
+
+AGRUPAR = {"Automático": None, "Semana": "semana", "Mês": "mes"}
+
+
+class JanelaRelatorios(ctk.CTkToplevel):
+    def __init__(self, master, backend, data_br):
+        super().__init__(master)
+        self.backend = backend
+        self.title("Relatórios")
+        self.geometry("820x560")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        topo = ctk.CTkFrame(self, fg_color="transparent")
+        topo.grid(row=0, column=0, sticky="ew", padx=12, pady=(12, 6))
+        ctk.CTkLabel(topo, text="De:").grid(row=0, column=0, padx=(0, 6))
+        self.e_inicio = ctk.CTkEntry(topo, width=110)
+        self.e_inicio.grid(row=0, column=1, padx=6)
+        try:
+            ano = interpretar_data(data_br)[:4]
+        except ValueError:
+            ano = str(date.today().year)
+        self.e_inicio.insert(0, f"01/01/{ano}")
+        ctk.CTkLabel(topo, text="Até:").grid(row=0, column=2, padx=6)
+        self.e_fim = ctk.CTkEntry(topo, width=110)
+        self.e_fim.grid(row=0, column=3, padx=6)
+        self.e_fim.insert(0, data_br)
+        ctk.CTkLabel(topo, text="Agrupar:").grid(row=0, column=4, padx=(12, 6))
+        self.combo_agrupar = ctk.CTkComboBox(topo, values=list(AGRUPAR), width=130)
+        self.combo_agrupar.grid(row=0, column=5, padx=6)
+        self.combo_agrupar.set("Automático")
+        ctk.CTkButton(topo, text="Gerar", width=90, command=self._gerar).grid(row=0, column=6, padx=6)
+        ctk.CTkButton(topo, text="Copiar", width=90, command=self._copiar).grid(row=0, column=7, padx=6)
+
+        self.txt = ctk.CTkTextbox(self, wrap="none", font=ctk.CTkFont(family="Consolas", size=12))
+        self.txt.grid(row=1, column=0, sticky="nsew", padx=12, pady=(6, 12))
+        self._gerar()
+
+    def _gerar(self):
+        try:
+            inicio = interpretar_data(self.e_inicio.get())
+            fim = interpretar_data(self.e_fim.get())
+        except ValueError:
+            messagebox.showerror("Data inválida", "Use DD/MM/AAAA, DD/MM, hoje ou ontem.", parent=self)
+            return
+        if fim < inicio:
+            inicio, fim = fim, inicio
+        for entry, d in ((self.e_inicio, inicio), (self.e_fim, fim)):
+            entry.delete(0, "end")
+            entry.insert(0, br_data(d))
+        try:
+            texto = self.backend.relatorio_texto(inicio, fim, AGRUPAR[self.combo_agrupar.get()])
+        except Exception as e:
+            messagebox.showerror("Erro no relatório", str(e), parent=self)
+            return
+        self.txt.configure(state="normal")
+        self.txt.delete("1.0", "end")
+        self.txt.insert("1.0", texto)
+        self.txt.configure(state="disabled")
+
+    def _copiar(self):
+        self.clipboard_clear()
+        self.clipboard_append(self.txt.get("1.0", "end").rstrip())
+        messagebox.showinfo("Copiado", "Relatório copiado para a área de transferência.", parent=self)
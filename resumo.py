@@ -0,0 +1,167 @@
+# Texto do resumo da reunião das 08:30 (sem dependência da interface)
+# Cada dia é lido com uma única consulta e guardado em cache junto com um
+# agregado compacto (contagens por status e por responsável). O cache de um dia
+# é descartado quando db.versao(dia) muda, isto é, quando alguém escreve nele.
+# Dias arquivados são lidos do arquivo do ano (processos.tabela).
+import weakref
+from collections import Counter, OrderedDict
+from datetime import date, timedelta
+
+from datas import br_data
+from processos import STATUS_OPCOES, tabela
+
+CACHE_DIAS = 400  # dias mantidos em memória por banco (cerca de um ano)
+
+
+class Agregado:
+    """Contagens de um dia (ou período): total, por status e por responsável."""
+    __slots__ = ("total", "por_status", "por_responsavel")
+
+    def __init__(self):
+        self.total = 0
+        self.por_status = Counter()
+        self.por_responsavel = Counter()
+
+    def somar(self, status, responsavel, n=1):
+        self.total += n
+        self.por_status[status] += n
+        self.por_responsavel[responsavel or "(sem responsável)"] += n
+
+    def __iadd__(self, outro):
+        self.total += outro.total
+        self.por_status.update(outro.por_status)
+        self.por_responsavel.update(outro.por_responsavel)
+        return self
+
+
+class _CacheDias:
+    def __init__(self, maximo=CACHE_DIAS):
+        self.maximo = maximo
+        self._dias = OrderedDict()  # data -> [versao, agregado, linhas por status | None]
+
+    def obter(self, versao, data):
+        item = self._dias.get(data)
+        if item is None or item[0] != versao:
+            return None
+        self._dias.move_to_end(data)
+        return item
+
+    def guardar(self, versao, data, agregado, linhas=None):
+        self._dias[data] = [versao, agregado, linhas]
+        self._dias.move_to_end(data)
+        while len(self._dias) > self.maximo:
+            self._dias.popitem(last=False)
+
+
+_caches = weakref.WeakKeyDictionary()
+
+
+def _cache(db):
+    cache = _caches.get(db)
+    if cache is None:
+        cache = _caches[db] = _CacheDias()
+    return cache
+
+
+def dia(db, data_iso):
+    """Retorna (agregado, {status: [(processo, titulo, cliente, responsavel), ...]}) do dia."""
+    cache = _cache(db)
+    versao = db.versao(data_iso)
+    item = cache.obter(versao, data_iso)
+    if item is not None and item[2] is not None:
+        return item[1], item[2]
+
+    agregado = Agregado()
+    linhas = {}
+    for st, proc, tit, cli, resp in db.execute(
+            f"""SELECT status, processo, titulo, cliente, responsavel
+               FROM {tabela(db, "processos", data_iso)} WHERE data=?
+               ORDER BY status, id DESC""", (data_iso,)):
+        linhas.setdefault(st, []).append((proc, tit, cli, resp))
+        agregado.somar(st, resp)
+    cache.guardar(versao, data_iso, agregado, linhas)
+    return agregado, linhas
+
+
+def agregados(db, inicio, fim):
+    """
+    Agregado de cada dia do intervalo (datas ISO, inclusive), na ordem.
+    Dias fora do cache são lidos juntos numa única consulta GROUP BY.
+    """
+    cache = _cache(db)
+    d0 = date.fromisoformat(inicio)
+    dias = [(d0 + timedelta(days=i)).isoformat()
+            for i in range((date.fromisoformat(fim) - d0).days + 1)]
+    versoes = {d: db.versao(d) for d in dias}
+    resultado = {}
+    faltando = []
+    for d in dias:
+        item = cache.obter(versoes[d], d)
+        if item is None:
+            faltando.append(d)
+        else:
+            resultado[d] = item[1]
+
+    if faltando:
+        novos = {d: Agregado() for d in faltando}
+        for de, ate in db.trechos(faltando[0], faltando[-1]):
+            for d, st, resp, n in db.execute(
+                    f"""SELECT data, status, responsavel, count(*)
+                       FROM {tabela(db, "processos", de, ate)} WHERE data BETWEEN ? AND ?
+                       GROUP BY data, status, responsavel""", (de, ate)):
+                if d in novos:
+                    novos[d].somar(st, resp, n)
+        for d, ag in novos.items():
+            cache.guardar(versoes[d], d, ag)
+            resultado[d] = ag
+    return [(d, resultado[d]) for d in dias]
+
+
+def resumo_texto(db, data_iso):
+    agregado, por_status = dia(db, data_iso)
+    resumo = [(st, por_status.get(st, [])) for st in STATUS_OPCOES]
+    total = sum(len(rows) for _st, rows in resumo)
+
+    data_br = br_data(data_iso)
+    linhas = [f"Resumo {data_br} — Reunião 08:30 (SIMUS)"]
+    linhas.append(f"Total de processos: {total}")
+    linhas.append("")
+    for st, rows in resumo:
+        linhas.append(f"• {st}: {len(rows)}")
+        for (proc, tit, cli, resp) in rows:
+            tag_cli = f" | Cliente: {cli}" if cli else ""
+            tag_resp = f" | Resp.: {resp}" if resp else ""
+            linhas.append(f"   - #{proc} — {tit}{tag_cli}{tag_resp}")
+        linhas.append("")
+    return "\n".join(linhas).rstrip()
+
+
+def semana(data_iso):
+    """(segunda, domingo) da semana que contém a data."""
+    d = date.fromisoformat(data_iso)
+    seg = d - timedelta(days=d.weekday())
+    return seg.isoformat(), (seg + timedelta(days=6)).isoformat()
+
+
+def resumo_periodo_texto(db, inicio, fim):
+    dias = agregados(db, inicio, fim)
+    total = Agregado()
+    for _d, ag in dias:
+        total += ag
+
+    linhas = [f"Resumo {br_data(inicio)} a {br_data(fim)} — Reunião 08:30 (SIMUS)"]
+    linhas.append(f"Total de processos: {total.total}")
+    linhas.append("")
+    linhas.append("Por status:")
+    for st in STATUS_OPCOES:
+        linhas.append(f"• {st}: {total.por_status.get(st, 0)}")
+    linhas.append("")
+    linhas.append("Por responsável:")
+    for resp, n in sorted(total.por_responsavel.items(), key=lambda kv: (-kv[1], kv[0])):
+        linhas.append(f"• {resp}: {n}")
+    linhas.append("")
+    linhas.append("Por dia:")
+    for d, ag in dias:
+        if ag.total:
+            linhas.append(f"• {br_data(d)}: {ag.total}")
+    return "\n".join(linhas).rstrip()
@@ -0,0 +1,529 @@
+# Modo servidor: HTTP/JSON local servindo o mesmo banco para o app, dashboards e bots
+# Só biblioteca padrão (http.server). Cada conexão tem a sua thread (esperar a próxima
+# requisição de um keep-alive não custa nada), mas só THREADS requisições rodam ao
+# mesmo tempo; leituras usam conexões do pool do Database, e todas as escritas passam por uma
+# única thread (Escritor), que junta o que chegou na fila numa só transação —
+# cada operação num SAVEPOINT próprio, então uma falha não derruba as outras.
+#
+#   python dailycheck.py serve --porta 8765
+#
+# Rotas (datas aceitam DD/MM/AAAA ou AAAA-MM-DD; corpo e respostas em JSON):
+#   GET  /processos?data=&status=&busca=[&ids=1,2]  lista do dia (ETag / If-None-Match)
+#   GET  /processos/<id>                             um registro (com observações)
+#   POST /processos                                  inclui {data, processo, titulo, ...}
+#   PUT  /processos/<id>                             altera; com "versao", 409 se mudou
+#   POST /processos/excluir   {ids, versoes?}        POST /processos/status {ids, status}
+#   POST /processos/duplicar  {origem, destino}      POST /importar (corpo CSV)
+#   GET  /resumo?data=[&fim=|&semana=1]              texto do resumo
+#   GET  /relatorio?inicio=&fim=[&agrupar=semana|mes][&formato=texto]  relatórios (JSON ou texto)
+#   GET  /contar, /export?inicio=&fim=&status=&busca=&formato=csv|jsonl  (export em streaming)
+#   GET  /alteracoes?desde=<seq>                     feed de alterações
+#   GET  /metricas[?formato=json]                    latências (Prometheus ou JSON, instrumentacao.py)
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import processos
+from alteracoes import ler_desde
+from datas import interpretar_data
+from db import DB_FILE, Database, init_db
+from instrumentacao import METRICAS, medir
+
+HOST = "127.0.0.1"
+PORTA = 8765
+THREADS = 8
+LOTE_ESCRITAS = 200     # operações por transação do Escritor
+BLOCO_EXPORT = 64 * 1024  # bytes por chunk no streaming
+
+# ordem de processos.COLUNAS_LISTA; o texto das observações só vem em GET /processos/<id>
+COLUNAS = ("id", "data", "processo", "titulo", "cliente", "responsavel", "status", "tem_obs", "versao")
+
+log = logging.getLogger("dailycheck.servidor")
+
+
+class ErroRequisicao(Exception):
+    def __init__(self, mensagem, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(mensagem)
+        self.status = status
+
+
+# ---------------- Escritor ----------------
+class Escritor(threading.Thread):
+    """
+    Dona da conexão principal do Database. executar(fn) enfileira fn(db) e espera
+    o resultado; o que estiver na fila é gravado junto numa única transação.
+    sozinha=True roda fora do lote (ex.: importação, que usa carga_em_massa).
+    """
+
+    def __init__(self, path=DB_FILE, pool_size=THREADS, lote=LOTE_ESCRITAS):
+        super().__init__(name="escritor", daemon=True)
+        self.path = path
+        self.pool_size = pool_size
+        self.lote = lote
+        self.db = None
+        self._fila = queue.Queue()
+        self._pronto = threading.Event()
+        self._erro = None
+
+    def iniciar(self):
+        self.start()
+        self._pronto.wait()
+        if self._erro is not None:
+            raise self._erro
+        return self.db
+
+    def executar(self, fn, sozinha=False):
+        futuro = Future()
+        self._fila.put((fn, futuro, sozinha))
+        return futuro.result()
+
+    def parar(self):
+        self._fila.put(None)
+        self.join()
+
+    def run(self):
+        try:
+            self.db = Database(self.path, pool_size=self.pool_size)
+            init_db(self.db)
+        except Exception as e:
+            self._erro = e
+            self._pronto.set()
+            return
+        self._pronto.set()
+        pendente = None
+        try:
+            while True:
+                tarefa = pendente or self._fila.get()
+                pendente = None
+                if tarefa is None:
+                    break
+                if tarefa[2]:
+                    self._rodar([tarefa], transacao=False)
+                    continue
+                tarefas = [tarefa]
+                while len(tarefas) < self.lote:
+                    try:
+                        t = self._fila.get_nowait()
+                    except queue.Empty:
+                        break
+                    if t is None or t[2]:
+                        pendente = t
+                        break
+                    tarefas.append(t)
+                self._rodar(tarefas)
+        finally:
+            self.db.close()
+
+    def _rodar(self, tarefas, transacao=True):
+        prontas = []
+        try:
+            if transacao:
+                with self.db.transaction():
+                    for fn, futuro, _s in tarefas:
+                        prontas.append((futuro, *self._chamar(fn)))
+            else:
+                for fn, futuro, _s in tarefas:
+                    prontas.append((futuro, *self._chamar(fn, savepoint=False)))
+        except Exception as e:  # falha no COMMIT: ninguém do lote foi gravado
+            for _fn, futuro, _s in tarefas:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+        # Só responde depois do COMMIT, para o cliente já enxergar o que gravou
+        for futuro, ok, valor in prontas:
+            if ok:
+                futuro.set_result(valor)
+            else:
+                futuro.set_exception(valor)
+
+    def _chamar(self, fn, savepoint=True):
+        try:
+            if not savepoint:
+                return True, fn(self.db)  # a própria operação abre a transação
+            # SAVEPOINT próprio: um erro desfaz só esta operação
+            with self.db.transaction():
+                return True, fn(self.db)
+        except Exception as e:
+            return False, e
+
+
+# ---------------- HTTP ----------------
+class _Chunked:
+    """Objeto de texto para exportacao.exportar_*: agrupa o texto e envia em chunks HTTP."""
+
+    def __init__(self, wfile, bloco=BLOCO_EXPORT):
+        self.wfile = wfile
+        self.bloco = bloco
+        self._buf = []
+        self._tam = 0
+
+    def write(self, texto):
+        self._buf.append(texto)
+        self._tam += len(texto)
+        if self._tam >= self.bloco:
+            self.flush()
+
+    def writelines(self, textos):
+        for t in textos:
+            self.write(t)
+
+    def flush(self):
+        if not self._buf:
+            return
+        dados = "".join(self._buf).encode("utf-8")
+        self._buf, self._tam = [], 0
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(dados), dados))
+
+    def fechar(self):
+        self.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive e Transfer-Encoding: chunked
+    server_version = "DailyCheck"
+    timeout = 30  # conexão ociosa é fechada (e a thread dela termina)
+
+    @property
+    def escritor(self):
+        return self.server.escritor
+
+    @property
+    def db(self):
+        return self.server.escritor.db
+
+    def setup(self):
+        super().setup()
+        # Cabeçalho e corpo saem em writes separados: sem isso o Nagle segura o corpo
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, fmt, *args):
+        log.debug("%s - %s", self.address_string(), fmt % args)
+
+    # ---------------- Despacho ----------------
+    def do_GET(self):
+        self._despachar("GET")
+
+    def do_POST(self):
+        self._despachar("POST")
+
+    def do_PUT(self):
+        self._despachar("PUT")
+
+    def _despachar(self, metodo):
+        url = urlsplit(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self._lido = False
+        try:
+            rota = ROTAS.get((metodo, partes[0] if partes else "", len(partes)))
+            if rota is None:
+                raise ErroRequisicao("rota desconhecida", HTTPStatus.NOT_FOUND)
+            # A vaga é por requisição, não por conexão: um app que consulta /alteracoes
+            # a cada 2 s com keep-alive não prende ninguém entre uma consulta e outra
+            with self.server.vagas, medir(f"{metodo} /{partes[0] if partes else ''}"):
+                rota(self, *partes[1:])
+        except ErroRequisicao as e:
+            self._json({"erro": str(e)}, e.status)
+        except processos.ConflitoEdicao as e:
+            self._json({"erro": str(e), "atual": _linha(e.atual)}, HTTPStatus.CONFLICT)
+        except (ValueError, KeyError, TypeError) as e:
+            self._json({"erro": f"requisição inválida: {e}"}, HTTPStatus.BAD_REQUEST)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            log.exception("erro em %s %s", metodo, self.path)
+            self._json({"erro": str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        if not self._lido and self.headers.get("Content-Length", "0") != "0":
+            self.close_connection = True  # corpo não consumido: não dá para reaproveitar a conexão
+
+    # ---------------- Entrada / saída ----------------
+    def _corpo(self):
+        self._lido = True
+        n = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(n) if n else b""
+
+    def _corpo_json(self):
+        try:
+            corpo = json.loads(self._corpo() or b"{}")
+        except json.JSONDecodeError as e:
+            raise ErroRequisicao(f"JSON inválido: {e}")
+        if not isinstance(corpo, dict):
+            raise ErroRequisicao("o corpo deve ser um objeto JSON")
+        return corpo
+
+    def _enviar(self, status, dados, tipo, extra=()):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        for k, v in extra:
+            self.send_header(k, v)
+        self.end_headers()
+        if dados:
+            self.wfile.write(dados)
+
+    def _json(self, obj, status=HTTPStatus.OK, extra=()):
+        dados = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self._enviar(status, dados, "application/json; charset=utf-8", extra)
+
+    def _texto(self, texto):
+        self._enviar(HTTPStatus.OK, texto.encode("utf-8"), "text/plain; charset=utf-8")
+
+    def _data(self, nome, obrigatoria=True):
+        valor = self.query.get(nome)
+        if not valor:
+            if obrigatoria:
+                raise ErroRequisicao(f"parâmetro '{nome}' obrigatório")
+            return None
+        return interpretar_data(valor)
+
+    def _filtros(self):
+        status = self.query.get("status") or None
+        if status is not None and status not in processos.STATUS_OPCOES:
+            raise ErroRequisicao(f"status desconhecido {status!r}")
+        return status, self.query.get("busca", "").strip() or None
+
+    # ---------------- Rotas ----------------
+    def listar(self):
+        data = self._data("data")
+        status, busca = self._filtros()
+        ids = self.query.get("ids")
+        ids = [int(i) for i in ids.split(",") if i] if ids is not None else None
+        passo = processos.LIMITE_VARIAVEIS
+        lotes = [None] if ids is None else [ids[i:i + passo] for i in range(0, len(ids), passo)]
+        consultas = [processos.consulta(self.db, processos.COLUNAS_LISTA, data, status, busca, ids=lote)
+                     for lote in lotes]
+        with self.db.conectar() as conn:
+            self.db.anexar(conn, consultas[0][0])  # dia arquivado: ATTACH antes do BEGIN
+            # Etag e linhas lidos no mesmo snapshot (transação de leitura)
+            conn.execute("BEGIN")
+            try:
+                seq = conn.execute("SELECT coalesce(max(seq), 0) FROM alteracoes").fetchone()[0]
+                etag = '"%s"' % hashlib.sha1(
+                    f"{seq}|{data}|{status}|{busca}|{ids}".encode("utf-8")).hexdigest()[:20]
+                if etag in (self.headers.get("If-None-Match") or ""):
+                    self._enviar(HTTPStatus.NOT_MODIFIED, b"", "application/json", [("ETag", etag)])
+                    return
+                linhas = []
+                for sql, params in consultas:
+                    linhas += conn.execute(sql, params).fetchall()
+            finally:
+                conn.execute("COMMIT")
+        self._json({"colunas": COLUNAS, "linhas": linhas}, extra=[("ETag", etag)])
+
+    def obter(self, _id):
+        row = processos.obter(self.db, int(_id))
+        if row is None:
+            raise ErroRequisicao("registro não encontrado", HTTPStatus.NOT_FOUND)
+        self._json({**_linha(row[:-1]), "observacoes": row[-1]})
+
+    def incluir(self):
+        reg = _registro(self._corpo_json())
+        _id = self.escritor.executar(lambda db: processos.inserir(db, reg))
+        self._json({"id": _id}, HTTPStatus.CREATED)
+
+    def alterar(self, _id):
+        corpo = self._corpo_json()
+        reg, versao = _registro(corpo), corpo.get("versao")
+        n = self.escritor.executar(lambda db: processos.atualizar(db, reg, int(_id), versao))
+        if not n:
+            raise ErroRequisicao("registro não encontrado", HTTPStatus.NOT_FOUND)
+        self._json({"alterados": n})
+
+    def excluir(self):
+        corpo = self._corpo_json()
+        ids = [int(i) for i in corpo["ids"]]
+        versoes = corpo.get("versoes")
+        if versoes is not None:
+            versoes = {int(k): v for k, v in versoes.items()}
+        n = self.escritor.executar(lambda db: processos.excluir(db, ids, versoes))
+        self._json({"excluidos": n})
+
+    def mover_status(self):
+        corpo = self._corpo_json()
+        ids, status = [int(i) for i in corpo["ids"]], corpo["status"]
+        if status not in processos.STATUS_OPCOES:
+            raise ErroRequisicao(f"status desconhecido {status!r}")
+        n = self.escritor.executar(lambda db: processos.mover_status(db, ids, status))
+        self._json({"alterados": n})
+
+    def duplicar(self):
+        corpo = self._corpo_json()
+        origem, destino = interpretar_data(corpo["origem"]), interpretar_data(corpo["destino"])
+        # Origem arquivada precisa de ATTACH, que não roda dentro do lote de escritas
+        n = self.escritor.executar(lambda db: processos.duplicar_dia(db, origem, destino),
+                                   sozinha=self.db.arquivado(origem))
+        self._json({"duplicados": n})
+
+    def importar(self):
+        import importacao
+        texto = self._corpo().decode("utf-8-sig")
+        relatorio = self.escritor.executar(
+            lambda db: importacao.importar_csv(db, io.StringIO(texto, newline="")), sozinha=True)
+        self._json({"lidas": relatorio.lidas, "inseridas": relatorio.inseridas,
+                    "invalidas": relatorio.invalidas, "erros": relatorio.erros,
+                    "texto": relatorio.texto()})
+
+    def resumo(self):
+        import resumo
+        data = self._data("data")
+        fim = self._data("fim", obrigatoria=False)
+        # resumo usa db.versao (conexão principal): roda na thread do Escritor,
+        # fora do lote quando lê dias arquivados (ATTACH não roda dentro de transação)
+        inicio, fim = resumo.semana(data) if self.query.get("semana") else (data, fim)
+        sozinha = self.db.arquivado(inicio)  # a semana pode começar num dia arquivado antes de `data`
+        if fim:
+            texto = self.escritor.executar(lambda db: resumo.resumo_periodo_texto(db, inicio, fim), sozinha)
+        else:
+            texto = self.escritor.executar(lambda db: resumo.resumo_texto(db, data), sozinha)
+        self._texto(texto)
+
+    def relatorio(self):
+        import relatorios
+        inicio, fim = self._data("inicio"), self._data("fim")
+        agrupar = self.query.get("agrupar") or None
+        if agrupar not in (None, *relatorios.AGRUPAMENTOS):
+            raise ErroRequisicao(f"agrupar deve ser um de: {', '.join(relatorios.AGRUPAMENTOS)}")
+        if self.query.get("formato") == "texto":
+            self._texto(relatorios.relatorio_texto(self.db, inicio, fim, agrupar))
+        else:
+            self._json(relatorios.relatorio(self.db, inicio, fim, agrupar))
+
+    def contar(self):
+        import exportacao
+        inicio = self._data("inicio")
+        fim = self._data("fim", obrigatoria=False) or inicio
+        status, busca = self._filtros()
+        self._json({"total": exportacao.contar(self.db, inicio, fim, status, busca)})
+
+    def exportar(self):
+        import exportacao
+        inicio = self._data("inicio")
+        fim = self._data("fim", obrigatoria=False) or inicio
+        status, busca = self._filtros()
+        formato = self.query.get("formato", "csv")
+        escrever = {"csv": exportacao.exportar_csv, "jsonl": exportacao.exportar_jsonl}.get(formato)
+        if escrever is None:
+            raise ErroRequisicao("formato deve ser csv ou jsonl")
+        tipo = "text/csv" if formato == "csv" else "application/x-ndjson"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+        self.send_header("Content-Disposition", f'attachment; filename="reuniao_{inicio}_a_{fim}.{formato}"')
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        saida = _Chunked(self.wfile)
+        try:
+            escrever(self.db, saida, inicio, fim, status, busca)
+            saida.fechar()
+        except Exception:
+            # Cabeçalho já enviado: só resta encerrar a conexão sem o chunk final
+            self.close_connection = True
+            log.exception("exportação interrompida")
+
+    def alteracoes(self):
+        desde = int(self.query.get("desde", -1))
+        with self.db.conectar() as conn:
+            # Os clientes consultam isto sem parar: é aqui que o servidor percebe um
+            # `dailycheck.py arquivar` rodado em outro processo
+            self.db.ler_arquivos(conn)
+            arquivado_ate = self.db.arquivado_ate
+            if desde < 0:
+                ultimo = conn.execute("SELECT coalesce(max(seq), 0) FROM alteracoes").fetchone()[0]
+                self._json({"ultimo": ultimo, "primeiro": None, "linhas": [], "arquivado_ate": arquivado_ate})
+                return
+            primeiro, linhas = ler_desde(conn, desde)
+        self._json({"ultimo": linhas[-1][0] if linhas else desde, "primeiro": primeiro, "linhas": linhas,
+                    "arquivado_ate": arquivado_ate})
+
+    def metricas(self):
+        if self.query.get("formato") == "json":
+            dados = METRICAS.como_dict()
+            dados["banco"] = {"caminho": os.path.abspath(self.db.path), "journal_mode": self.db.journal_mode_ativo}
+            self._json(dados)
+        else:
+            self._enviar(HTTPStatus.OK, METRICAS.prometheus().encode("utf-8"),
+                         "text/plain; version=0.0.4; charset=utf-8")
+
+
+ROTAS = {
+    ("GET", "processos", 1): Handler.listar,
+    ("GET", "processos", 2): Handler.obter,
+    ("POST", "processos", 1): Handler.incluir,
+    ("PUT", "processos", 2): Handler.alterar,
+    ("POST", "processos", 2): lambda h, acao: {
+        "excluir": Handler.excluir, "status": Handler.mover_status, "duplicar": Handler.duplicar,
+    }.get(acao, _rota_desconhecida)(h),
+    ("POST", "importar", 1): Handler.importar,
+    ("GET", "resumo", 1): Handler.resumo,
+    ("GET", "relatorio", 1): Handler.relatorio,
+    ("GET", "contar", 1): Handler.contar,
+    ("GET", "export", 1): Handler.exportar,
+    ("GET", "alteracoes", 1): Handler.alteracoes,
+    ("GET", "metricas", 1): Handler.metricas,
+}
+
+
+def _rota_desconhecida(_h):
+    raise ErroRequisicao("rota desconhecida", HTTPStatus.NOT_FOUND)
+
+
+def _registro(corpo):
+    """Corpo JSON -> tupla na ordem de processos.INSERT_SQL, validando como o formulário."""
+    processo = str(corpo.get("processo") or "").strip()
+    titulo = str(corpo.get("titulo") or "").strip()
+    if not processo or not titulo:
+        raise ErroRequisicao("'processo' e 'titulo' são obrigatórios")
+    status = corpo.get("status") or processos.STATUS_OPCOES[0]
+    if status not in processos.STATUS_OPCOES:
+        raise ErroRequisicao(f"status desconhecido {status!r}")
+    data = interpretar_data(corpo["data"]) if corpo.get("data") else interpretar_data("hoje")
+    return (data, processo, titulo, corpo.get("cliente") or None, corpo.get("responsavel") or None,
+            status, corpo.get("observacoes") or None)
+
+
+def _linha(row):
+    return dict(zip(COLUNAS, row)) if row is not None else None
+
+
+class Servidor(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer (uma thread por conexão) que limita a `threads` as
+    requisições em andamento, o tamanho do pool de conexões do Database.
+    """
+
+    def __init__(self, endereco, escritor, threads=THREADS):
+        self.escritor = escritor
+        self.vagas = threading.BoundedSemaphore(threads)
+        super().__init__(endereco, Handler)
+
+
+def criar(path=DB_FILE, host=HOST, porta=PORTA, threads=THREADS):
+    """Abre o banco (na thread do Escritor) e cria o servidor, ainda sem atender."""
+    escritor = Escritor(path, pool_size=threads)
+    escritor.iniciar()
+    return Servidor((host, porta), escritor, threads)
+
+
+def servir(path=DB_FILE, host=HOST, porta=PORTA, threads=THREADS):
+    import backup
+    servidor = criar(path, host, porta, threads)
+    backups = backup.BackupDiario(path)
+    backups.start()
+    log.info("servindo %s em http://%s:%d", path, host, servidor.server_address[1])
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backups.parar()
+        servidor.server_close()
+        servidor.escritor.parar()
@@ -0,0 +1,134 @@
+# Modelo de tabela virtualizada para o ttk.Treeview
+# Lê a fonte em páginas (fetchmany: processos.ListaPaginada ou LinhasEmMemoria)
+# e só cria itens do Treeview à medida que o usuário rola até perto do fim do que
+# já foi materializado.
+
+PAGINA = 200
+# Fração da barra de rolagem a partir da qual a próxima página é carregada
+LIMIAR_ROLAGEM = 0.9
+
+
+class TabelaVirtual:
+    def __init__(self, tree, scrollbar, formatar, pagina=PAGINA):
+        """
+        tree: ttk.Treeview; scrollbar: barra vertical ligada ao tree
+        formatar: row -> (iid, values) para cada linha vinda do cursor
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.formatar = formatar
+        self.pagina = pagina
+        self._fonte = None
+        self._agendado = None
+        # Modelo: iid -> linha como veio do banco, para tudo o que está na tela.
+        # Inclusões, edições e exclusões chegam como deltas (atualizar_linhas/remover)
+        # e mexem só nos itens afetados; carregar() é para quando os filtros mudam.
+        self.linhas = {}
+        # Linhas já atualizadas/removidas por delta que o cursor (leitura anterior)
+        # ainda pode trazer: prevalece a versão mais nova.
+        self._novas = {}
+        self._removidas = set()
+        tree.configure(yscrollcommand=self._ao_rolar)
+
+    @property
+    def completa(self):
+        return self._fonte is None
+
+    def linha(self, iid):
+        return self.linhas.get(str(iid))
+
+    def limpar(self):
+        self._fechar_fonte()
+        self.linhas.clear()
+        self._novas.clear()
+        self._removidas.clear()
+        filhos = self.tree.get_children()
+        if filhos:
+            self.tree.delete(*filhos)
+
+    def carregar(self, fonte):
+        """fonte: objeto com fetchmany(n) (processos.ListaPaginada). Substitui o conteúdo atual."""
+        self.limpar()
+        self._fonte = fonte
+        self.carregar_mais()
+
+    def carregar_mais(self):
+        self._agendado = None
+        if self._fonte is None:
+            return 0
+        rows = self._fonte.fetchmany(self.pagina)
+        if len(rows) < self.pagina:
+            self._fechar_fonte()
+        insert = self.tree.insert
+        linhas = self.linhas
+        for row in rows:
+            iid, values = self.formatar(row)
+            if iid in linhas:
+                continue  # já entrou por delta (ou a página por OFFSET se deslocou)
+            if self._novas or self._removidas:
+                if iid in self._removidas:
+                    continue
+                if iid in self._novas:
+                    row = self._novas.pop(iid)
+                    iid, values = self.formatar(row)
+            linhas[iid] = row
+            insert("", "end", iid=iid, values=values)
+        return len(rows)
+
+    def atualizar_linhas(self, rows, inicio=True):
+        """
+        Aplica linhas relidas do banco sem recarregar a lista: as que já estão na
+        tela são atualizadas no lugar (seleção e rolagem ficam como estão), as
+        novas entram no topo (inicio=True) ou no fim.
+        """
+        for row in rows:
+            iid, values = self.formatar(row)
+            self._removidas.discard(iid)
+            if iid in self.linhas:
+                self.linhas[iid] = row
+                self.tree.item(iid, values=values)
+            elif self._fonte is not None and not inicio:
+                self._novas[iid] = row  # ainda vai chegar pelo cursor
+            else:
+                self.linhas[iid] = row
+                self.tree.insert("", 0 if inicio else "end", iid=iid, values=values)
+
+    def remover(self, iids):
+        """Tira da tela (e do que ainda falta ler do cursor) as linhas indicadas."""
+        presentes = [i for i in iids if self.linhas.pop(i, None) is not None]
+        if presentes:
+            self.tree.delete(*presentes)
+        if self._fonte is not None:
+            self._removidas.update(iids)
+        for i in iids:
+            self._novas.pop(i, None)
+
+    def carregar_tudo(self):
+        while self._fonte is not None:
+            self.carregar_mais()
+
+    def _fechar_fonte(self):
+        if self._agendado is not None:
+            self.tree.after_cancel(self._agendado)
+            self._agendado = None
+        if self._fonte is not None and hasattr(self._fonte, "close"):
+            self._fonte.close()
+        self._fonte = None
+
+    def _ao_rolar(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._fonte is not None and self._agendado is None and float(last) >= LIMIAR_ROLAGEM:
+            self._agendado = self.tree.after_idle(self.carregar_mais)
+
+
+class LinhasEmMemoria:
+    """Adapta uma lista de linhas já buscadas à interface fetchmany do cursor."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._pos = 0
+
+    def fetchmany(self, n):
+        fatia = self._rows[self._pos:self._pos + n]
+        self._pos += n
+        return fatia
@@ -0,0 +1,23 @@
+# Os módulos do app ficam na raiz do repositório (sem pacote)
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import Database, init_db  # noqa: E402
+from processos import STATUS_OPCOES  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "dailycheck.db"))
+    init_db(db)
+    yield db
+    db.close()
+
+
+def registro(data, processo, status=STATUS_OPCOES[0]):
+    """Registro no formato de processos.inserir."""
+    return (data, processo, "título", None, None, status, None)
@@ -0,0 +1,32 @@
+import sqlite3
+
+import processos
+import resumo
+from alteracoes import FeedAlteracoes
+from conftest import registro
+from tabela import PAGINA
+
+DIA = "2024-05-06"
+
+
+def test_feed_e_resumo_veem_commit_de_outra_conexao_com_lista_aberta(db):
+    processos.inserir_varios(db, [registro(DIA, f"p{i}") for i in range(PAGINA + 100)])
+    feed = FeedAlteracoes(db)
+    assert resumo.dia(db, DIA)[0].total == PAGINA + 100
+
+    # Lista aberta e não rolada até o fim, como na tabela da janela principal
+    lista = processos.listar(db, DIA)
+    assert len(lista.fetchmany(PAGINA)) == PAGINA
+
+    outra = sqlite3.connect(db.path)
+    with outra:
+        novo = outra.execute("INSERT INTO processos (data, processo, titulo, status) VALUES (?, 'x', 't', ?)",
+                             (DIA, processos.STATUS_OPCOES[0])).lastrowid
+    outra.close()
+
+    mud = feed.ler()
+    assert mud is not None and novo in mud.inseridos
+    assert resumo.dia(db, DIA)[0].total == PAGINA + 101
+    # A gravação local também não esbarra num snapshot preso
+    processos.inserir(db, registro(DIA, "y"))
+    assert len(lista.fetchmany(PAGINA)) == 100
@@ -0,0 +1,53 @@
+import threading
+
+import processos
+import servidor
+from backend import BackendRemoto
+from test_importacao import CABECALHO
+
+
+def _servidor(db):
+    db.close()
+    srv = servidor.criar(db.path, host="127.0.0.1", porta=0, threads=4)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def _parar(srv):
+    srv.shutdown()
+    srv.server_close()
+    srv.escritor.parar()
+
+
+def test_fechar_fecha_as_conexoes_de_todas_as_threads(db):
+    srv = _servidor(db)
+    remoto = BackendRemoto(f"127.0.0.1:{srv.server_address[1]}")
+    try:
+        remoto.preparar()
+        threads = [threading.Thread(target=remoto.contar, args=("2024-05-06",)) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        conexoes = list(remoto._conexoes)
+        assert len(conexoes) == 4
+        remoto.fechar()
+        assert all(c.sock is None for c in conexoes) and not remoto._conexoes
+    finally:
+        _parar(srv)
+
+
+def test_importar_csv_envia_o_arquivo_aos_blocos(db, tmp_path):
+    srv = _servidor(db)
+    remoto = BackendRemoto(f"127.0.0.1:{srv.server_address[1]}")
+    csv = tmp_path / "carga.csv"
+    # Maior que um bloco de envio, para o corpo sair em várias partes
+    csv.write_text(CABECALHO + "".join(f"06/05/2024;P{i};Lentidão no PDV;Loja 1;Ana;{processos.STATUS_OPCOES[0]};\n"
+                                       for i in range(3000)), encoding="utf-8")
+    try:
+        relatorio = remoto.importar_csv(str(csv))
+        assert (relatorio.lidas, relatorio.inseridas) == (3000, 3000)
+        assert remoto.contar("2024-05-06") == 3000
+    finally:
+        remoto.fechar()
+        _parar(srv)
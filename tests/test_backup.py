@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import threading
+from datetime import date
+
+import arquivo
+import backup
+import processos
+from conftest import registro
+from processos import tabela
+
+
+def _em_thread(fn, *args):
+    """Roda fn numa thread de fundo (como a janela de backups) e devolve a exceção, se houver."""
+    erro = []
+
+    def rodar():
+        try:
+            fn(*args)
+        except BaseException as e:
+            erro.append(e)
+    t = threading.Thread(target=rodar)
+    t.start()
+    t.join()
+    return erro[0] if erro else None
+
+
+def test_restaurar_em_outra_thread(db):
+    processos.inserir_varios(db, [registro("2024-05-06", f"p{i}") for i in range(10)])
+    snapshot = backup.criar(db.path, dia="2024-05-06", comprimir=False)
+    processos.inserir_varios(db, [registro("2024-05-07", f"q{i}") for i in range(5)])
+    visto = db.execute("SELECT max(seq) FROM alteracoes").fetchone()[0]
+
+    assert _em_thread(backup.restaurar, db, snapshot.caminho) is None
+
+    assert db.execute("SELECT count(*) FROM processos").fetchone()[0] == 10
+    # O aviso de recarga fica acima de tudo o que as janelas abertas já leram
+    assert db.execute("SELECT operacao FROM alteracoes WHERE seq > ?", (visto,)).fetchall() == [("R",)]
+
+
+def test_backup_e_restauracao_levam_os_arquivos(db):
+    processos.inserir_varios(db, [registro("2022-03-01", f"a{i}") for i in range(5)]
+                             + [registro("2022-09-01", f"b{i}") for i in range(3)]
+                             + [registro("2023-03-01", f"c{i}") for i in range(4)])
+    arquivo.arquivar(db, meses=12, hoje=date(2023, 6, 15))  # março de 2022 vai para o arquivo
+    snapshot = backup.criar(db.path, dia="2023-06-15", comprimir=True)
+    assert set(snapshot.arquivos) == {2022}
+
+    # Depois do snapshot o arquivo de 2022 cresce e nasce o de 2023
+    arquivo.arquivar(db, meses=12, hoje=date(2024, 6, 15))
+    assert _em_thread(backup.restaurar, db, snapshot.caminho) is None
+
+    assert set(db.arquivos) == {2022}
+    conn = sqlite3.connect(arquivo.caminho(db.path, 2022))
+    try:
+        assert conn.execute("SELECT count(*) FROM processos").fetchone()[0] == 5
+    finally:
+        conn.close()
+    total = db.execute(f"SELECT count(*) FROM {tabela(db, 'processos', '2022-01-01', '2023-12-31')}"
+                       " WHERE data BETWEEN '2022-01-01' AND '2023-12-31'").fetchone()[0]
+    assert total == 12
+
+    # A retenção apaga o conjunto inteiro do dia
+    backup.criar(db.path, dia="2023-06-16", comprimir=False)
+    removidos = backup.rotacionar(db.path, manter=1)
+    assert [s.dia for s in removidos] == ["2023-06-15"]
+    assert not any(os.path.exists(c) for c in snapshot.arquivos.values())
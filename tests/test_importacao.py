@@ -0,0 +1,60 @@
+import io
+
+import importacao
+import processos
+from conftest import registro
+from db import CORRIDOS_SQL, OBS_GRANDE, TOTAIS
+
+CABECALHO = "data;processo;titulo;cliente;responsavel;status;observacoes\n"
+
+
+def _csv(linhas):
+    return io.StringIO(CABECALHO + "".join(";".join(c) + "\n" for c in linhas), newline="")
+
+
+def _totais_recalculados(db):
+    """Cada tabela de totais como sairia de um GROUP BY sobre `processos` inteiro."""
+    esperado = {}
+    for tabela, (colunas, exprs) in TOTAIS.items():
+        valores = ", ".join(e.format(p="processos") for e in exprs)
+        grupos = ", ".join(str(i) for i in range(1, len(colunas) + 1))
+        esperado[tabela] = set(db.execute(f"SELECT {valores}, count(*) FROM processos GROUP BY {grupos}"))
+    esperado["processo_ciclo"] = set(db.execute(
+        f"""SELECT processo, min(data), max(data), count(*), {CORRIDOS_SQL.format(u="max(data)", p="min(data)")}
+            FROM processo_dias GROUP BY processo"""))
+    esperado["ciclo_hist"] = set(db.execute(
+        "SELECT primeira, corridos, count(*) FROM processo_ciclo GROUP BY 1, 2"))
+    return esperado
+
+
+def _totais_gravados(db, tabelas):
+    return {t: set(db.execute(f"SELECT * FROM {t}")) for t in tabelas}
+
+
+def test_importar_csv_mantem_totais_fts_e_feed(db):
+    # Processos que já existem: a carga estende os ciclos deles
+    processos.inserir_varios(db, [registro("2024-05-0" + str(d), f"P{d % 3}") for d in range(1, 8)])
+    seq = db.execute("SELECT max(seq) FROM alteracoes").fetchone()[0]
+    longa = " ".join(["log da manutenção"] * (OBS_GRANDE // 10))
+    linhas = [(f"{d:02d}/05/2024", f"P{d % 5}", "Lentidão no PDV", f"Loja {d % 4}", "Ana", "Concluído", "")
+              for d in range(1, 29)]
+    linhas += [("03/05/2024", "P0", "repetida no banco", "", "", "", ""),
+               ("09/05/2024", "P4", "repetida no arquivo", "", "", "", ""),
+               ("10/06/2024", "P9", "Certificado vencido", "", "Bia", "Atendido", longa),
+               ("31/02/2024", "P1", "data inválida", "", "", "", "")]
+
+    rel = importacao.importar_csv(db, _csv(linhas))
+
+    # Repetidas: 01/05 P1 e 02/05 P2 (já no banco), 03/05 P0 e 09/05 P4
+    assert (rel.lidas, rel.inseridas, rel.duplicadas, rel.invalidas) == (32, 27, 4, 1)
+    esperado = _totais_recalculados(db)
+    assert _totais_gravados(db, esperado) == esperado
+    assert processos.ler_observacoes(db, db.execute(
+        "SELECT id FROM processos WHERE processo = 'P9'").fetchone()[0])[2] == longa
+    if db.fts:
+        assert db.execute("SELECT count(*) FROM processos_fts WHERE processos_fts MATCH 'lentid*'").fetchone()[0] == 26
+    # Um único aviso de recarga no feed, e os triggers de volta para as próximas escritas
+    assert db.execute("SELECT operacao FROM alteracoes WHERE seq > ?", (seq,)).fetchall() == [("R",)]
+    processos.inserir(db, registro("2024-06-11", "P9"))
+    esperado = _totais_recalculados(db)
+    assert _totais_gravados(db, esperado) == esperado
@@ -0,0 +1,23 @@
+from datetime import date
+
+import arquivo
+import processos
+import relatorios
+from conftest import registro
+from db import ANEXADOS_MAX
+
+
+def test_ciclo_com_mais_arquivos_que_o_limite_de_anexados(db):
+    anos = range(2010, 2010 + ANEXADOS_MAX + 3)
+    # Cada processo aberto em março e concluído em junho do seu ano; p2010 ainda reaparece em 2024
+    processos.inserir_varios(db, [registro(f"{a}-03-01", f"p{a}", "Atendido") for a in anos]
+                             + [registro(f"{a}-06-01", f"p{a}", "Concluído") for a in anos]
+                             + [registro("2024-02-01", "p2010", "Encaminhado p/ Frente de Loja")])
+    arquivo.arquivar(db, meses=12, hoje=date(2024, 6, 15))
+    assert len(db.arquivos) > ANEXADOS_MAX
+
+    c = relatorios.ciclo(db, "2010-01-01", "2024-12-31", limite=len(anos))
+    assert c.total == len(anos)
+    por_processo = {p: (ultima, st) for p, _primeira, ultima, _d, _c, st in c.mais_longos}
+    assert por_processo["p2010"] == ("2024-02-01", "Encaminhado p/ Frente de Loja")
+    assert all(por_processo[f"p{a}"] == (f"{a}-06-01", "Concluído") for a in anos[1:])
@@ -0,0 +1,35 @@
+import threading
+import urllib.request
+from datetime import date
+
+import arquivo
+import processos
+import servidor
+from conftest import registro
+
+
+def test_resumo_da_semana_que_comeca_num_dia_arquivado(db):
+    # Semana de 26/12/2022 (arquivada) a 01/01/2023 (ainda no banco principal)
+    processos.inserir_varios(db, [registro("2022-12-27", f"a{i}") for i in range(3)]
+                             + [registro("2023-01-01", f"b{i}") for i in range(2)])
+    arquivo.arquivar(db, meses=12, hoje=date(2024, 1, 15))
+    assert db.arquivado("2022-12-27") and not db.arquivado("2023-01-01")
+    db.close()
+
+    srv = servidor.criar(db.path, host="127.0.0.1", porta=0, threads=2)
+    # Lendo um arquivo (ATTACH), o resumo precisa rodar fora do lote de escritas
+    sozinhas = []
+    executar = srv.escritor.executar
+    srv.escritor.executar = lambda fn, sozinha=False: sozinhas.append(sozinha) or executar(fn, sozinha)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        url = f"http://127.0.0.1:{srv.server_address[1]}/resumo?data=2023-01-01&semana=1"
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            texto = resp.read().decode("utf-8")
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        srv.escritor.parar()
+    assert "Total de processos: 5" in texto
+    assert sozinhas == [True]